@@ -0,0 +1,96 @@
+"""대시보드 콜드 스타트(import 시간) 벤치마크
+
+새 프로세스에서 `python -X importtime`으로 대상을 실행해 모듈별 누적 import 시간을 집계한다.
+`dashboard`는 데이터가 없는 첫 화면까지 스크립트를 bare 모드로 실행한 것으로, 새 세션/컨테이너가
+처음 응답하기까지 드는 비용에 해당한다. 시작 경로에 차트/통계 라이브러리가 로드되면 항상 종료 코드 1로
+실패하며, --check를 주면 BUDGET_MS를 넘는 대상이 있을 때도 종료 코드 1을 반환한다.
+
+    python benchmarks/bench_import.py [--repeat 5] [--top 15] [--check]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, 'fn_hr_analysis3_S.py')
+
+# 대상별 누적 import 시간 상한 (ms): 기준 환경에서 측정값의 약 1.5배
+BUDGET_MS = {
+    'hr_analysis.api': 900,
+    'dashboard': 1_600,
+}
+
+# 데이터가 없는 첫 화면에서는 로드되면 안 되는 모듈 (plotly.graph_objects는 streamlit이 직접 import)
+LAZY_MODULES = ('plotly.express', 'matplotlib', 'seaborn', 'koreanize_matplotlib', 'statsmodels')
+
+_DASHBOARD = f"""
+import json, os, runpy, sys
+os.environ['HR_DATASET_DIR'] = {tempfile.mkdtemp(prefix='hr_bench_')!r}
+sys.path.insert(0, {ROOT!r})
+runpy.run_path({SCRIPT!r}, run_name='__main__')
+print(json.dumps(sorted(sys.modules)))
+"""
+
+TARGETS = {
+    'pandas': 'import pandas',
+    'streamlit': 'import streamlit',
+    'plotly.express': 'import plotly.express',
+    'hr_analysis.api': f"import sys; sys.path.insert(0, {ROOT!r}); import hr_analysis.api",
+    'dashboard': _DASHBOARD,
+}
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)')
+
+
+def measure(code):
+    """(최상위 모듈 누적 시간 합계 ms, {최상위 모듈: ms}, stdout)"""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, cwd=ROOT, check=True)
+    top_level = {}
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match and not match.group(3):
+            name = match.group(4)
+            top_level[name] = top_level.get(name, 0) + int(match.group(2)) / 1000
+    return sum(top_level.values()), top_level, proc.stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help='dashboard에서 가장 무거운 최상위 모듈 N개 출력')
+    parser.add_argument('--check', action='store_true', help='예산 초과 시 종료 코드 1')
+    args = parser.parse_args()
+
+    over_budget = eager_loaded = False
+    print(f"{'target':>16} | {'best ms':>9} | {'budget':>7}")
+    for name, code in TARGETS.items():
+        runs = [measure(code) for _ in range(args.repeat)]
+        total, modules, stdout = min(runs, key=lambda run: run[0])
+        budget = BUDGET_MS.get(name)
+        over = budget is not None and total > budget
+        over_budget |= over
+        print(f"{name:>16} | {total:>9,.0f} | {budget or '-':>7}{'  초과' if over else ''}")
+
+        if name == 'dashboard':
+            loaded = json.loads(stdout.strip().splitlines()[-1])
+            eager = [lazy for lazy in LAZY_MODULES if any(mod == lazy or mod.startswith(lazy + '.') for mod in loaded)]
+            if eager:
+                eager_loaded = True
+                print(f"{'':>16}   시작 경로에서 로드됨: {', '.join(eager)}")
+            heaviest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:args.top]
+
+    print("\ndashboard 최상위 모듈별 누적 import 시간")
+    for module, ms in heaviest:
+        print(f"  {module:<32} {ms:>8,.0f} ms")
+
+    if eager_loaded or (args.check and over_budget):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""페이지별 계산 벤치마크 (합성 데이터)
+
+hr_analysis.synthetic로 HR Data.csv 스키마의 10k / 100k / 1M (선택: 10M) 행 데이터를 만들고,
+각 페이지가 하는 계산을 Streamlit 없이 실행해 단계별 지연 시간과 메모리 최고 증가량을 잰다.
+지연 시간은 tracemalloc 없이 repeat회 중 최솟값, 메모리는 별도 1회 실행에서 측정한다.
+
+    python benchmarks/bench_pages.py [--sizes 10000 100000 1000000] [--repeat 3]
+                                     [--json out.json] [--baseline base.json --tolerance 0.25]
+
+--baseline을 주면 같은 (행 수, 단계)의 지연 시간이 tolerance 비율 이상 느려졌을 때 종료 코드 1을 반환한다.
+생성된 CSV는 benchmarks/.data/에 보관해 다음 실행에서 재사용한다.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hr_analysis.aggregates import cube_age_salary, cube_departments, cube_distribution, cube_slice, home_cube  # noqa: E402
+from hr_analysis.charts import aggregate_for_chart, density_heatmap, stratified_sample  # noqa: E402
+from hr_analysis.derived import (DerivedFrameCache, build_derived_frame, compute_custom_fields,  # noqa: E402
+                                 dataset_fingerprint)
+from hr_analysis.diagnostics import RerunProfiler  # noqa: E402
+from hr_analysis.export import export_report  # noqa: E402
+from hr_analysis.ingest import read_typed_csv  # noqa: E402
+from hr_analysis.mapping import auto_map  # noqa: E402
+from hr_analysis.profile import column_profile  # noqa: E402
+from hr_analysis.page_data import department_summary, early_warning_summary, retention_summary  # noqa: E402
+from hr_analysis.precompute import start_precompute  # noqa: E402
+from hr_analysis.ranking import page_positions  # noqa: E402
+from hr_analysis.scoring import EARLY_WARNING, LEVEL_HIGH, RETENTION_RISK, rule_contributions  # noqa: E402
+from hr_analysis.streaming import summarize_csv  # noqa: E402
+from hr_analysis.synthetic import load_generator  # noqa: E402
+from hr_analysis.thresholds import count_by_value, recommended_cutoffs, threshold_sweep  # noqa: E402
+
+DATA_DIR = os.path.join(ROOT, 'benchmarks', '.data')
+CUSTOM_FIELDS = {'소득비': '월급여 / (근속연수 + 1)', '고소득야근': '(소득비 > 1000) & (야근정도 == True)'}
+
+
+def dataset_path(rows):
+    """합성 데이터 CSV 경로 (없으면 생성)"""
+    path = os.path.join(DATA_DIR, f"hr_{rows}.csv")
+    if not os.path.exists(path):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        started = time.perf_counter()
+        load_generator().write_csv(path + '.tmp', rows)
+        os.replace(path + '.tmp', path)
+        print(f"  {rows:,}행 합성 데이터 생성 ({time.perf_counter() - started:.1f}초)")
+    return path
+
+
+# --- 페이지별 계산 (fn_hr_analysis3_S.py의 메모리 모드와 같은 연산) ---
+def risk_table_page(df, derived, mapping, spec, page=0, page_size=20):
+    """고위험군 순위 목록의 한 페이지"""
+    display_cols = [mapping[field] for field in ('직원ID', '부서', '업무만족도', '야근정도')]
+    scores = derived[spec.name].to_numpy()
+    candidates = np.flatnonzero(derived[f"{spec.name}_level"].to_numpy() == LEVEL_HIGH)
+    rows = page_positions(candidates, scores[candidates], page, page_size)
+    return df.iloc[rows][display_cols].assign(**{spec.name: scores[rows]})
+
+
+def early_warning_page(df, derived, mapping):
+    return early_warning_summary(df, derived, mapping), risk_table_page(df, derived, mapping, EARLY_WARNING)
+
+
+def retention_risk_page(df, derived, mapping):
+    hist = np.histogram(derived[RETENTION_RISK.name], bins=30)
+    return retention_summary(df, derived, mapping), hist, risk_table_page(df, derived, mapping, RETENTION_RISK)
+
+
+def cutoff_sweep_page(contributions, derived, weights=(1.2, 0.8, 1.0, 1.5, 0.5)):
+    """가중치를 바꾼 잔류 위험 점수의 기준점 스윕 (규칙별 기여 행렬은 캐시된 것으로 가정)"""
+    scores = contributions @ np.asarray(weights)
+    sweep = threshold_sweep(*count_by_value(scores, derived['is_leaver']))
+    return sweep, recommended_cutoffs(sweep)
+
+
+def department_health_page(df, derived, mapping):
+    return department_summary(df, derived, mapping)
+
+
+def precompute_all(df, derived, mapping):
+    """업로드 직후처럼 모든 페이지 집계를 스레드 풀에서 동시에 계산 (매번 빈 캐시, 새 작업)"""
+    precompute_all.runs = getattr(precompute_all, 'runs', 0) + 1
+    job = start_precompute(df, derived, f"bench-{precompute_all.runs}", mapping, cache=DerivedFrameCache())
+    job.wait()
+    assert not job.errors, job.errors
+    return job
+
+
+def home_page(df, derived, mapping):
+    cube = home_cube(df, derived, mapping)
+    filtered = cube_slice(cube, cube_departments(cube)[:1])
+    return [cube_distribution(filtered, dim) for dim in ('연령대', '업무만족도', '결혼여부')], cube_age_salary(filtered)
+
+
+def custom_chart_page(df, derived, mapping):
+    values, errors = compute_custom_fields(df, CUSTOM_FIELDS)
+    assert not errors, errors
+    frame = df[[mapping['부서'], mapping['성별'], mapping['월급여'], mapping['나이']]].assign(**values)
+    bar = aggregate_for_chart(frame, [mapping['부서'], mapping['성별']], '소득비', 'mean')
+    scatter = stratified_sample(frame, 5_000, by=mapping['부서'])
+    heatmap = density_heatmap(frame, mapping['나이'], mapping['월급여'])
+    return bar, scatter, heatmap
+
+
+def export_page(df, derived, mapping):
+    """부서별 명단 CSV + Parquet 내보내기 (Excel은 행당 비용이 커서 제외)"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        return len(export_report(df, derived, mapping, output_dir, ('csv', 'parquet')))
+
+
+def run_stages(path, stage):
+    """stage(이름, 함수)로 각 단계를 실행"""
+    df, _ = stage('ingest (typed CSV)', lambda: read_typed_csv(path))
+    mapping = auto_map(df.columns)
+    stage('fingerprint', lambda: dataset_fingerprint(df))
+    stage('⚙️ column profile', lambda: auto_map(df.columns, column_profile(df)))
+    derived = stage('scores + derived', lambda: build_derived_frame(df, mapping, {}))
+    stage('🏠 home cube', lambda: home_page(df, derived, mapping))
+    stage('⚠️ early warning', lambda: early_warning_page(df, derived, mapping))
+    stage('📈 retention risk', lambda: retention_risk_page(df, derived, mapping))
+    contributions = stage('rule contributions', lambda: rule_contributions(df, mapping, RETENTION_RISK))
+    stage('🎯 cut-off sweep', lambda: cutoff_sweep_page(contributions, derived))
+    stage('🏢 department health', lambda: department_health_page(df, derived, mapping))
+    stage('⚡ precompute (threads)', lambda: precompute_all(df, derived, mapping))
+    stage('📊 custom chart prep', lambda: custom_chart_page(df, derived, mapping))
+    stage('📤 export (csv+parquet)', lambda: export_page(df, derived, mapping))
+    stage('📦 streaming ingest', lambda: summarize_csv(path))
+
+
+def measure(path, repeat):
+    """{단계: {'ms': 최솟값, 'peak_mb': 최고 증가량, 'copies': copy 호출 수}}"""
+    results = {}
+
+    def timed(name, fn):
+        best, out = float('inf'), None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            out = fn()
+            best = min(best, time.perf_counter() - started)
+        results[name] = {'ms': best * 1000}
+        return out
+
+    run_stages(path, timed)
+
+    profiler = RerunProfiler(enabled=True)
+
+    def traced(name, fn):
+        with profiler.stage(name):
+            return fn()
+
+    run_stages(path, traced)
+    profiler.finish()
+    for record in profiler.records:
+        results[record['stage']].update(peak_mb=record['peak_mb'], copies=record['copies'])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help='결과를 저장할 JSON 경로')
+    parser.add_argument('--baseline', help='비교할 이전 결과 JSON')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='허용 지연 증가 비율 (기본 0.25 = 25%%)')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    all_results, regressions = {}, []
+    for rows in args.sizes:
+        path = dataset_path(rows)
+        results = measure(path, args.repeat)
+        all_results[str(rows)] = results
+        print(f"\n{rows:,}행")
+        print(f"  {'stage':<24} | {'ms':>10} | {'rows/s':>12} | {'peak MB':>8} | {'copies':>6} | {'vs base':>8}")
+        for name, result in results.items():
+            base_ms = baseline.get(str(rows), {}).get(name, {}).get('ms')
+            change = ''
+            if base_ms:
+                ratio = result['ms'] / base_ms - 1
+                change = f"{ratio:+.0%}"
+                if ratio > args.tolerance:
+                    regressions.append((rows, name, ratio))
+            print(f"  {name:<24} | {result['ms']:>10,.1f} | {rows / result['ms'] * 1000:>12,.0f} | "
+                  f"{result.get('peak_mb', float('nan')):>8,.1f} | {result.get('copies', 0):>6} | {change:>8}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'created': time.time(), 'repeat': args.repeat, 'results': all_results}, f, ensure_ascii=False, indent=1)
+
+    if regressions:
+        print("\n느려진 단계:")
+        for rows, name, ratio in regressions:
+            print(f"  {rows:,}행 {name}: {ratio:+.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
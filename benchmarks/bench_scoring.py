@@ -0,0 +1,102 @@
+"""위험 점수 엔진 벤치마크
+
+HR Data.csv를 10k / 100k / 1M 행으로 재표본추출한 뒤, 기존 행 단위(apply) 구현과
+벡터화 엔진(score_frame)의 처리량(rows/sec)을 비교한다. 두 구현의 결과가 같은지는
+(결측 포함) tests/test_scoring.py에서 이 모듈의 legacy()/engine()으로 검증한다.
+
+    python benchmarks/bench_scoring.py [--sizes 10000 100000 1000000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hr_analysis.scoring import EARLY_WARNING, RETENTION_RISK, level_counts, score_frame  # noqa: E402
+
+MAPPING = {k: k for k in ('업무만족도', '야근정도', '마지막승진년수', '집과의거리',
+                          '업무환경만족도', '일한회사수')}
+
+
+def legacy_early_warning(df, mapping):
+    scores = pd.Series(0, index=df.index)
+    if '업무만족도' in mapping and mapping['업무만족도'] in df.columns:
+        scores += df[mapping['업무만족도']].apply(lambda x: 40 if x <= 2 else (20 if x == 3 else 0))
+    if '야근정도' in mapping and mapping['야근정도'] in df.columns:
+        scores += df[mapping['야근정도']].isin(['Yes', 'yes', '예', '네']) * 30
+    if '마지막승진년수' in mapping and mapping['마지막승진년수'] in df.columns:
+        scores += df[mapping['마지막승진년수']].apply(lambda x: 20 if x >= 3 else (10 if x >= 2 else 0))
+    if '집과의거리' in mapping and mapping['집과의거리'] in df.columns:
+        scores += (df[mapping['집과의거리']] > 20) * 10
+    return scores
+
+
+def legacy_retention_risk(df, mapping):
+    scores = pd.Series(0, index=df.index)
+    if '야근정도' in mapping and mapping['야근정도'] in df.columns:
+        scores += df[mapping['야근정도']].isin(['Yes', 'yes', '예', '네']) * 25
+    if '업무만족도' in mapping and mapping['업무만족도'] in df.columns:
+        scores += (5 - df[mapping['업무만족도']]) * 10
+    if '업무환경만족도' in mapping and mapping['업무환경만족도'] in df.columns:
+        scores += (5 - df[mapping['업무환경만족도']]) * 8
+    if '마지막승진년수' in mapping and mapping['마지막승진년수'] in df.columns:
+        scores += (df[mapping['마지막승진년수']] * 4).clip(upper=20)
+    if '일한회사수' in mapping and mapping['일한회사수'] in df.columns:
+        scores += (df[mapping['일한회사수']] * 2).clip(upper=15)
+    return scores
+
+
+def legacy_levels(scores, bands):
+    medium, high = bands
+    return (
+        int((scores < medium).sum()),
+        int(((scores >= medium) & (scores < high)).sum()),
+        int((scores >= high).sum()),
+    )
+
+
+def legacy(df):
+    ew = legacy_early_warning(df, MAPPING)
+    rr = legacy_retention_risk(df, MAPPING)
+    return ew, rr, legacy_levels(ew, EARLY_WARNING.bands), legacy_levels(rr, RETENTION_RISK.bands)
+
+
+def engine(df):
+    result = score_frame(df, MAPPING)
+    return (
+        result[EARLY_WARNING.name], result[RETENTION_RISK.name],
+        level_counts(result[f"{EARLY_WARNING.name}_level"].to_numpy()),
+        level_counts(result[f"{RETENTION_RISK.name}_level"].to_numpy()),
+    )
+
+
+def timed(fn, df, repeat):
+    best, out = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(df)
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    base = pd.read_csv(os.path.join(ROOT, 'HR Data.csv'))
+    print(f"{'rows':>10} | {'legacy rows/s':>14} | {'engine rows/s':>14} | {'speedup':>8}")
+    for n in args.sizes:
+        df = base.sample(n, replace=True, random_state=0).reset_index(drop=True)
+        t_legacy, _ = timed(legacy, df, args.repeat)
+        t_engine, _ = timed(engine, df, args.repeat)
+        print(f"{n:>10,} | {n / t_legacy:>14,.0f} | {n / t_engine:>14,.0f} | {t_legacy / t_engine:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
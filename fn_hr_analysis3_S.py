@@ -1,10 +1,36 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import json
+import os
+import time
+
+from hr_analysis.aggregates import (cube_age_salary, cube_departments, cube_distribution, cube_headcount,
+                                    cube_slice, home_cube)
+from hr_analysis.charts import (AGG_FUNCTIONS, DEFAULT_POINT_BUDGET, aggregate_for_chart, density_heatmap,
+                                figure_payload_bytes, stratified_sample)
+from hr_analysis.diagnostics import HISTORY_SIZE, RerunProfiler, history_to_csv, history_to_json
+from hr_analysis.derived import compute_custom_fields, dataset_fingerprint, get_cached_aggregate, get_derived_frame
+from hr_analysis.export import DOWNLOAD_LIMIT_MB, FORMATS, excel_available, start_export
+from hr_analysis.expressions import FUNCTIONS
+from hr_analysis.figures import THEMES, cached_figure
+from hr_analysis.ingest import read_typed_csv
+from hr_analysis.mapping import auto_map, default_mapping, rank_candidates
+from hr_analysis.merge import files_hash, merge_files
+from hr_analysis.model import fit_attrition_model, rank_levels, roc_auc, statsmodels_available
+from hr_analysis.page_data import department_summary, early_warning_summary, retention_summary
+from hr_analysis.precompute import page_aggregate, start_precompute
+from hr_analysis.profile import (MAX_OPTIONS, SAMPLE_ROWS, cached_profile, chart_columns, column_labels, column_profile,
+                                 filter_columns)
+from hr_analysis.ranking import page_count, page_positions, sort_keys
+from hr_analysis.registry import SessionToken, get_registry
+from hr_analysis.scoring import (EARLY_WARNING, LEVEL_HIGH, RETENTION_RISK, describe_rule, level_means,
+                                 rule_contributions)
+from hr_analysis.snapshots import SnapshotSeries, list_series
+from hr_analysis.store import DatasetStore, content_hash
+from hr_analysis.thresholds import (at_threshold, average_precision, count_by_value, recommended_cutoffs,
+                                    roc_auc_from_sweep, threshold_sweep)
+from hr_analysis.streaming import summarize_csv
 
 # 페이지 설정
 st.set_page_config(
@@ -17,12 +43,33 @@ st.set_page_config(
 # 세션 상태 초기화
 if 'df' not in st.session_state:
     st.session_state.df = None
+if 'df_fingerprint' not in st.session_state:
+    st.session_state.df_fingerprint = None
+if 'ingest_report' not in st.session_state:
+    st.session_state.ingest_report = None
+if 'dataset_id' not in st.session_state:
+    st.session_state.dataset_id = None
+if 'uploaded_file_id' not in st.session_state:
+    st.session_state.uploaded_file_id = None
+if 'summary' not in st.session_state:
+    st.session_state.summary = None
 if 'column_mapping' not in st.session_state:
     st.session_state.column_mapping = {}
 if 'dark_mode' not in st.session_state:
     st.session_state.dark_mode = True
 if 'custom_fields' not in st.session_state:
     st.session_state.custom_fields = {}
+if 'diagnostics' not in st.session_state:
+    st.session_state.diagnostics = os.environ.get('HR_DIAGNOSTICS') == '1'
+if 'diagnostics_history' not in st.session_state:
+    st.session_state.diagnostics_history = []
+if 'registry_token' not in st.session_state:
+    st.session_state.registry_token = SessionToken()
+if 'export_job' not in st.session_state:
+    st.session_state.export_job = None
+
+# 진단 모드: 이번 재실행의 단계별 시간/메모리/복사 횟수 계측 (꺼져 있으면 stage()는 아무 일도 하지 않음)
+profiler = RerunProfiler(enabled=st.session_state.diagnostics)
 
 # 다크모드/라이트모드 스타일
 def get_theme_styles():
@@ -47,66 +94,178 @@ def get_theme_styles():
         </style>
         """
     
-# CSS 적용 및 Plotly 템플릿 설정
+# CSS 적용
 st.markdown(get_theme_styles(), unsafe_allow_html=True)
-px.defaults.template = "plotly_dark" if st.session_state.dark_mode else "plotly_white"
+
+def load_plotly():
+    """차트를 그리는 페이지에서만 plotly 로드 (첫 호출 이후에는 sys.modules 캐시) 및 테마 템플릿 설정"""
+    with profiler.stage('plotly 로드'):
+        import plotly.express as px
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+    px.defaults.template = THEMES[st.session_state.dark_mode]
+    return px, go, make_subplots
+
+def plot(fig):
+    """차트 출력 (figure 직렬화와 브라우저 전송 메시지 생성 시간을 계측)"""
+    with profiler.stage('차트 직렬화·전송'):
+        st.plotly_chart(fig, use_container_width=True)
+
+def plot_cached(name, build, params=()):
+    """데이터셋·매핑·params마다 한 번 만든 figure에 현재 테마만 입혀 출력 (테마 전환·페이지 재방문 시 재사용)"""
+    with profiler.stage('차트 생성 (캐시)'):
+        figure = cached_figure(name, st.session_state.df_fingerprint, st.session_state.column_mapping, params, build)
+    with figure.themed(THEMES[st.session_state.dark_mode]) as fig:
+        plot(fig)
+
+def show_ranked_table(frame, scores, candidates, display_cols, score_name, key, note=None):
+    """candidates(행 위치) 목록을 서버에서 정렬해 현재 페이지만 표시"""
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        sort_by = st.selectbox("정렬 기준", [score_name] + display_cols, key=f"{key}_sort")
+    with col2:
+        order = st.radio("순서", ['내림차순', '오름차순'], horizontal=True, key=f"{key}_order")
+    with col3:
+        page_size = st.selectbox("행 수", [20, 50, 100], key=f"{key}_size")
+    pages = page_count(len(candidates), page_size)
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    page = st.number_input(f"페이지 (전체 {pages:,})", min_value=1, max_value=pages, key=f"{key}_page") - 1
+
+    with profiler.stage('순위 목록 페이지'):
+        keys = scores[candidates] if sort_by == score_name else sort_keys(frame[sort_by].iloc[candidates])
+        rows = page_positions(candidates, keys, page, page_size, descending=order == '내림차순')
+        table = frame.iloc[rows][display_cols].assign(**{score_name: scores[rows]})
+        start = page * page_size
+        table.index = pd.RangeIndex(start + 1, start + 1 + len(table), name='순위')
+    st.dataframe(table, use_container_width=True)
+    st.caption(f"{len(candidates):,}명 중 {start + 1:,}–{start + len(table):,}번째 ({sort_by} {order})"
+               + (f" · {note}" if note else ""))
+
+def show_risk_list(spec, key, summary, df, derived, mapping):
+    """spec 점수의 고위험군 전체를 순위 목록으로 표시 (대용량 모드는 보관된 상위 N명)"""
+    if summary is not None:
+        frame = summary.top_rows[spec.name]
+        display_cols = [col for col in frame.columns if col != spec.name]
+        show_ranked_table(frame, frame[spec.name].to_numpy(), np.arange(len(frame)), display_cols, spec.name, key,
+                          note=f"대용량 모드에서는 점수 상위 {summary.top_n:,}명만 보관합니다.")
+        return
+    display_cols = [col for col in [mapping.get('직원ID'), mapping.get('부서'),
+                                   mapping.get('업무만족도'), mapping.get('야근정도')] if col in df.columns]
+    candidates = np.flatnonzero(derived[f"{spec.name}_level"].to_numpy() == LEVEL_HIGH)
+    show_ranked_table(df, derived[spec.name].to_numpy(), candidates, display_cols, spec.name, key)
+
+def fit_attrition_model_or_error(df, mapping):
+    """(모델, None) 또는 적합에 실패하면 (None, 오류 메시지)"""
+    try:
+        return fit_attrition_model(df, mapping), None
+    except Exception as e:
+        return None, f"모델을 적합하지 못했습니다: {e}"
+
+def attrition_model(df, fingerprint, mapping):
+    """(로지스틱 회귀 모델, 전체 행 퇴직 확률, 오류 메시지): 데이터셋·매핑 조합마다 한 번만 적합·예측"""
+    if not statsmodels_available():
+        return None, None, "statsmodels가 설치되어 있지 않아 모델을 적합할 수 없습니다."
+    # 실패도 같은 키로 캐시해 상호작용마다 다시 적합하지 않음
+    with profiler.stage('로지스틱 회귀 적합'):
+        model, error = get_cached_aggregate('attrition_model', fingerprint, mapping,
+                                            lambda: fit_attrition_model_or_error(df, mapping))
+    if error is not None:
+        return None, None, error
+    with profiler.stage('모델 일괄 예측'):
+        proba = get_cached_aggregate('attrition_probability', fingerprint, mapping, lambda: model.predict(df, mapping))
+    return model, proba, None
 
 # --- 사이드바 ---
 st.sidebar.title("🎯 HR Analytics Dashboard")
 
 # 다크모드 토글 스위치
-dark_mode_on = st.sidebar.toggle("🌙 다크 모드", value=st.session_state.dark_mode)
-if dark_mode_on != st.session_state.dark_mode:
-    st.session_state.dark_mode = dark_mode_on
-    st.rerun()
+st.sidebar.toggle("🌙 다크 모드", key='dark_mode')
+
+st.sidebar.toggle("🩺 진단 모드", key='diagnostics',
+                  help="재실행마다 단계별 소요 시간, 메모리 최고치, DataFrame 복사 횟수를 기록해 화면 하단에 표시합니다. "
+                       "환경 변수 HR_DIAGNOSTICS=1로 기본값을 켤 수 있습니다.")
 
 st.sidebar.markdown("---")
 
 # 파일 업로드
-uploaded_file = st.sidebar.file_uploader("CSV 파일 업로드", type=['csv'])
-
-# 기본 컬럼 매핑
-default_mapping = {
-    '직원ID': 'EmployeeNumber', '퇴직여부': 'Attrition', '나이': 'Age', '성별': 'Gender', '출장빈도': 'BusinessTravel',
-    '일대비급여수준': 'DailyRate', '부서': 'Department', '집과의거리': 'DistanceFromHome', '전공': 'EducationField',
-    '업무환경만족도': 'EnvironmentSatisfaction', '업무참여도': 'JobInvolvement', '업무만족도': 'JobSatisfaction',
-    '결혼여부': 'MaritalStatus', '월급여': 'MonthlyIncome', '일한회사수': 'NumCompaniesWorked', '총경력': 'TotalWorkingYears',
-    '야근정도': 'OverTime', '급여인상률': 'PercentSalaryHike', '스톡옵션': 'StockOptionLevel', '근속연수': 'YearsAtCompany',
-    '현재역할년수': 'YearsInCurrentRole', '마지막승진년수': 'YearsSinceLastPromotion'
-}
+uploaded_files = st.sidebar.file_uploader("CSV 파일 업로드", type=['csv'], accept_multiple_files=True,
+                                          help="여러 파일을 올리면 컬럼을 표준 필드명으로 맞춰 병합하고, 직원ID가 겹치면 나중 파일의 행을 남깁니다.")
+stream_mode = st.sidebar.toggle("📦 대용량 모드 (청크 집계)",
+                                help="파일 전체를 메모리에 올리지 않고 청크 단위로 읽으며 화면에 필요한 집계만 계산합니다. "
+                                     "컬럼 매핑 변경과 커스텀 차트는 사용할 수 없습니다.")
 
 # --- 데이터 처리 및 계산 함수 ---
+dataset_store = DatasetStore()
+dataset_registry = get_registry()
+
+def load_from_store(dataset_id):
+    with profiler.stage('저장소 로드 (메모리 맵)'):
+        return dataset_store.load(dataset_id)
+
 def load_and_process_data(file):
-    """데이터 로드"""
-    return pd.read_csv(file)
-
-def calculate_early_warning_score(df, mapping):
-    """조기 경보 점수 계산"""
-    scores = pd.Series(0, index=df.index)
-    if '업무만족도' in mapping and mapping['업무만족도'] in df.columns:
-        scores += df[mapping['업무만족도']].apply(lambda x: 40 if x <= 2 else (20 if x == 3 else 0))
-    if '야근정도' in mapping and mapping['야근정도'] in df.columns:
-        scores += df[mapping['야근정도']].isin(['Yes', 'yes', '예', '네']) * 30
-    if '마지막승진년수' in mapping and mapping['마지막승진년수'] in df.columns:
-        scores += df[mapping['마지막승진년수']].apply(lambda x: 20 if x >= 3 else (10 if x >= 2 else 0))
-    if '집과의거리' in mapping and mapping['집과의거리'] in df.columns:
-        scores += (df[mapping['집과의거리']] > 20) * 10
-    return scores
-
-def calculate_retention_risk_score(df, mapping):
-    """잔류 위험 점수 계산"""
-    scores = pd.Series(0, index=df.index)
-    if '야근정도' in mapping and mapping['야근정도'] in df.columns:
-        scores += df[mapping['야근정도']].isin(['Yes', 'yes', '예', '네']) * 25
-    if '업무만족도' in mapping and mapping['업무만족도'] in df.columns:
-        scores += (5 - df[mapping['업무만족도']]) * 10
-    if '업무환경만족도' in mapping and mapping['업무환경만족도'] in df.columns:
-        scores += (5 - df[mapping['업무환경만족도']]) * 8
-    if '마지막승진년수' in mapping and mapping['마지막승진년수'] in df.columns:
-        scores += (df[mapping['마지막승진년수']] * 4).clip(upper=20)
-    if '일한회사수' in mapping and mapping['일한회사수'] in df.columns:
-        scores += (df[mapping['일한회사수']] * 2).clip(upper=15)
-    return scores
+    """데이터 로드 (다른 세션이 연 같은 파일은 공유 프레임, 변환된 적 있는 파일은 컬럼형 저장소에서 읽음)"""
+    with profiler.stage('내용 해시'):
+        dataset_id = content_hash(file)
+
+    def parse():
+        if dataset_id in dataset_store:
+            return load_from_store(dataset_id)
+        with profiler.stage('CSV 파싱'):
+            df, report = read_typed_csv(file)
+        with profiler.stage('저장소 저장'):
+            dataset_store.save(dataset_id, df, getattr(file, 'name', str(file)), report)
+        return df, report
+
+    return (dataset_id,) + dataset_registry.acquire(dataset_id, st.session_state.registry_token, parse)
+
+def load_and_merge_files(files):
+    """여러 파일을 작업자 프로세스에서 읽어 병합 (같은 파일 조합은 공유 프레임·저장소 재사용)"""
+    with profiler.stage('내용 해시'):
+        dataset_id = files_hash([content_hash(file) for file in files])
+
+    def parse():
+        if dataset_id in dataset_store:
+            return load_from_store(dataset_id)
+        with profiler.stage('CSV 병렬 파싱·병합'):
+            df, report = merge_files([(file.name, file.getvalue()) for file in files])
+        with profiler.stage('저장소 저장'):
+            dataset_store.save(dataset_id, df, f"{files[0].name} 외 {len(files) - 1}개 병합", report)
+        return df, report
+
+    return (dataset_id,) + dataset_registry.acquire(dataset_id, st.session_state.registry_token, parse)
+
+def release_active_dataset():
+    if st.session_state.dataset_id is not None:
+        dataset_registry.release(st.session_state.dataset_id, st.session_state.registry_token)
+
+def set_active_dataset(dataset_id, df, report):
+    """세션의 현재 데이터셋 교체 (기존 매핑이 맞지 않으면 자동 매핑)"""
+    if dataset_id != st.session_state.dataset_id:
+        release_active_dataset()
+    st.session_state.dataset_id = dataset_id
+    st.session_state.df = df
+    st.session_state.summary = None
+    st.session_state.ingest_report = report
+    st.session_state.df_fingerprint = dataset_id
+    mapping = st.session_state.column_mapping
+    if not mapping or any(col not in df.columns for col in mapping.values()):
+        with profiler.stage('컬럼 프로필·자동 매핑'):
+            st.session_state.column_mapping = auto_map(df.columns, cached_profile(df, dataset_id))
+
+def column_profile_for(df):
+    with profiler.stage('컬럼 프로필'):
+        return cached_profile(df, st.session_state.df_fingerprint)
+
+def set_streaming_summary(summary):
+    """대용량 모드: 원본 행 없이 청크 집계만 보관"""
+    release_active_dataset()
+    st.session_state.dataset_id = None
+    st.session_state.df = None
+    st.session_state.df_fingerprint = None
+    st.session_state.ingest_report = None
+    st.session_state.summary = summary
+    st.session_state.column_mapping = summary.mapping
 
 def generate_insight_comment(attrition_rate, scope_name):
     """인사이트 코멘트 생성"""
@@ -118,51 +277,124 @@ def generate_insight_comment(attrition_rate, scope_name):
         return f"✅ **{scope_name}** 퇴직률이 {attrition_rate:.1f}%로 안정적인 수준입니다."
 
 # --- 데이터 로드 및 자동 매핑 ---
-if uploaded_file is not None and st.session_state.df is None:
-    st.session_state.df = load_and_process_data(uploaded_file)
-    if not st.session_state.column_mapping:
-        df_cols_lower = {col.lower(): col for col in st.session_state.df.columns}
-        for korean, english in default_mapping.items():
-            if korean in st.session_state.df.columns: st.session_state.column_mapping[korean] = korean
-            elif english in st.session_state.df.columns: st.session_state.column_mapping[korean] = english
-            elif english.lower() in df_cols_lower: st.session_state.column_mapping[korean] = df_cols_lower[english.lower()]
+upload_id = (tuple(file.file_id for file in uploaded_files), stream_mode)
+if uploaded_files and upload_id != st.session_state.uploaded_file_id:
+    st.session_state.uploaded_file_id = upload_id
+    uploaded_file = uploaded_files[0]
+    if stream_mode:
+        if len(uploaded_files) > 1:
+            st.sidebar.warning(f"대용량 모드는 파일 하나만 집계합니다: {uploaded_file.name}")
+        progress = st.sidebar.empty()
+        with profiler.stage('CSV 청크 집계'):
+            set_streaming_summary(summarize_csv(
+                uploaded_file, mapping=st.session_state.column_mapping or None,
+                on_progress=lambda rows: progress.caption(f"⏳ {rows:,}행 집계 중...")
+            ))
+        progress.empty()
+    elif len(uploaded_files) > 1:
+        set_active_dataset(*load_and_merge_files(uploaded_files))
+    else:
+        set_active_dataset(*load_and_process_data(uploaded_file))
+
+# 저장된 데이터셋 선택 (새로고침 후에도 CSV 재파싱 없이 다시 열기)
+stored_datasets = {meta['id']: meta for meta in dataset_store.list()}
+if stored_datasets:
+    dataset_ids = list(stored_datasets)
+    selected_id = st.sidebar.selectbox(
+        "📂 저장된 데이터셋", dataset_ids,
+        index=dataset_ids.index(st.session_state.dataset_id) if st.session_state.dataset_id in stored_datasets else None,
+        format_func=lambda i: f"{stored_datasets[i]['name']} ({stored_datasets[i]['rows']:,}행)",
+        placeholder="데이터셋 선택"
+    )
+    if selected_id is not None and selected_id != st.session_state.dataset_id:
+        set_active_dataset(selected_id, *dataset_registry.acquire(
+            selected_id, st.session_state.registry_token, lambda: load_from_store(selected_id)))
+
+if st.session_state.ingest_report is not None:
+    report = st.session_state.ingest_report
+    st.sidebar.caption(f"💾 메모리 {report.bytes_before / 1024**2:.1f}MB → {report.bytes_after / 1024**2:.1f}MB "
+                       f"({report.reduction:.1f}배 절감)")
+    if report.sources:
+        with st.sidebar.expander(f"📑 {len(report.sources)}개 파일 병합 결과"):
+            st.dataframe(pd.DataFrame(report.sources), hide_index=True, use_container_width=True)
+            st.caption(f"병합 후 {report.rows:,}행 (직원ID 중복 {sum(source['중복 제거'] for source in report.sources):,}행 제거)")
+    sharing = dataset_registry.refcount(st.session_state.dataset_id)
+    if sharing > 1:
+        st.sidebar.caption(f"🔗 {sharing}개 세션이 같은 데이터를 공유 중")
+
+if st.session_state.summary is not None:
+    st.sidebar.caption(f"📦 대용량 모드: {st.session_state.summary.rows:,}행 ({st.session_state.summary.chunks}개 청크) 집계됨")
+
+# --- 파생 데이터 (점수, 연령대, 플래그, 커스텀 필드) ---
+summary = st.session_state.summary
+derived = None
+if st.session_state.df is not None:
+    if st.session_state.df_fingerprint is None:
+        with profiler.stage('데이터셋 지문'):
+            st.session_state.df_fingerprint = dataset_fingerprint(st.session_state.df)
+    with profiler.stage('파생 프레임 (점수·커스텀 필드)'):
+        derived = get_derived_frame(st.session_state.df, st.session_state.df_fingerprint,
+                                    st.session_state.column_mapping, st.session_state.custom_fields)
+
+    # 모든 페이지 집계를 작업자 스레드에서 미리 계산 (데이터셋·매핑 조합마다 한 번)
+    precompute_job = start_precompute(st.session_state.df, derived, st.session_state.df_fingerprint,
+                                      st.session_state.column_mapping)
+
+    @st.fragment(run_every=None if precompute_job.done else 0.5)
+    def precompute_status():
+        if not precompute_job.done:
+            st.progress(precompute_job.completed / precompute_job.total,
+                        text=f"⚙️ 페이지 미리 계산 중 {precompute_job.completed}/{precompute_job.total}")
+        elif precompute_job.errors:
+            st.caption(f"⚠️ 미리 계산 실패: {', '.join(precompute_job.errors)} (페이지를 열 때 다시 계산)")
+        else:
+            st.caption(f"⚡ 모든 페이지 준비됨 ({precompute_job.elapsed:.1f}초)")
+
+    with st.sidebar:
+        precompute_status()
 
 # --- 사이드바 메뉴 ---
 st.sidebar.markdown("---")
-menu_options = ["🏠 홈", "⚠️ 조기 경보", "📈 잔류 위험", "🏢 부서 건강도", "⚙️ 컬럼 매핑", "📊 커스텀 차트"]
+menu_options = ["🏠 홈", "⚠️ 조기 경보", "📈 잔류 위험", "🤖 예측 모델", "🎯 기준점 검증", "🏢 부서 건강도", "📅 시계열", "📤 보고서 내보내기", "⚙️ 컬럼 매핑", "📊 커스텀 차트"]
 menu = st.sidebar.radio("메뉴 선택", menu_options)
+profiler.label = menu
 
 # --- 메인 콘텐츠 ---
 
 if menu == "🏠 홈":
     st.title("🏠 HR Analytics Dashboard")
-    if st.session_state.df is not None:
+    if st.session_state.df is not None or summary is not None:
+        px, go, make_subplots = load_plotly()
         df = st.session_state.df
         mapping = st.session_state.column_mapping
-        
-        # 부서 필터
-        selected_dept = '전체'
-        if '부서' in mapping and mapping['부서'] in df.columns:
-            dept_options = ['전체'] + sorted(list(df[mapping['부서']].unique()))
-            selected_dept = st.selectbox("부서 선택", dept_options, key='home_dept_filter')
+
+        # 부서 × 연령대 × 업무만족도 × 결혼여부 큐브 (데이터셋·매핑별 1회 계산)
+        with profiler.stage('홈 큐브'):
+            if summary is not None:
+                cube = summary.home_cube
+            else:
+                cube = page_aggregate('home_cube', st.session_state.df_fingerprint, mapping,
+                                      lambda: home_cube(df, derived, mapping))
+
+        # 부서 필터 (여러 부서 선택 가능, 비우면 전체)
+        selected_depts = []
+        dept_values = cube_departments(cube)
+        if dept_values is not None:
+            selected_depts = st.multiselect("부서 선택", dept_values, key='home_dept_filter', placeholder='전체')
         else:
             st.sidebar.warning("'부서' 컬럼을 매핑해야 부서별 필터링이 가능합니다.")
+        filtered_cube = cube_slice(cube, selected_depts)
 
-        filtered_df = df if selected_dept == '전체' else df[df[mapping['부서']] == selected_dept]
-        
         # 직원 수 및 퇴사자 수 계산
-        leavers_count = 0
-        if '퇴직여부' in mapping and mapping['퇴직여부'] in filtered_df.columns:
-            is_leaver = filtered_df[mapping['퇴직여부']].isin(['Yes', 'yes', '예', '네'])
-            leavers_count = is_leaver.sum()
-        else:
+        total_employees, leavers_count = cube_headcount(filtered_cube)
+        if leavers_count is None:
+            leavers_count = 0
             st.warning("'퇴직여부' 컬럼이 매핑되지 않아 퇴사 관련 지표를 계산할 수 없습니다.")
-        
-        total_employees = len(filtered_df)
+
         current_employees = total_employees - leavers_count
         attrition_rate = (leavers_count / total_employees * 100) if total_employees > 0 else 0
         
-        insight = generate_insight_comment(attrition_rate, '전체' if selected_dept == '전체' else selected_dept)
+        insight = generate_insight_comment(attrition_rate, ', '.join(map(str, selected_depts)) if selected_depts else '전체')
         st.markdown(f'<div class="insight-box">{insight}</div>', unsafe_allow_html=True)
         
         # 메트릭 카드
@@ -176,45 +408,38 @@ if menu == "🏠 홈":
         col1, col2 = st.columns(2)
         with col1:
             chart_options = {}
-            temp_df = filtered_df.copy() # 원본 수정을 피하기 위해 복사본 사용
-            if '나이' in mapping and mapping['나이'] in temp_df.columns:
-                temp_df['연령대'] = pd.cut(temp_df[mapping['나이']], bins=[17, 29, 39, 49, 100], labels=['20대', '30대', '40대', '50대+'])
-                chart_options['연령대'] = '연령대별 분포'
-            if '업무만족도' in mapping and mapping['업무만족도'] in temp_df.columns: chart_options[mapping['업무만족도']] = '업무만족도'
-            if '결혼여부' in mapping and mapping['결혼여부'] in temp_df.columns: chart_options[mapping['결혼여부']] = '결혼여부'
-            
+            if '연령대' in cube.index.names: chart_options['연령대'] = '연령대별 분포'
+            if '업무만족도' in cube.index.names: chart_options['업무만족도'] = '업무만족도'
+            if '결혼여부' in cube.index.names: chart_options['결혼여부'] = '결혼여부'
+
             if chart_options:
                 selected_chart_col = st.selectbox("파이 차트 선택", options=list(chart_options.keys()), format_func=lambda x: chart_options[x])
-                chart_data = temp_df[selected_chart_col].value_counts()
-                fig_pie = px.pie(values=chart_data.values, names=chart_data.index, title=chart_options[selected_chart_col], hole=0.3)
-                st.plotly_chart(fig_pie, use_container_width=True)
+                def build_pie():
+                    chart_data = cube_distribution(filtered_cube, selected_chart_col)
+                    return px.pie(values=chart_data.values, names=chart_data.index, title=chart_options[selected_chart_col], hole=0.3)
+                plot_cached('home_pie', build_pie, (tuple(selected_depts), selected_chart_col))
         
         with col2:
-            if ('나이' in mapping and mapping['나이'] in filtered_df.columns and 
-                '월급여' in mapping and mapping['월급여'] in filtered_df.columns):
-                
-                temp_df = filtered_df.copy()
-                temp_df['연령대'] = pd.cut(temp_df[mapping['나이']], bins=[17, 29, 39, 49, 100], labels=['20대', '30대', '40대', '50대+'])
-                age_salary = temp_df.groupby('연령대', observed=False).agg(
-                    평균급여=(mapping['월급여'], 'mean'),
-                    인원수=(mapping['월급여'], 'count')
-                ).reset_index()
-                
-                fig_combo = make_subplots(specs=[[{"secondary_y": True}]])
-                fig_combo.add_trace(go.Bar(x=age_salary['연령대'], y=age_salary['인원수'], name='인원수'), secondary_y=False)
-                fig_combo.add_trace(go.Scatter(x=age_salary['연령대'], y=age_salary['평균급여'], name='평균 월급여', mode='lines+markers'), secondary_y=True)
-                fig_combo.update_layout(title="연령대별 인원 및 평균 월급여", yaxis_title="인원수", yaxis2_title="평균 월급여")
-                st.plotly_chart(fig_combo, use_container_width=True)
+            age_salary = cube_age_salary(filtered_cube)
+            if age_salary is not None:
+                def build_combo():
+                    fig_combo = make_subplots(specs=[[{"secondary_y": True}]])
+                    fig_combo.add_trace(go.Bar(x=age_salary['연령대'], y=age_salary['인원수'], name='인원수'), secondary_y=False)
+                    fig_combo.add_trace(go.Scatter(x=age_salary['연령대'], y=age_salary['평균급여'], name='평균 월급여', mode='lines+markers'), secondary_y=True)
+                    fig_combo.update_layout(title="연령대별 인원 및 평균 월급여", yaxis_title="인원수", yaxis2_title="평균 월급여")
+                    return fig_combo
+                plot_cached('home_age_salary', build_combo, tuple(selected_depts))
 
     else:
         st.info("📁 왼쪽 사이드바에서 CSV 파일을 업로드하여 대시보드를 시작하세요.")
 
 elif menu == "⚠️ 조기 경보":
     st.title("⚠️ Early Warning System (조기 경보)")
-    if st.session_state.df is not None:
-        df = st.session_state.df.copy()
+    if st.session_state.df is not None or summary is not None:
+        px, go, make_subplots = load_plotly()
+        df = st.session_state.df
         mapping = st.session_state.column_mapping
-        
+
         with st.expander("ℹ️ 조기 경보 점수 계산 공식 보기"):
             st.markdown("""
             **- 업무만족도:** 2점 이하 (+40점), 3점 (+20점)
@@ -223,26 +448,31 @@ elif menu == "⚠️ 조기 경보":
             **- 장거리 출퇴근:** 20km 초과 (+10점)
             """)
         
-        df['early_warning_score'] = calculate_early_warning_score(df, mapping)
-        high_risk = df[df['early_warning_score'] >= 70]
-        medium_risk = df[(df['early_warning_score'] >= 40) & (df['early_warning_score'] < 70)]
-        low_risk = df[df['early_warning_score'] < 40]
-        
+        with profiler.stage('조기 경보 집계'):
+            if summary is not None:
+                total = summary.rows
+                n_low, n_medium, n_high = summary.level_counts(EARLY_WARNING)
+                avg_score = summary.mean_score(EARLY_WARNING)
+                dept_risk = summary.department_high_risk(EARLY_WARNING) if summary.has_departments else None
+            else:
+                ew = page_aggregate('early_warning', st.session_state.df_fingerprint, mapping,
+                                    lambda: early_warning_summary(df, derived, mapping))
+                total, (n_low, n_medium, n_high), avg_score, dept_risk = ew['total'], ew['counts'], ew['mean'], ew['dept_risk']
+
         # Insight comment
-        high_risk_pct = (len(high_risk) / len(df)) * 100
+        high_risk_pct = (n_high / total) * 100
         insight = generate_insight_comment(high_risk_pct, '조기 경보 시스템')
         st.markdown(f'<div class="insight-box">{insight}</div>', unsafe_allow_html=True)
         
         # Metric cards
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("🔴 고위험군", f"{len(high_risk)}명", f"{high_risk_pct:.1f}%")
+            st.metric("🔴 고위험군", f"{n_high}명", f"{high_risk_pct:.1f}%")
         with col2:
-            st.metric("🟡 중위험군", f"{len(medium_risk)}명", f"{(len(medium_risk)/len(df)*100):.1f}%")
+            st.metric("🟡 중위험군", f"{n_medium}명", f"{(n_medium/total*100):.1f}%")
         with col3:
-            st.metric("🟢 저위험군", f"{len(low_risk)}명", f"{(len(low_risk)/len(df)*100):.1f}%")
+            st.metric("🟢 저위험군", f"{n_low}명", f"{(n_low/total*100):.1f}%")
         with col4:
-            avg_score = df['early_warning_score'].mean()
             st.metric("평균 위험 점수", f"{avg_score:.1f}점")
         
         st.markdown("---")
@@ -252,31 +482,22 @@ elif menu == "⚠️ 조기 경보":
         with col1:
             risk_dist = pd.DataFrame({
                 '위험군': ['고위험', '중위험', '저위험'],
-                '인원': [len(high_risk), len(medium_risk), len(low_risk)]
+                '인원': [n_high, n_medium, n_low]
             })
-            fig_risk = px.pie(risk_dist, values='인원', names='위험군', title="위험군 분포", hole=0.4,
-                              color_discrete_map={'고위험': '#ff4444', '중위험': '#ffaa00', '저위험': '#00c851'})
-            st.plotly_chart(fig_risk, use_container_width=True)
+            plot_cached('ew_risk_pie', lambda: px.pie(risk_dist, values='인원', names='위험군', title="위험군 분포", hole=0.4,
+                                                      color_discrete_map={'고위험': '#ff4444', '중위험': '#ffaa00', '저위험': '#00c851'}))
         
         # Bar chart for department-wise high-risk percentage
         with col2:
-            if '부서' in mapping and mapping['부서'] in df.columns:
-                dept_risk = df.groupby(mapping['부서'])['early_warning_score'].apply(
-                    lambda x: (x >= 70).sum() / len(x) * 100
-                ).reset_index()
-                dept_risk.columns = ['부서', '고위험군 비율(%)']
-                fig_dept_risk = px.bar(dept_risk, x='부서', y='고위험군 비율(%)',
-                                       title="부서별 고위험군 비율",
-                                       color='고위험군 비율(%)', color_continuous_scale='Reds')
-                st.plotly_chart(fig_dept_risk, use_container_width=True)
+            if dept_risk is not None:
+                plot_cached('ew_dept_risk', lambda: px.bar(dept_risk, x='부서', y='고위험군 비율(%)',
+                                                           title="부서별 고위험군 비율",
+                                                           color='고위험군 비율(%)', color_continuous_scale='Reds'))
         
         # High-risk employee table
         st.markdown("### 🔴 고위험군 직원 리스트")
-        if len(high_risk) > 0:
-            display_cols = [col for col in [mapping.get('직원ID'), mapping.get('부서'), 
-                                           mapping.get('업무만족도'), mapping.get('야근정도'),
-                                           'early_warning_score'] if col in df.columns]
-            st.dataframe(high_risk[display_cols].head(20))
+        if n_high > 0:
+            show_risk_list(EARLY_WARNING, 'ew_table', summary, df, derived, mapping)
         else:
             st.info("고위험군 직원이 없습니다.")
     else:
@@ -284,10 +505,11 @@ elif menu == "⚠️ 조기 경보":
 
 elif menu == "📈 잔류 위험":
     st.title("📈 Retention Risk Score (잔류 위험 점수)")
-    if st.session_state.df is not None:
-        df = st.session_state.df.copy()
+    if st.session_state.df is not None or summary is not None:
+        px, go, make_subplots = load_plotly()
+        df = st.session_state.df
         mapping = st.session_state.column_mapping
-        
+
         with st.expander("ℹ️ 잔류 위험 점수 계산 공식 보기"):
             st.markdown("""
             **- 야근:** Yes (+25점)
@@ -297,126 +519,284 @@ elif menu == "📈 잔류 위험":
             **- 과거 근무 회사 수:** 회사 수 × 2 (최대 15점)
             """)
         
-        df['retention_risk_score'] = calculate_retention_risk_score(df, mapping)
-        high_risk = df[df['retention_risk_score'] >= 70]
-        medium_risk = df[(df['retention_risk_score'] >= 50) & (df['retention_risk_score'] < 70)]
-        low_risk = df[df['retention_risk_score'] < 50]
-        
+        risk_levels = ['저위험\n(<50)', '중위험\n(50-69)', '고위험\n(≥70)']
+        with profiler.stage('잔류 위험 집계'):
+            if summary is not None:
+                total = summary.rows
+                n_low, n_medium, n_high = summary.level_counts(RETENTION_RISK)
+                avg_risk = summary.mean_score(RETENTION_RISK)
+                attrition_by_risk = summary.attrition_by_level(RETENTION_RISK) if '퇴직여부' in mapping else None
+                model_attrition_by_risk = None
+                factors = summary.factor_means()
+            else:
+                rr = page_aggregate('retention_risk', st.session_state.df_fingerprint, mapping,
+                                    lambda: retention_summary(df, derived, mapping))
+                total, (n_low, n_medium, n_high), avg_risk = rr['total'], rr['counts'], rr['mean']
+                attrition_by_risk, factors = rr['attrition_by_risk'], rr['factors']
+
+                model_attrition_by_risk = None
+                if attrition_by_risk is not None:
+                    model, proba, model_error = attrition_model(df, st.session_state.df_fingerprint, mapping)
+                    if model_error is not None:
+                        st.caption(f"모델 기준 퇴직률 비교를 생략합니다: {model_error}")
+                    if proba is not None:
+                        model_levels = rank_levels(proba, (n_low, n_medium, n_high))
+                        model_attrition_by_risk = [rate * 100 for rate in level_means(model_levels, derived['is_leaver'])]
+
         # Insight comment
-        avg_risk = df['retention_risk_score'].mean()
         insight = f"🚨 퇴직 위험이 매우 높습니다. 근무환경 개선이 시급합니다." if avg_risk > 60 else \
-                  f"⚡ 퇴직 위험 평균 {avg_risk:.1f}점, 고위험군 {len(high_risk)}명에 집중 관리 필요." if avg_risk > 40 else \
+                  f"⚡ 퇴직 위험 평균 {avg_risk:.1f}점, 고위험군 {n_high}명에 집중 관리 필요." if avg_risk > 40 else \
                   f"💚 퇴직 위험이 평균 {avg_risk:.1f}점으로 낮은 수준입니다."
         st.markdown(f'<div class="warning-box">{insight}</div>', unsafe_allow_html=True)
         
         # Metric cards
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("🚨 고위험군", f"{len(high_risk)}명", f"{(len(high_risk)/len(df)*100):.1f}%")
+            st.metric("🚨 고위험군", f"{n_high}명", f"{(n_high/total*100):.1f}%")
         with col2:
-            st.metric("⚡ 중위험군", f"{len(medium_risk)}명", f"{(len(medium_risk)/len(df)*100):.1f}%")
+            st.metric("⚡ 중위험군", f"{n_medium}명", f"{(n_medium/total*100):.1f}%")
         with col3:
-            st.metric("✅ 저위험군", f"{len(low_risk)}명", f"{(len(low_risk)/len(df)*100):.1f}%")
+            st.metric("✅ 저위험군", f"{n_low}명", f"{(n_low/total*100):.1f}%")
         with col4:
             st.metric("평균 위험 점수", f"{avg_risk:.1f}점", delta="높음" if avg_risk > 60 else "보통")
         
         st.markdown("---")
         
         # Histogram for risk score distribution
-        fig_hist = px.histogram(df, x='retention_risk_score', nbins=30,
-                                title="잔류 위험 점수 분포",
-                                labels={'retention_risk_score': '위험 점수', 'count': '인원수'})
-        fig_hist.add_vline(x=70, line_dash="dash", line_color="red", annotation_text="고위험 기준선")
-        fig_hist.add_vline(x=50, line_dash="dash", line_color="orange", annotation_text="중위험 기준선")
-        st.plotly_chart(fig_hist, use_container_width=True)
+        def build_hist():
+            if summary is not None:
+                score_dist = summary.score_distribution(RETENTION_RISK)
+                fig_hist = px.histogram(x=score_dist.index, y=score_dist['n'], histfunc='sum', nbins=30,
+                                        title="잔류 위험 점수 분포",
+                                        labels={'x': '위험 점수', 'y': '인원수'})
+            else:
+                fig_hist = px.histogram(derived, x='retention_risk_score', nbins=30,
+                                        title="잔류 위험 점수 분포",
+                                        labels={'retention_risk_score': '위험 점수', 'count': '인원수'})
+            fig_hist.add_vline(x=70, line_dash="dash", line_color="red", annotation_text="고위험 기준선")
+            fig_hist.add_vline(x=50, line_dash="dash", line_color="orange", annotation_text="중위험 기준선")
+            return fig_hist
+        plot_cached('rr_score_hist', build_hist)
         
         col1, col2 = st.columns(2)
         
         # Bar chart for attrition by risk level
         with col1:
-            if '퇴직여부' in mapping and mapping['퇴직여부'] in df.columns:
-                df['퇴직'] = df[mapping['퇴직여부']].isin(['Yes', 'yes', '예', '네']).astype(int)
-                risk_levels = ['저위험\n(<50)', '중위험\n(50-69)', '고위험\n(≥70)']
-                attrition_by_risk = [
-                    df[df['retention_risk_score'] < 50]['퇴직'].mean() * 100,
-                    df[(df['retention_risk_score'] >= 50) & (df['retention_risk_score'] < 70)]['퇴직'].mean() * 100,
-                    df[df['retention_risk_score'] >= 70]['퇴직'].mean() * 100
-                ]
-                fig_validation = go.Figure(data=[
-                    go.Bar(x=risk_levels, y=attrition_by_risk, marker_color=['#00c851', '#ffaa00', '#ff4444'])
-                ])
-                fig_validation.update_layout(title="위험군별 실제 퇴직률 검증", yaxis_title="퇴직률 (%)")
-                st.plotly_chart(fig_validation, use_container_width=True)
+            if attrition_by_risk is not None:
+                def build_validation():
+                    fig_validation = go.Figure(data=[
+                        go.Bar(x=risk_levels, y=attrition_by_risk, marker_color=['#00c851', '#ffaa00', '#ff4444'])
+                    ])
+                    fig_validation.update_layout(title="위험군별 실제 퇴직률 검증", yaxis_title="퇴직률 (%)")
+                    if model_attrition_by_risk is not None:
+                        fig_validation.data[0].name = '규칙 기반 점수'
+                        fig_validation.add_trace(go.Bar(x=risk_levels, y=model_attrition_by_risk, name='로지스틱 회귀 (같은 인원)',
+                                                        marker_color=['#00c851', '#ffaa00', '#ff4444'], marker_pattern_shape='/'))
+                        fig_validation.update_layout(barmode='group', legend=dict(orientation='h', y=-0.2))
+                    return fig_validation
+                plot_cached('rr_validation', build_validation, model_attrition_by_risk is not None)
+                if model_attrition_by_risk is not None:
+                    st.caption("로지스틱 회귀는 예측 퇴직 확률 순으로 규칙 기반 위험군과 같은 인원씩 나눴습니다. "
+                               "고위험군 퇴직률이 높을수록 퇴직자를 잘 가려냅니다.")
         
         # Bar chart for key risk factors
         with col2:
-            factors = []
-            if '야근정도' in mapping and mapping['야근정도'] in df.columns:
-                overtime_impact = df[df[mapping['야근정도']].isin(['Yes', 'yes', '예', '네'])]['retention_risk_score'].mean()
-                factors.append(('야근', overtime_impact))
-            if '업무만족도' in mapping and mapping['업무만족도'] in df.columns:
-                low_satisfaction_impact = df[df[mapping['업무만족도']] <= 2]['retention_risk_score'].mean()
-                factors.append(('낮은 만족도', low_satisfaction_impact))
-            if '마지막승진년수' in mapping and mapping['마지막승진년수'] in df.columns:
-                promotion_stagnation_impact = df[df[mapping['마지막승진년수']] >= 3]['retention_risk_score'].mean()
-                factors.append(('승진 정체', promotion_stagnation_impact))
             if factors:
                 factor_df = pd.DataFrame(factors, columns=['요인', '평균 위험 점수'])
-                fig_factors = px.bar(factor_df, x='요인', y='평균 위험 점수',
-                                    title="주요 위험 요인별 영향도",
-                                    color='평균 위험 점수', color_continuous_scale='YlOrRd')
-                st.plotly_chart(fig_factors, use_container_width=True)
+                plot_cached('rr_factors', lambda: px.bar(factor_df, x='요인', y='평균 위험 점수',
+                                                         title="주요 위험 요인별 영향도",
+                                                         color='평균 위험 점수', color_continuous_scale='YlOrRd'))
         
         # High-risk employee table
         st.markdown("### 🚨 고위험군 직원 리스트")
-        if len(high_risk) > 0:
-            display_cols = [col for col in [mapping.get('직원ID'), mapping.get('부서'), 
-                                           mapping.get('업무만족도'), mapping.get('야근정도'),
-                                           'retention_risk_score'] if col in df.columns]
-            st.dataframe(high_risk[display_cols].head(20))
+        if n_high > 0:
+            show_risk_list(RETENTION_RISK, 'rr_table', summary, df, derived, mapping)
         else:
             st.info("고위험군 직원이 없습니다.")
     else:
         st.info("📁 왼쪽 사이드바에서 CSV 파일을 업로드하여 대시보드를 시작하세요.")
 
+elif menu == "🤖 예측 모델":
+    st.title("🤖 Attrition Model (퇴직 예측 모델)")
+    if st.session_state.df is not None:
+        df = st.session_state.df
+        mapping = st.session_state.column_mapping
+        st.info("매핑된 인사 필드로 퇴직여부를 예측하는 로지스틱 회귀 모델입니다. 수치 특성은 표준화해 1 표준편차당 효과를, "
+                "야근·범주 특성은 가장 흔한 범주 대비 효과를 오즈비로 보여줍니다. 데이터셋과 매핑마다 한 번만 적합합니다.")
+        model, proba, error = attrition_model(df, st.session_state.df_fingerprint, mapping)
+        if error is not None:
+            st.warning(error)
+        elif 'is_leaver' in derived.columns:
+            px, go, make_subplots = load_plotly()
+            is_leaver = derived['is_leaver'].to_numpy()
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                sampled = f"층화 표본 {model.n_train / model.n_rows:.0%}" if model.n_train < model.n_rows else "전체"
+                st.metric("학습 행 수", f"{model.n_train:,}명", sampled, delta_color="off")
+            with col2:
+                st.metric("Pseudo R²", f"{model.pseudo_r2:.3f}")
+            with col3:
+                model_auc = roc_auc(proba, is_leaver)
+                st.metric("모델 AUC", f"{model_auc:.3f}")
+            with col4:
+                rule_auc = roc_auc(derived['retention_risk_score'].to_numpy(), is_leaver)
+                st.metric("잔류 위험 점수 AUC", f"{rule_auc:.3f}", f"{rule_auc - model_auc:+.3f}")
+
+            col1, col2 = st.columns(2)
+            coefficients = model.coefficients()
+            with col1:
+                def build_coef():
+                    top = coefficients.head(15).iloc[::-1]
+                    fig_coef = go.Figure(go.Bar(x=top['오즈비'], y=top['특성'], orientation='h',
+                                                marker_color=np.where(top['계수'] > 0, '#ff4444', '#00c851')))
+                    fig_coef.update_layout(title="퇴직 오즈비 상위 15개 특성", xaxis_type='log', xaxis_title="오즈비 (로그 축)")
+                    fig_coef.add_vline(x=1, line_dash="dash", line_color="gray")
+                    return fig_coef
+                plot_cached('model_coefficients', build_coef)
+            with col2:
+                def build_proba():
+                    counts, edges = np.histogram(proba, bins=20, range=(0, 1))
+                    leavers, _ = np.histogram(proba[is_leaver], bins=edges)
+                    fig_proba = go.Figure([go.Bar(x=edges[:-1] + 0.025, y=counts - leavers, name='재직', marker_color='#4c78a8'),
+                                           go.Bar(x=edges[:-1] + 0.025, y=leavers, name='퇴직', marker_color='#ff4444')])
+                    fig_proba.update_layout(barmode='stack', title="예측 퇴직 확률 분포", xaxis_title="예측 퇴직 확률",
+                                            yaxis_title="인원수")
+                    return fig_proba
+                plot_cached('model_probability', build_proba)
+
+            with st.expander("📋 계수 표"):
+                st.dataframe(coefficients.round(4), hide_index=True, use_container_width=True)
+
+            st.markdown("### 🎯 예측 퇴직 확률 상위 직원")
+            display_cols = [col for col in [mapping.get('직원ID'), mapping.get('부서'), mapping.get('업무만족도'),
+                                           mapping.get('야근정도'), mapping.get('퇴직여부')] if col in df.columns]
+            show_ranked_table(df, np.round(proba, 4), np.arange(len(df)), display_cols, '퇴직확률', 'model_table')
+        else:
+            st.warning("'퇴직여부' 컬럼이 매핑되지 않아 모델을 적합할 수 없습니다.")
+    elif summary is not None:
+        st.info("📦 대용량 모드에서는 원본 행을 보관하지 않으므로 모델을 적합할 수 없습니다. 일반 모드로 파일을 불러오세요.")
+    else:
+        st.info("📁 왼쪽 사이드바에서 CSV 파일을 업로드하여 대시보드를 시작하세요.")
+
+elif menu == "🎯 기준점 검증":
+    st.title("🎯 Cut-off Validation (기준점 검증)")
+    has_rows = st.session_state.df is not None and 'is_leaver' in derived.columns
+    if has_rows or (summary is not None and '퇴직여부' in summary.mapping):
+        px, go, make_subplots = load_plotly()
+        score_options = {'⚠️ 조기 경보': EARLY_WARNING, '📈 잔류 위험': RETENTION_RISK}
+        spec = score_options[st.radio("검증할 점수", list(score_options), horizontal=True, key='sweep_score')]
+        st.info("점수가 기준점 이상인 직원을 위험군으로 볼 때 실제 퇴직자를 얼마나 가려내는지 모든 기준점에 대해 계산합니다. "
+                "규칙 가중치를 바꾸면 곡선과 추천 기준점이 바로 다시 계산됩니다.")
+
+        started = time.perf_counter()
+        if has_rows:
+            df = st.session_state.df
+            mapping = st.session_state.column_mapping
+            weight_keys = [f"sweep_w_{spec.name}_{i}" for i in range(len(spec.rules))]
+            with st.expander("⚖️ 규칙 가중치 조정 (what-if)"):
+                st.caption("각 규칙 점수에 곱할 배율입니다. 1.0이 현재 공식이고 0이면 규칙을 뺍니다.")
+                if st.button("기본값으로", key=f"sweep_reset_{spec.name}"):
+                    for key in weight_keys:
+                        st.session_state[key] = 1.0
+                weight_cols = st.columns(len(spec.rules))
+                weights = []
+                for col, rule, key in zip(weight_cols, spec.rules, weight_keys):
+                    with col:
+                        weights.append(st.slider(describe_rule(rule), 0.0, 3.0, 1.0, 0.1, key=key))
+            with profiler.stage('기준점 스윕'):
+                contributions = get_cached_aggregate(f"rule_contributions:{spec.name}", st.session_state.df_fingerprint,
+                                                     mapping, lambda: rule_contributions(df, mapping, spec))
+                scores = contributions @ np.asarray(weights)
+                sweep = threshold_sweep(*count_by_value(scores, derived['is_leaver']))
+            rows = len(df)
+        else:
+            st.caption("📦 대용량 모드에서는 집계해 둔 점수 분포로 현재 공식만 검증합니다.")
+            dist = summary.score_distribution(spec)
+            sweep = threshold_sweep(dist.index.to_numpy(dtype=np.float64), dist['leavers'].to_numpy(),
+                                    (dist['n'] - dist['leavers']).to_numpy())
+            rows = summary.rows
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        recommended = recommended_cutoffs(sweep)
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("ROC AUC", f"{roc_auc_from_sweep(sweep):.3f}")
+        with col2:
+            st.metric("평균 정밀도 (AP)", f"{average_precision(sweep):.3f}")
+        for col, (label, row) in zip((col3, col4), recommended.items()):
+            with col:
+                st.metric(f"추천 기준점 ({label})", f"{row['threshold']:g}점",
+                          f"정밀도 {row['precision']:.0%} · 재현율 {row['tpr']:.0%}", delta_color="off")
+        st.caption(f"{rows:,}행 · 기준점 {len(sweep):,}개 · {elapsed_ms:,.0f}ms")
+
+        low, high = float(sweep['threshold'].min()), float(sweep['threshold'].max())
+        cutoff_key = f"sweep_cutoff_{spec.name}"
+        if cutoff_key in st.session_state:
+            st.session_state[cutoff_key] = min(max(st.session_state[cutoff_key], low), high)
+        cutoff = st.slider("기준점", low, max(high, low + 1), float(min(max(spec.bands[1], low), high)), key=cutoff_key)
+        chosen = at_threshold(sweep, cutoff)
+
+        compare = [(f"현재 중위험 기준 ({spec.bands[0]})", at_threshold(sweep, spec.bands[0])),
+                   (f"현재 고위험 기준 ({spec.bands[1]})", at_threshold(sweep, spec.bands[1])),
+                   (f"선택 기준점 ({cutoff:g})", chosen)] + [(f"추천: {label}", row) for label, row in recommended.items()]
+        compare = pd.DataFrame([{'기준': label, '기준점': row['threshold'], '대상 비율(%)': row['flagged_pct'],
+                                 '정밀도(%)': row['precision'] * 100, '재현율(%)': row['tpr'] * 100, 'F1': row['f1'],
+                                 '퇴직자 포착': int(row['tp']), '오경보': int(row['fp'])}
+                                for label, row in compare if row is not None])
+        st.dataframe(compare.round(2), hide_index=True, use_container_width=True)
+
+        marks = [(f"고위험 {spec.bands[1]}", at_threshold(sweep, spec.bands[1]), '#ff4444'),
+                 (f"선택 {cutoff:g}", chosen, '#ffaa00')]
+        col1, col2 = st.columns(2)
+        with col1:
+            fig_roc = go.Figure(go.Scatter(x=np.r_[0, sweep['fpr']], y=np.r_[0, sweep['tpr']], mode='lines', name='ROC'))
+            fig_roc.add_trace(go.Scatter(x=[0, 1], y=[0, 1], mode='lines', line=dict(dash='dash', color='gray'), name='무작위'))
+            for label, row, color in marks:
+                if row is not None:
+                    fig_roc.add_trace(go.Scatter(x=[row['fpr']], y=[row['tpr']], mode='markers', name=label,
+                                                 marker=dict(size=12, color=color)))
+            fig_roc.update_layout(title="ROC 곡선", xaxis_title="오경보율 (FPR)", yaxis_title="재현율 (TPR)")
+            plot(fig_roc)
+        with col2:
+            fig_pr = go.Figure(go.Scatter(x=sweep['tpr'], y=sweep['precision'], mode='lines', name='PR'))
+            for label, row, color in marks:
+                if row is not None:
+                    fig_pr.add_trace(go.Scatter(x=[row['tpr']], y=[row['precision']], mode='markers', name=label,
+                                                marker=dict(size=12, color=color)))
+            fig_pr.update_layout(title="정밀도-재현율 곡선", xaxis_title="재현율", yaxis_title="정밀도")
+            plot(fig_pr)
+
+        curve = sweep[['threshold', 'precision', 'tpr', 'f1']].rename(columns={'precision': '정밀도', 'tpr': '재현율', 'f1': 'F1'})
+        fig_curve = px.line(curve, x='threshold', y=['정밀도', '재현율', 'F1'], title="기준점별 정밀도 · 재현율 · F1",
+                            labels={'threshold': '기준점', 'value': '값', 'variable': '지표'})
+        fig_curve.add_vline(x=spec.bands[1], line_dash="dash", line_color="red", annotation_text="현재 고위험 기준")
+        fig_curve.add_vline(x=cutoff, line_dash="dot", line_color="orange", annotation_text="선택")
+        plot(fig_curve)
+    elif st.session_state.df is not None or summary is not None:
+        st.warning("'퇴직여부' 컬럼이 매핑되지 않아 기준점을 검증할 수 없습니다.")
+    else:
+        st.info("📁 왼쪽 사이드바에서 CSV 파일을 업로드하여 대시보드를 시작하세요.")
+
 elif menu == "🏢 부서 건강도":
     st.title("🏢 Department Health (부서 건강도)")
-    if st.session_state.df is not None and '부서' in st.session_state.column_mapping and st.session_state.column_mapping['부서'] in st.session_state.df.columns:
-        df = st.session_state.df.copy()
+    if ((summary is not None and summary.has_departments) or
+            (st.session_state.df is not None and '부서' in st.session_state.column_mapping and st.session_state.column_mapping['부서'] in st.session_state.df.columns)):
+        px, go, make_subplots = load_plotly()
+        df = st.session_state.df
         mapping = st.session_state.column_mapping
-        dept_col = mapping['부서']
-        
+
         # Department statistics
-        dept_stats = []
-        for dept in df[dept_col].unique():
-            dept_df = df[df[dept_col] == dept]
-            stats = {
-                '부서': dept,
-                '인원': len(dept_df),
-                '퇴직률': 0,
-                '평균만족도': 0,
-                '야근비율': 0,
-                '평균근속': 0,
-                '건강도점수': 0
-            }
-            if '퇴직여부' in mapping and mapping['퇴직여부'] in df.columns:
-                stats['퇴직률'] = (dept_df[mapping['퇴직여부']].isin(['Yes', 'yes', '예', '네']).sum() / len(dept_df)) * 100
-            satisfaction_cols = [col for col in [mapping.get('업무만족도'), mapping.get('업무환경만족도')] if col in df.columns]
-            if satisfaction_cols:
-                stats['평균만족도'] = dept_df[satisfaction_cols].mean().mean()
-            if '야근정도' in mapping and mapping['야근정도'] in df.columns:
-                stats['야근비율'] = (dept_df[mapping['야근정도']].isin(['Yes', 'yes', '예', '네']).sum() / len(dept_df)) * 100
-            if '근속연수' in mapping and mapping['근속연수'] in df.columns:
-                stats['평균근속'] = dept_df[mapping['근속연수']].mean()
-            health_score = 0
-            health_score += (stats['평균만족도'] / 4) * 25 if stats['평균만족도'] > 0 else 0
-            health_score += (100 - stats['퇴직률']) * 0.3
-            health_score += (100 - stats['야근비율']) * 0.25
-            health_score += min(20, stats['평균근속'] * 2) if stats['평균근속'] > 0 else 0
-            stats['건강도점수'] = health_score
-            dept_stats.append(stats)
-        
-        dept_df_stats = pd.DataFrame(dept_stats)
+        with profiler.stage('부서 건강도 집계'):
+            group_fields = []
+            if summary is not None:
+                dept_df_stats = summary.department_health()
+            else:
+                # 부서 외 추가 그룹 기준 (부서 × 전공, 부서 × 성별 등)
+                extra_fields = [field for field in ['전공', '성별', '결혼여부', '출장빈도']
+                                if field in mapping and mapping[field] in df.columns and mapping[field] != mapping['부서']]
+                group_fields = st.multiselect("세부 그룹 기준 (부서 × ...)", extra_fields)
+                dept_df_stats = page_aggregate(' × '.join(['department_health'] + group_fields), st.session_state.df_fingerprint,
+                                               mapping, lambda: department_summary(df, derived, mapping, group_fields))
         
         # Insight comment
         best_dept = dept_df_stats.loc[dept_df_stats['건강도점수'].idxmax(), '부서']
@@ -443,45 +823,49 @@ elif menu == "🏢 부서 건강도":
         st.markdown("---")
         
         # Radar chart for department health
-        categories = ['만족도', '유지율', '워라벨', '안정성']
-        fig_radar = go.Figure()
-        for _, dept_row in dept_df_stats.iterrows():
-            values = [
-                (dept_row['평균만족도'] / 4) * 100 if dept_row['평균만족도'] > 0 else 0,
-                100 - dept_row['퇴직률'],
-                100 - dept_row['야근비율'],
-                min(100, dept_row['평균근속'] * 10) if dept_row['평균근속'] > 0 else 0
-            ]
-            fig_radar.add_trace(go.Scatterpolar(
-                r=values, theta=categories, fill='toself', name=dept_row['부서']
-            ))
-        fig_radar.update_layout(
-            polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
-            showlegend=True, title="부서별 건강도 레이더 차트"
-        )
-        st.plotly_chart(fig_radar, use_container_width=True)
+        def build_radar():
+            categories = ['만족도', '유지율', '워라벨', '안정성']
+            fig_radar = go.Figure()
+            for _, dept_row in dept_df_stats.iterrows():
+                values = [
+                    (dept_row['평균만족도'] / 4) * 100 if dept_row['평균만족도'] > 0 else 0,
+                    100 - dept_row['퇴직률'],
+                    100 - dept_row['야근비율'],
+                    min(100, dept_row['평균근속'] * 10) if dept_row['평균근속'] > 0 else 0
+                ]
+                fig_radar.add_trace(go.Scatterpolar(
+                    r=values, theta=categories, fill='toself', name=dept_row['부서']
+                ))
+            fig_radar.update_layout(
+                polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
+                showlegend=True, title="부서별 건강도 레이더 차트"
+            )
+            return fig_radar
+        plot_cached('department_radar', build_radar, tuple(group_fields))
         
         # Heatmap for department metrics
         st.markdown("### 부서별 상세 지표")
-        heatmap_data = dept_df_stats[['부서', '퇴직률', '평균만족도', '야근비율', '평균근속', '건강도점수']]
-        heatmap_data_normalized = heatmap_data.copy()
-        for col in ['퇴직률', '평균만족도', '야근비율', '평균근속', '건강도점수']:
-            if col == '퇴직률' or col == '야근비율':
-                heatmap_data_normalized[col] = 1 - (heatmap_data[col] / heatmap_data[col].max()) if heatmap_data[col].max() > 0 else 0
-            else:
-                heatmap_data_normalized[col] = heatmap_data[col] / heatmap_data[col].max() if heatmap_data[col].max() > 0 else 0
-        fig_heatmap = go.Figure(data=go.Heatmap(
-            z=heatmap_data_normalized[['퇴직률', '평균만족도', '야근비율', '평균근속', '건강도점수']].values.T,
-            x=heatmap_data['부서'].values,
-            y=['퇴직률↓', '만족도↑', '야근↓', '근속↑', '건강도↑'],
-            colorscale='RdYlGn',
-            text=heatmap_data[['퇴직률', '평균만족도', '야근비율', '평균근속', '건강도점수']].values.T,
-            texttemplate='%{text:.1f}',
-            textfont={"size": 10},
-            colorbar=dict(title="상대 점수")
-        ))
-        fig_heatmap.update_layout(title="부서별 지표 히트맵 (↑높을수록 좋음, ↓낮을수록 좋음)", height=400)
-        st.plotly_chart(fig_heatmap, use_container_width=True)
+        def build_heatmap():
+            heatmap_data = dept_df_stats[['부서', '퇴직률', '평균만족도', '야근비율', '평균근속', '건강도점수']]
+            heatmap_data_normalized = heatmap_data.copy()
+            for col in ['퇴직률', '평균만족도', '야근비율', '평균근속', '건강도점수']:
+                if col == '퇴직률' or col == '야근비율':
+                    heatmap_data_normalized[col] = 1 - (heatmap_data[col] / heatmap_data[col].max()) if heatmap_data[col].max() > 0 else 0
+                else:
+                    heatmap_data_normalized[col] = heatmap_data[col] / heatmap_data[col].max() if heatmap_data[col].max() > 0 else 0
+            fig_heatmap = go.Figure(data=go.Heatmap(
+                z=heatmap_data_normalized[['퇴직률', '평균만족도', '야근비율', '평균근속', '건강도점수']].values.T,
+                x=heatmap_data['부서'].values,
+                y=['퇴직률↓', '만족도↑', '야근↓', '근속↑', '건강도↑'],
+                colorscale='RdYlGn',
+                text=heatmap_data[['퇴직률', '평균만족도', '야근비율', '평균근속', '건강도점수']].values.T,
+                texttemplate='%{text:.1f}',
+                textfont={"size": 10},
+                colorbar=dict(title="상대 점수")
+            ))
+            fig_heatmap.update_layout(title="부서별 지표 히트맵 (↑높을수록 좋음, ↓낮을수록 좋음)", height=400)
+            return fig_heatmap
+        plot_cached('department_heatmap', build_heatmap, tuple(group_fields))
         
         # Department summary table
         st.markdown("### 부서별 핵심 지표 비교")
@@ -495,12 +879,169 @@ elif menu == "🏢 부서 건강도":
     else:
         st.warning("부서 데이터를 분석하려면 파일을 업로드하고 '⚙️ 컬럼 매핑' 메뉴에서 **'부서' 필드를 정확히 지정**해주세요.")
 
+elif menu == "📅 시계열":
+    st.title("📅 Snapshot Trends (스냅샷 시계열)")
+    st.info("월별 내보내기 파일을 날짜와 함께 추가하면 직원ID로 직전 스냅샷과 비교해 바뀐 직원만 다시 계산하고, "
+            "퇴직률·위험 점수·부서 건강도 추이를 보여줍니다.")
+
+    existing_series = list_series()
+    col1, col2 = st.columns(2)
+    with col1:
+        series_name = st.selectbox("시계열", existing_series + ['➕ 새 시계열'], key='series_name')
+    with col2:
+        if series_name == '➕ 새 시계열':
+            series_name = st.text_input("새 시계열 이름", value="HR 월간", key='series_new_name').strip()
+    try:
+        series = SnapshotSeries(series_name) if series_name else None
+    except ValueError as e:
+        st.error(str(e))
+        series = None
+
+    with st.form('snapshot_form', clear_on_submit=True):
+        snapshot_file = st.file_uploader("스냅샷 CSV", type=['csv'], key='snapshot_file')
+        snapshot_date = st.date_input("기준일")
+        submitted = st.form_submit_button("스냅샷 추가", type="primary")
+    if submitted and series is not None and snapshot_file is not None:
+        with profiler.stage('스냅샷 변경분 적재'):
+            # 그 달에만 값이 하나뿐인 컬럼이 빠지면 컬럼 구성이 달라져 전체를 다시 집계하게 되므로 상수 컬럼도 유지
+            snapshot_df, _ = read_typed_csv(snapshot_file, drop_constant=False)
+            mapping = st.session_state.column_mapping
+            mapping = mapping if mapping and all(col in snapshot_df.columns for col in mapping.values()) else None
+            try:
+                stats = series.add(snapshot_df, snapshot_date, mapping=mapping)
+            except ValueError as e:
+                st.error(f"스냅샷을 추가하지 못했습니다: {e}")
+            else:
+                st.success(f"{stats['date']} 스냅샷 추가: {stats['rows']:,}명 중 신규 {stats['added']:,}명, "
+                           f"변경 {stats['changed']:,}명, 퇴사/제외 {stats['removed']:,}명 ({stats['seconds']:.2f}초)")
+
+    if series is not None and series.dates:
+        px, go, make_subplots = load_plotly()
+        with profiler.stage('시계열 집계'):
+            overall = series.trend(by_department=False)
+            by_dept = series.trend()
+        metric_labels = {
+            '퇴직률': '퇴직률 (%)', '건강도점수': '건강도 점수', '인원': '인원',
+            'early_warning_score_mean': '평균 조기 경보 점수', 'early_warning_score_high_pct': '조기 경보 고위험 비율 (%)',
+            'retention_risk_score_mean': '평균 잔류 위험 점수', 'retention_risk_score_high_pct': '잔류 위험 고위험 비율 (%)',
+        }
+
+        latest, first = overall.iloc[-1], overall.iloc[0]
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("스냅샷", f"{len(overall)}개", f"{first['date']} ~ {latest['date']}", delta_color="off")
+        with col2:
+            st.metric("퇴직률", f"{latest['퇴직률']:.1f}%", f"{latest['퇴직률'] - first['퇴직률']:+.1f}%p", delta_color="inverse")
+        with col3:
+            st.metric("조기 경보 고위험 비율", f"{latest['early_warning_score_high_pct']:.1f}%",
+                      f"{latest['early_warning_score_high_pct'] - first['early_warning_score_high_pct']:+.1f}%p", delta_color="inverse")
+        with col4:
+            st.metric("평균 건강도", f"{latest['건강도점수']:.1f}점", f"{latest['건강도점수'] - first['건강도점수']:+.1f}점")
+
+        fig_overall = px.line(overall, x='date', y=['퇴직률', 'early_warning_score_high_pct', 'retention_risk_score_high_pct'],
+                              markers=True, title="전체 추이 (%)", labels={'date': '기준일', 'value': '%', 'variable': '지표'})
+        fig_overall.for_each_trace(lambda trace: trace.update(name=metric_labels[trace.name]))
+        plot(fig_overall)
+
+        metric = st.selectbox("부서별 지표", list(metric_labels), format_func=metric_labels.get, index=1, key='series_metric')
+        fig_dept = px.line(by_dept, x='date', y=metric, color='부서', markers=True, title=f"부서별 {metric_labels[metric]} 추이",
+                           labels={'date': '기준일', metric: metric_labels[metric]})
+        plot(fig_dept)
+
+        st.markdown("### 📥 스냅샷 적재 기록")
+        history = pd.DataFrame(series.meta['snapshots'])[['date', 'rows', 'added', 'changed', 'removed', 'seconds']]
+        history.columns = ['기준일', '인원', '신규', '변경', '퇴사/제외', '처리 시간(초)']
+        st.dataframe(history, hide_index=True, use_container_width=True)
+    elif series is not None:
+        st.caption("아직 추가된 스냅샷이 없습니다.")
+
+elif menu == "📤 보고서 내보내기":
+    st.title("📤 Report Export (보고서 내보내기)")
+    if st.session_state.df is not None:
+        df = st.session_state.df
+        mapping = st.session_state.column_mapping
+        st.info("점수와 위험군이 붙은 전체 직원 명단을 부서별 파일(Excel은 부서별 시트)로, 부서 건강도 표와 함께 내보냅니다. "
+                "백그라운드에서 청크 단위로 쓰므로 진행 중에도 다른 페이지를 볼 수 있습니다.")
+        format_labels = {'csv': 'CSV', 'parquet': 'Parquet', 'xlsx': 'Excel (다중 시트)'}
+        available_formats = [fmt for fmt in FORMATS if fmt != 'xlsx' or excel_available()]
+        if 'xlsx' not in available_formats:
+            st.caption("Excel로 내보내려면 openpyxl을 설치하세요 (`pip install openpyxl`).")
+        formats = st.multiselect("형식", available_formats, default=available_formats[:1], format_func=format_labels.get,
+                                 key='export_formats')
+
+        job = st.session_state.export_job
+        running = job is not None and not job.done
+        if st.button("내보내기 시작", type="primary", disabled=running or not formats):
+            name = os.path.splitext(stored_datasets.get(st.session_state.dataset_id, {}).get('name', 'hr_report'))[0]
+            health = page_aggregate('department_health', st.session_state.df_fingerprint, mapping,
+                                    lambda: department_summary(df, derived, mapping))
+            st.session_state.export_job = start_export(df, derived, mapping, formats, health=health, name=name)
+            st.rerun()
+
+        @st.fragment(run_every=0.5 if running else None)
+        def export_status():
+            job = st.session_state.export_job
+            if job is None:
+                return
+            if not job.done:
+                st.progress(job.progress, text=f"⏳ {job.written:,} / {job.total:,}행 ({job.elapsed:.0f}초)")
+                if st.button("취소", key='export_cancel'):
+                    job.cancel()
+                return
+            if running:
+                st.rerun()
+            if job.cancelled:
+                st.warning("내보내기를 취소했습니다.")
+            elif job.error is not None:
+                st.error(f"내보내기 실패: {job.error}")
+            else:
+                st.success(f"{job.total:,}행을 {len(job.files)}개 파일로 내보냈습니다 ({job.elapsed:.1f}초) · `{job.output_dir}`")
+                sizes = {path: os.path.getsize(path) for path in job.files}
+                st.dataframe(pd.DataFrame({'파일': [os.path.basename(path) for path in sizes],
+                                           '크기(MB)': [size / 1024 ** 2 for size in sizes.values()]}).round(2),
+                             hide_index=True, use_container_width=True)
+                # 선택한 파일 하나만 읽어 다운로드 버튼에 올림 (큰 파일은 폴더에서 직접 전달)
+                path = st.selectbox("다운로드할 파일", job.files, format_func=os.path.basename, key='export_download')
+                if sizes[path] > DOWNLOAD_LIMIT_MB * 1024 ** 2:
+                    st.caption(f"{DOWNLOAD_LIMIT_MB}MB를 넘는 파일은 위 폴더에서 직접 전달하세요.")
+                else:
+                    with open(path, 'rb') as f:
+                        st.download_button("📥 다운로드", f, file_name=os.path.basename(path))
+
+        export_status()
+    elif summary is not None:
+        st.info("📦 대용량 모드에서는 원본 행을 보관하지 않으므로 명단을 내보낼 수 없습니다. "
+                "`python -m hr_analysis.cli` 로 파일 전체의 점수를 계산하세요.")
+    else:
+        st.info("📁 왼쪽 사이드바에서 CSV 파일을 업로드하여 대시보드를 시작하세요.")
+
 elif menu == "⚙️ 컬럼 매핑":
     st.title("⚙️ Column Mapping (컬럼 매핑)")
     if st.session_state.df is not None:
         df = st.session_state.df
         st.info("정형화된 대시보드(홈, 조기경보 등)가 올바르게 작동하도록 표준 필드와 실제 컬럼을 매핑해주세요.")
-        
+        profile = column_profile_for(df)
+        candidates = get_cached_aggregate('mapping_candidates', st.session_state.df_fingerprint, {}, lambda: rank_candidates(profile))
+        labels = get_cached_aggregate('column_labels', st.session_state.df_fingerprint, {}, lambda: column_labels(profile))
+
+        search_cols = st.columns([3, 1])
+        query = search_cols[0].text_input("🔍 컬럼 검색", key='map_query', placeholder="컬럼 이름 일부",
+                                          help=f"필드마다 이름이 비슷한 컬럼부터 최대 {MAX_OPTIONS}개를 보여줍니다.")
+        show_all = search_cols[1].toggle("모든 컬럼 보기", key='map_show_all',
+                                         help="끄면 필드 타입(범주, 예/아니오, 1~4 척도, 수치)에 맞는 컬럼만 후보로 보여줍니다.")
+        st.caption(f"컬럼 {len(profile):,}개 · 현재 매핑 {len(st.session_state.column_mapping)}/{len(default_mapping)}개 필드")
+
+        def field_selectbox(korean, english):
+            key = f"map_{english}"
+            current = st.session_state.column_mapping.get(korean)
+            pending = st.session_state.get(key, current)
+            options = [None] + filter_columns(profile.index if show_all else candidates[korean], query,
+                                              pinned=[col for col in (pending, current) if col in profile.index])
+            selected = pending if pending in options else current
+            index = options.index(selected) if selected in options else 0
+            return st.selectbox(f"`{korean}` 필드", options=options, index=index, key=key,
+                                format_func=lambda col: "(매핑 안 함)" if col is None else labels.get(col, col))
+
         cols = st.columns(2)
         mapping_items = list(default_mapping.items())
         mid_point = len(mapping_items) // 2
@@ -508,79 +1049,145 @@ elif menu == "⚙️ 컬럼 매핑":
         new_mapping = {}
         with cols[0]:
             for korean, english in mapping_items[:mid_point]:
-                current_selection = st.session_state.column_mapping.get(korean)
-                try: index = list(df.columns).index(current_selection) if current_selection in df.columns else 0
-                except ValueError: index = 0
-                selected_col = st.selectbox(f"`{korean}` 필드", options=df.columns, index=index, key=f"map_{english}")
-                new_mapping[korean] = selected_col
+                new_mapping[korean] = field_selectbox(korean, english)
         with cols[1]:
             for korean, english in mapping_items[mid_point:]:
-                current_selection = st.session_state.column_mapping.get(korean)
-                try: index = list(df.columns).index(current_selection) if current_selection in df.columns else 0
-                except ValueError: index = 0
-                selected_col = st.selectbox(f"`{korean}` 필드", options=df.columns, index=index, key=f"map_{english}")
-                new_mapping[korean] = selected_col
+                new_mapping[korean] = field_selectbox(korean, english)
+        new_mapping = {korean: col for korean, col in new_mapping.items() if col is not None}
+
+        with st.expander("🔎 컬럼 프로필"):
+            shown = filter_columns(profile.index, query)
+            st.caption(f"검색어와 일치하는 컬럼 최대 {MAX_OPTIONS}개 · 고유값 수와 예시 값은 최대 {SAMPLE_ROWS:,}행 표본 기준")
+            st.dataframe(profile.loc[shown], use_container_width=True)
         
         if st.button("매핑 저장", use_container_width=True, type="primary"):
             st.session_state.column_mapping = new_mapping
             st.success("컬럼 매핑이 성공적으로 저장되었습니다!")
             st.rerun()
+        if st.button("🪄 자동 매핑 다시 실행", use_container_width=True,
+                     help="이름이 같은 컬럼을 먼저 찾고, 나머지 필드는 이름 유사도와 값 모양(고유값 수, 범위)으로 찾습니다."):
+            st.session_state.column_mapping = auto_map(df.columns, profile)
+            for english in default_mapping.values():
+                st.session_state.pop(f"map_{english}", None)
+            st.rerun()
+    elif summary is not None:
+        st.info("📦 대용량 모드에서는 원본 행을 메모리에 올리지 않으므로 컬럼 매핑을 바꿀 수 없습니다. 매핑은 업로드 시 자동으로 적용됩니다.")
     else:
         st.info("📁 먼저 CSV 파일을 업로드해주세요.")
 
 elif menu == "📊 커스텀 차트":
     st.title("📊 Custom Chart Builder (커스텀 차트)")
     if st.session_state.df is not None:
-        df = st.session_state.df.copy()
+        px, go, make_subplots = load_plotly()
+        df = st.session_state.df
         st.info("데이터에 포함된 모든 컬럼과 직접 만든 '계산 필드'를 사용하여 자유롭게 차트를 만들어보세요.")
 
-        for field_name, formula in st.session_state.custom_fields.items():
-            try: df[field_name] = df.eval(formula)
-            except Exception: pass
-        
+        # 계산 필드는 파생 프레임 캐시에서 가져오고, 차트에는 선택한 컬럼만 조합해서 전달
+        custom_cols = [name for name in st.session_state.custom_fields if name in derived.columns]
+        custom_values = {name: derived[name] for name in custom_cols}
+        base_cols = [col for col in df.columns if col not in custom_values]
+
+        def chart_frame(*cols):
+            cols = list(dict.fromkeys(col for col in cols if col is not None))
+            return pd.DataFrame({col: custom_values[col] if col in custom_values else df[col] for col in cols})
+
         st.markdown("### 1. (선택) 계산된 필드 생성")
         with st.expander("새로운 필드를 계산하여 추가하기"):
             new_field_name = st.text_input("새 필드 이름 (예: ROI)")
-            formula = st.text_input("계산 공식 (예: 월급여 / 총경력)", help=f"사용 가능 컬럼: {', '.join(df.columns)}")
+            usable = base_cols + custom_cols
+            usable_text = ', '.join(usable[:50]) + (f" 외 {len(usable) - 50:,}개" if len(usable) > 50 else '')
+            formula = st.text_input("계산 공식 (예: 월급여 / 총경력)", help=f"사용 가능 컬럼: {usable_text} / 함수: {', '.join(FUNCTIONS)} / 공백 등이 포함된 이름은 `역따옴표`로 감싸기")
 
             if st.button("계산 필드 추가/수정"):
                 if new_field_name and formula:
-                    try:
-                        df.eval(formula)
+                    # 검증 겸 미리 계산 (결과는 필드 캐시에 남아 다음 실행에서 재사용)
+                    candidate = {**st.session_state.custom_fields, new_field_name: formula}
+                    _, field_errors = compute_custom_fields(df, candidate, st.session_state.df_fingerprint)
+                    if new_field_name in field_errors:
+                        st.error(f"공식 오류: {field_errors[new_field_name]}")
+                    else:
                         st.session_state.custom_fields[new_field_name] = formula
                         st.success(f"'{new_field_name}' 필드가 추가/수정되었습니다.")
                         st.rerun()
-                    except Exception as e: st.error(f"공식 오류: {e}")
                 else: st.warning("필드 이름과 공식을 모두 입력해주세요.")
         
         if st.session_state.custom_fields:
             st.write("현재 커스텀 필드:")
             st.json(st.session_state.custom_fields)
+            for field_name, message in derived.attrs.get('custom_field_errors', {}).items():
+                st.warning(f"'{field_name}' 필드를 계산하지 못했습니다: {message}")
 
         st.markdown("---")
         st.markdown("### 2. 차트 구성")
         chart_type = st.selectbox("차트 종류 선택", ["Bar Chart", "Scatter Plot", "Pie Chart", "Line Chart"])
         
-        available_columns = list(df.columns)
-        
+        # 컬럼 프로필로 축마다 알맞은 타입의 컬럼만 후보로 (계산 필드는 작은 프로필을 따로 계산)
+        profile = column_profile_for(df)
+        if custom_cols:
+            profile = pd.concat([profile.drop(index=custom_cols, errors='ignore'), column_profile(pd.DataFrame(custom_values))])
+        labels = column_labels(profile)
+        search_cols = st.columns([3, 1])
+        chart_query = search_cols[0].text_input("🔍 컬럼 검색", key='chart_query', placeholder="컬럼 이름 일부",
+                                                help=f"축마다 최대 {MAX_OPTIONS}개 컬럼을 보여줍니다.")
+        chart_show_all = search_cols[1].toggle("모든 컬럼 보기", key='chart_show_all',
+                                               help="끄면 값 축은 수치 컬럼, 레이블·색상은 고유값이 적은 컬럼만 보여줍니다.")
+
+        def column_select(label, role, key, optional=False):
+            pending = st.session_state.get(key)
+            options = filter_columns(chart_columns(profile, None if chart_show_all else role), chart_query,
+                                     pinned=[pending] if pending in profile.index else [])
+            if optional:
+                options = [None] + options
+            return st.selectbox(label, options, index=options.index(pending) if pending in options else 0, key=key,
+                                format_func=lambda col: "없음" if col is None else labels.get(col, col))
+
+        def show_chart(fig, n_points, started):
+            plot(fig)
+            elapsed = time.perf_counter() - started
+            st.caption(f"전송 데이터 {figure_payload_bytes(fig) / 1024:,.1f}KB · {n_points:,}개 포인트 · 생성 {elapsed * 1000:,.0f}ms")
+
         if chart_type == "Pie Chart":
-            col_names = st.selectbox("레이블 (Names) 선택", available_columns)
-            col_values = st.selectbox("값 (Values) 선택", available_columns)
+            col_names = column_select("레이블 (Names) 선택", 'dimension', 'chart_names')
+            col_values = column_select("값 (Values) 선택", 'value', 'chart_values')
+            agg_label = st.selectbox("집계 방식", list(AGG_FUNCTIONS), key='chart_agg')
             if st.button("파이 차트 생성", type="primary"):
-                fig = px.pie(df, names=col_names, values=col_values, title=f"{col_values} by {col_names}")
-                st.plotly_chart(fig, use_container_width=True)
+                try:
+                    started = time.perf_counter()
+                    plot_df = aggregate_for_chart(chart_frame(col_names, col_values), [col_names], col_values, AGG_FUNCTIONS[agg_label])
+                    fig = px.pie(plot_df, names=col_names, values=col_values, title=f"{col_values} by {col_names}")
+                    show_chart(fig, len(plot_df), started)
+                except Exception as e: st.error(f"차트 생성 중 오류: {e}")
         else:
-            x_axis = st.selectbox("X축 선택", available_columns)
-            y_axis = st.selectbox("Y축 선택", available_columns)
-            color_axis = st.selectbox("색상 (Color) 기준 선택", [None] + available_columns)
+            scatter = chart_type == "Scatter Plot"
+            x_axis = column_select("X축 선택", 'numeric' if scatter else 'axis', 'chart_x')
+            y_axis = column_select("Y축 선택", 'numeric' if scatter else 'value', 'chart_y')
+            color_axis = column_select("색상 (Color) 기준 선택", 'dimension', 'chart_color', optional=True)
+            if chart_type == "Scatter Plot":
+                point_budget = st.number_input("최대 표시 점 개수", min_value=100, value=DEFAULT_POINT_BUDGET, step=1000, key='chart_point_budget')
+                scatter_mode = st.radio("점 개수 초과 시", ["층화 샘플링", "밀도 히트맵"], horizontal=True, key='chart_scatter_mode')
+            else:
+                agg_label = st.selectbox("집계 방식", list(AGG_FUNCTIONS), index=0 if chart_type == "Bar Chart" else 1, key='chart_agg')
             
             if st.button(f"{chart_type} 생성", type="primary"):
                 try:
-                    if chart_type == "Bar Chart": fig = px.bar(df, x=x_axis, y=y_axis, color=color_axis, title=f"{y_axis} by {x_axis}")
-                    elif chart_type == "Scatter Plot": fig = px.scatter(df, x=x_axis, y=y_axis, color=color_axis, title=f"{y_axis} vs {x_axis}")
-                    elif chart_type == "Line Chart": fig = px.line(df.sort_values(by=x_axis), x=x_axis, y=y_axis, color=color_axis, title=f"{y_axis} over {x_axis}")
-                    st.plotly_chart(fig, use_container_width=True)
+                    started = time.perf_counter()
+                    plot_df = chart_frame(x_axis, y_axis, color_axis)
+                    if chart_type == "Scatter Plot":
+                        if len(plot_df) > point_budget and scatter_mode == "밀도 히트맵":
+                            fig = density_heatmap(plot_df, x_axis, y_axis, title=f"{y_axis} vs {x_axis} (밀도)")
+                        else:
+                            if len(plot_df) > point_budget:
+                                st.caption(f"전체 {len(plot_df):,}행 중 {point_budget:,}행을 {'색상 그룹별 ' if color_axis else ''}샘플링해 표시합니다.")
+                            plot_df = stratified_sample(plot_df, point_budget, by=color_axis)
+                            fig = px.scatter(plot_df, x=x_axis, y=y_axis, color=color_axis, title=f"{y_axis} vs {x_axis}")
+                    else:
+                        plot_df = aggregate_for_chart(plot_df, [x_axis, color_axis], y_axis, AGG_FUNCTIONS[agg_label])
+                        if chart_type == "Bar Chart": fig = px.bar(plot_df, x=x_axis, y=y_axis, color=color_axis, title=f"{y_axis} by {x_axis}")
+                        elif chart_type == "Line Chart": fig = px.line(plot_df, x=x_axis, y=y_axis, color=color_axis, title=f"{y_axis} over {x_axis}")
+                    show_chart(fig, len(plot_df), started)
                 except Exception as e: st.error(f"차트 생성 중 오류: {e}")
+    elif summary is not None:
+        st.info("📦 대용량 모드에서는 원본 행을 메모리에 올리지 않으므로 커스텀 차트를 사용할 수 없습니다.")
     else:
         st.info("📁 먼저 CSV 파일을 업로드해주세요.")
 
@@ -591,4 +1198,42 @@ st.sidebar.markdown("""
     HR Analytics Dashboard v1.0<br>
     © 2024 Your Company
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+# --- 진단 패널 (진단 모드) ---
+if profiler.enabled:
+    profiler.finish()
+    history = st.session_state.diagnostics_history
+    history.append(profiler.summary())
+    del history[:-HISTORY_SIZE]
+
+    st.markdown("---")
+    with st.expander(f"🩺 진단: {profiler.label} 재실행 {profiler.total_ms:,.0f}ms", expanded=True):
+        timings = profiler.to_frame()
+        if timings.empty:
+            st.caption("계측된 단계가 없습니다.")
+        else:
+            _, go, _ = load_plotly()
+            labels = [f"{i + 1}. {'  ' * depth}{stage}" for i, (stage, depth) in enumerate(zip(timings['stage'], timings['depth']))]
+            fig_waterfall = go.Figure(go.Bar(
+                y=['전체'] + labels, x=[profiler.total_ms] + timings['duration_ms'].tolist(),
+                base=[0] + timings['start_ms'].tolist(), orientation='h',
+                text=[f"{profiler.total_ms:,.0f}ms"] + [f"{ms:,.1f}ms" for ms in timings['duration_ms']],
+                marker_color=['#888888'] + ['#4c78a8'] * len(labels),
+            ))
+            fig_waterfall.update_layout(title="단계별 소요 시간 (재실행 시작 기준, ms)", xaxis_title="ms",
+                                        height=120 + 28 * len(labels))
+            fig_waterfall.update_yaxes(autorange='reversed')
+            st.plotly_chart(fig_waterfall, use_container_width=True)
+            st.dataframe(timings.round(2), hide_index=True, use_container_width=True)
+            st.caption("peak_mb: 단계 시작 대비 Python/NumPy 할당 최고 증가량, copies: DataFrame/Series.copy() 호출 수 (안쪽 단계 포함)")
+
+        shared = dataset_registry.stats()
+        st.caption(f"공유 데이터셋 {len(shared)}개 · {sum(entry['bytes'] for entry in shared) / 1024 ** 2:,.1f}MB · "
+                   f"세션 참조 {sum(entry['sessions'] for entry in shared)}개")
+        st.caption(f"최근 {len(history)}회 재실행 기록")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("📥 JSON 내보내기", history_to_json(history), file_name="hr_diagnostics.json", mime="application/json")
+        with col2:
+            st.download_button("📥 CSV 내보내기", history_to_csv(history), file_name="hr_diagnostics.csv", mime="text/csv")
@@ -0,0 +1 @@
+"""HR Analytics 대시보드의 데이터 처리/계산 계층 (Streamlit 비의존)"""
@@ -0,0 +1,164 @@
+"""합칠 수 있는(mergeable) 부분 집계
+
+청크별로 구한 합계/건수를 merge_partials로 누적한 뒤 finalize_* 함수로 화면용 표를 만든다.
+평균과 비율은 항상 최종 합계에서 계산하므로 한 번에 집계한 결과와 같다.
+"""
+import numpy as np
+import pandas as pd
+
+from hr_analysis.derived import AGE_LABELS
+from hr_analysis.scoring import mapped_column
+
+ALL_DEPARTMENTS = '전체'
+HOME_CUBE_DIMENSIONS = ('부서', '연령대', '업무만족도', '결혼여부')
+DEPT_HEALTH_COLUMNS = ['부서', '인원', '퇴직률', '평균만족도', '야근비율', '평균근속', '건강도점수']
+
+
+def satisfaction_columns(df, mapping):
+    """부서 건강도 평균만족도에 쓰는 컬럼 (업무만족도, 업무환경만족도 중 존재하는 것)"""
+    return [col for col in [mapping.get('업무만족도'), mapping.get('업무환경만족도')] if col in df.columns]
+
+
+def department_keys(df, mapping):
+    """부서 그룹 키 Series (부서 미매핑 시 모두 '전체')"""
+    dept_col = mapped_column(df, mapping, '부서')
+    keys = df[dept_col].astype(object) if dept_col else pd.Series(ALL_DEPARTMENTS, index=df.index)
+    return keys.rename('부서')
+
+
+def merge_partials(left, right):
+    """같은 그룹끼리 합산 (first_row는 최솟값 유지)"""
+    if left is None:
+        return right
+    combined = pd.concat([left, right])
+    agg = {col: ('min' if col == 'first_row' else 'sum') for col in combined.columns}
+    return combined.groupby(level=list(range(combined.index.nlevels)), observed=True, sort=False,
+                            dropna=False).agg(agg)
+
+
+def department_partials(df, derived, mapping, keys, row_offset=0):
+    """그룹별 인원, 퇴직자, 야근자, 만족도/근속 합계와 건수
+
+    keys는 그룹 키 Series 또는 그 목록(부서 × 전공 등), row_offset은 청크의 전체 파일 내
+    시작 행 번호로 그룹의 최초 등장 순서(first_row)를 보존하는 데 쓴다.
+    """
+    cols = {
+        'n': np.ones(len(df), dtype=np.int64),
+        'first_row': np.arange(row_offset, row_offset + len(df)),
+    }
+    if 'is_leaver' in derived.columns:
+        cols['leavers'] = derived['is_leaver'].to_numpy(dtype=np.int64)
+    if 'is_overtime' in derived.columns:
+        cols['overtime'] = derived['is_overtime'].to_numpy(dtype=np.int64)
+    for i, col in enumerate(satisfaction_columns(df, mapping)):
+        cols[f'sat{i}_sum'] = df[col].to_numpy(dtype=np.float64)
+        cols[f'sat{i}_n'] = df[col].notna().to_numpy(dtype=np.int64)
+    tenure_col = mapped_column(df, mapping, '근속연수')
+    if tenure_col is not None:
+        cols['tenure_sum'] = df[tenure_col].to_numpy(dtype=np.float64)
+        cols['tenure_n'] = df[tenure_col].notna().to_numpy(dtype=np.int64)
+
+    frame = pd.DataFrame(cols, index=df.index)
+    agg = {col: ('min' if col == 'first_row' else 'sum') for col in frame.columns}
+    return frame.groupby(keys, observed=True, sort=False).agg(agg)
+
+
+def finalize_department_health(partials):
+    """부분 집계로 부서 건강도 표 생성 (그룹은 데이터에 처음 등장한 순서)
+
+    그룹 키가 여러 개면 '부서' 컬럼에 'Sales × Marketing'처럼 이어 붙인 이름을 쓴다.
+    """
+    partials = partials.sort_values('first_row')
+    n = partials['n']
+    index = partials.index
+    labels = index if index.nlevels == 1 else [' × '.join(map(str, key)) for key in index]
+    stats = pd.DataFrame({'부서': labels, '인원': n.to_numpy()})
+
+    stats['퇴직률'] = (partials['leavers'] / n * 100).to_numpy() if 'leavers' in partials else 0.0
+    sat_means = [partials[f'sat{i}_sum'] / partials[f'sat{i}_n'] for i in range(2) if f'sat{i}_sum' in partials]
+    stats['평균만족도'] = pd.concat(sat_means, axis=1).mean(axis=1).to_numpy() if sat_means else 0.0
+    stats['야근비율'] = (partials['overtime'] / n * 100).to_numpy() if 'overtime' in partials else 0.0
+    stats['평균근속'] = (partials['tenure_sum'] / partials['tenure_n']).to_numpy() if 'tenure_sum' in partials else 0.0
+
+    satisfaction, tenure = stats['평균만족도'], stats['평균근속']
+    stats['건강도점수'] = (
+        np.where(satisfaction > 0, (satisfaction / 4) * 25, 0)
+        + (100 - stats['퇴직률']) * 0.3
+        + (100 - stats['야근비율']) * 0.25
+        + np.where(tenure > 0, np.minimum(20, tenure * 2), 0)
+    )
+    return stats[DEPT_HEALTH_COLUMNS]
+
+
+def department_health(df, derived, mapping, keys):
+    """그룹별 부서 건강도 표를 한 번의 groupby로 계산"""
+    return finalize_department_health(department_partials(df, derived, mapping, keys))
+
+
+# --- 홈 화면 큐브 ---
+def home_cube(df, derived, mapping):
+    """부서 × 연령대 × 업무만족도 × 결혼여부별 인원, 퇴직자, 급여 합계/건수
+
+    매핑되지 않은 차원은 빠지고, 결측값도 하나의 칸으로 남겨 합계가 전체 인원과 일치한다.
+    """
+    keys = []
+    for dim in HOME_CUBE_DIMENSIONS:
+        if dim == '연령대':
+            values = derived['연령대'] if '연령대' in derived.columns else None
+        else:
+            col = mapped_column(df, mapping, dim)
+            values = df[col] if col is not None else None
+        if values is not None:
+            keys.append(values.rename(dim))
+    if not keys:
+        keys = [pd.Series(ALL_DEPARTMENTS, index=df.index, name=ALL_DEPARTMENTS)]
+
+    cols = {'n': np.ones(len(df), dtype=np.int64)}
+    if 'is_leaver' in derived.columns:
+        cols['leavers'] = derived['is_leaver'].to_numpy(dtype=np.int64)
+    salary_col = mapped_column(df, mapping, '월급여')
+    if salary_col is not None:
+        cols['salary_sum'] = df[salary_col].to_numpy(dtype=np.float64)
+        cols['salary_n'] = df[salary_col].notna().to_numpy(dtype=np.int64)
+    frame = pd.DataFrame(cols, index=df.index)
+    return frame.groupby(keys, observed=True, sort=False, dropna=False).sum()
+
+
+def cube_departments(cube):
+    """큐브의 부서 목록 (부서 차원이 없으면 None)"""
+    if '부서' not in cube.index.names:
+        return None
+    return sorted(cube.index.get_level_values('부서').dropna().unique())
+
+
+def cube_slice(cube, departments=None):
+    """선택한 부서들만 남긴 큐브 (None이나 빈 목록이면 전체)"""
+    if not departments or '부서' not in cube.index.names:
+        return cube
+    return cube[cube.index.get_level_values('부서').isin(departments)]
+
+
+def cube_headcount(cube):
+    """(인원, 퇴직자 수 | 퇴직여부 미매핑 시 None)"""
+    leavers = int(cube['leavers'].sum()) if 'leavers' in cube.columns else None
+    return int(cube['n'].sum()), leavers
+
+
+def cube_distribution(cube, dim):
+    """차원 값별 인원 (value_counts와 같은 내림차순)"""
+    counts = cube['n'].groupby(level=dim, observed=True, sort=False).sum()
+    if dim == '연령대':
+        counts = counts.reindex(AGE_LABELS, fill_value=0)
+    return counts.sort_values(ascending=False, kind='stable')
+
+
+def cube_age_salary(cube):
+    """연령대별 평균급여와 인원수 (연령대/월급여가 없으면 None)"""
+    if '연령대' not in cube.index.names or 'salary_sum' not in cube.columns:
+        return None
+    sums = cube[['salary_sum', 'salary_n']].groupby(level='연령대', observed=True).sum().reindex(AGE_LABELS)
+    return pd.DataFrame({
+        '연령대': AGE_LABELS,
+        '평균급여': (sums['salary_sum'] / sums['salary_n']).to_numpy(),
+        '인원수': sums['salary_n'].fillna(0).astype('int64').to_numpy(),
+    })
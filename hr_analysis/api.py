@@ -0,0 +1,65 @@
+"""Streamlit 없이 쓰는 점수/집계 API
+
+배치 작업이나 노트북에서 대시보드와 같은 계산을 그대로 쓰기 위한 진입점이다.
+mapping을 생략하면 컬럼 이름으로 자동 매핑한다.
+
+    from hr_analysis.api import read_dataset, score_employees, department_health_table
+    df = read_dataset('HR Data.csv')
+    scores = score_employees(df)
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from hr_analysis.aggregates import department_health, department_keys
+from hr_analysis.derived import build_derived_frame
+from hr_analysis.ingest import read_typed_csv
+from hr_analysis.mapping import auto_map
+from hr_analysis.scoring import DEFAULT_SPECS, EARLY_WARNING, LEVEL_LABELS, RETENTION_RISK, compute_score, mapped_column
+
+# 위험군 코드 → 이름 (-1은 마지막 빈 문자열)
+_LEVEL_NAMES = np.array(LEVEL_LABELS + ('',), dtype=object)
+
+
+def read_dataset(path, **read_kwargs):
+    """CSV(타입 지정 로드) 또는 Parquet 파일을 DataFrame으로 읽기"""
+    if os.path.splitext(str(path))[1].lower() in ('.parquet', '.pq'):
+        return pd.read_parquet(path, **read_kwargs)
+    return read_typed_csv(path, **read_kwargs)[0]
+
+
+def calculate_early_warning_score(df, mapping=None):
+    """조기 경보 점수 계산"""
+    return compute_score(df, mapping or auto_map(df.columns), EARLY_WARNING)
+
+
+def calculate_retention_risk_score(df, mapping=None):
+    """잔류 위험 점수 계산"""
+    return compute_score(df, mapping or auto_map(df.columns), RETENTION_RISK)
+
+
+def score_table(df, derived, mapping):
+    """직원ID, 부서와 점수별 `<점수>`, `<점수>_level`(위험군 이름) 컬럼 표"""
+    table = {}
+    for field in ('직원ID', '부서'):
+        col = mapped_column(df, mapping, field)
+        if col is not None:
+            table[col] = df[col].to_numpy()
+    for spec in DEFAULT_SPECS:
+        table[spec.name] = derived[spec.name].to_numpy()
+        table[f"{spec.name}_level"] = _LEVEL_NAMES[derived[f"{spec.name}_level"].to_numpy()]
+    return pd.DataFrame(table, index=df.index)
+
+
+def score_employees(df, mapping=None):
+    """직원별 조기 경보/잔류 위험 점수와 위험군"""
+    mapping = mapping or auto_map(df.columns)
+    return score_table(df, build_derived_frame(df, mapping, {}), mapping)
+
+
+def department_health_table(df, mapping=None, by=()):
+    """부서 건강도 표 (by에 표준 필드를 주면 부서 × 해당 필드별)"""
+    mapping = mapping or auto_map(df.columns)
+    keys = [department_keys(df, mapping)] + [df[mapping[field]] for field in by]
+    return department_health(df, build_derived_frame(df, mapping, {}), mapping, keys if by else keys[0])
@@ -0,0 +1,69 @@
+"""커스텀 차트용 서버 측 집계/축소
+
+Plotly 차트는 넘겨받은 데이터를 행 단위 JSON으로 브라우저에 보낸다. 막대/선/파이 차트는
+X축(과 색상) 그룹별로 미리 집계하고, 산점도는 점 개수 한도를 넘으면 층화 샘플링하거나
+2차원 구간별 인원(밀도 히트맵)으로 바꿔 전송량이 데이터 크기와 무관하게 유지되도록 한다.
+"""
+import numpy as np
+import pandas as pd
+
+AGG_FUNCTIONS = {
+    '합계': 'sum',
+    '평균': 'mean',
+    '중앙값': 'median',
+    '개수': 'count',
+    '최댓값': 'max',
+    '최솟값': 'min',
+}
+DEFAULT_POINT_BUDGET = 5_000
+DEFAULT_DENSITY_BINS = 50
+
+
+def aggregate_for_chart(frame, keys, value, agg='sum'):
+    """keys(X축, 색상 등) 그룹별 value 집계 (결과 컬럼 이름은 그대로 유지)
+
+    value가 그룹 기준과 같은 컬럼이면 차트에서 두 축이 같은 값을 가리키므로 고유 조합만 남긴다.
+    """
+    keys = [key for key in dict.fromkeys(keys) if key is not None]
+    if value in keys:
+        return frame[keys].drop_duplicates().sort_values(keys, ignore_index=True)
+    grouped = frame.groupby(keys, observed=True, sort=True)[value].agg(agg)
+    return grouped.reset_index()
+
+
+def stratified_sample(frame, budget, by=None, seed=0):
+    """최대 budget행 샘플 (by가 있으면 그룹 비율 유지, 작은 그룹도 최소 1행)"""
+    if len(frame) <= budget:
+        return frame
+    rng = np.random.default_rng(seed)
+    if by is None:
+        positions = rng.choice(len(frame), budget, replace=False)
+    else:
+        frac = budget / len(frame)
+        groups = frame.groupby(by, observed=True, sort=False, dropna=False).indices.values()
+        positions = np.concatenate([
+            rng.choice(idx, min(len(idx), max(1, round(len(idx) * frac))), replace=False) for idx in groups
+        ])
+    return frame.iloc[np.sort(positions)]
+
+
+def density_heatmap(frame, x, y, bins=DEFAULT_DENSITY_BINS, title=None):
+    """X/Y 수치 컬럼을 bins × bins 구간 인원으로 집계한 히트맵"""
+    import plotly.graph_objects as go
+
+    points = frame[[x, y]].apply(pd.to_numeric, errors='raise').dropna()
+    counts, x_edges, y_edges = np.histogram2d(points[x].to_numpy(), points[y].to_numpy(), bins=bins)
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=counts.T,
+        colorscale='Blues',
+        colorbar={'title': '인원'},
+    ))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y)
+    return fig
+
+
+def figure_payload_bytes(fig):
+    """브라우저로 전송되는 차트 JSON 크기"""
+    return len(fig.to_json().encode('utf-8'))
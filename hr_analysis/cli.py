@@ -0,0 +1,166 @@
+"""점수 일괄 계산 CLI
+
+    python -m hr_analysis.cli "HR Data.csv" -o out/ --workers 4
+
+CSV/Parquet 파일을 청크로 나눠 여러 프로세스에서 점수와 부서별 부분 집계를 계산하고,
+직원별 점수(scores.csv|parquet)와 부서 건강도(department_health.csv)를 출력 폴더에 쓴다.
+동시에 처리 중인 청크 수를 작업자 수의 2배로 제한하므로 파일 크기와 무관하게 메모리가 일정하다.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from hr_analysis.aggregates import department_keys, department_partials, finalize_department_health, merge_partials
+from hr_analysis.api import score_table
+from hr_analysis.derived import build_derived_frame
+from hr_analysis.ingest import infer_schema
+from hr_analysis.mapping import auto_map
+from hr_analysis.scoring import DEFAULT_SPECS, LEVEL_LABELS
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+def _is_parquet(path):
+    return os.path.splitext(path)[1].lower() in ('.parquet', '.pq')
+
+
+def read_columns(path):
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).schema_arrow.names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def iter_chunks(path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """chunk_rows행씩 DataFrame 생성 (CSV 범주형 필드는 category로 읽음)"""
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+        return
+    dtypes = {col: 'category' for col, kind in infer_schema(read_columns(path)).items() if kind in ('category', 'yes_no')}
+    yield from pd.read_csv(path, dtype=dtypes, chunksize=chunk_rows)
+
+
+def score_chunk(chunk, mapping, row_offset):
+    """작업자 프로세스: 청크의 (직원별 점수 표, 부서별 부분 집계)"""
+    derived = build_derived_frame(chunk, mapping, {})
+    partials = department_partials(chunk, derived, mapping, department_keys(chunk, mapping), row_offset=row_offset)
+    return score_table(chunk, derived, mapping), partials
+
+
+class _ScoreWriter:
+    """청크 순서대로 점수 표를 이어 쓰기 (CSV 또는 Parquet)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.level_counts = {spec.name: dict.fromkeys(LEVEL_LABELS, 0) for spec in DEFAULT_SPECS}
+        self._parquet = None
+
+    def write(self, table):
+        for spec in DEFAULT_SPECS:
+            for label, n in table[f"{spec.name}_level"].value_counts().items():
+                if label in self.level_counts[spec.name]:
+                    self.level_counts[spec.name][label] += int(n)
+        if _is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self._parquet is None:
+                arrow = pa.Table.from_pandas(table, preserve_index=False)
+                self._parquet = pq.ParquetWriter(self.path, arrow.schema)
+            else:
+                arrow = pa.Table.from_pandas(table, schema=self._parquet.schema, preserve_index=False)
+            self._parquet.write_table(arrow)
+        else:
+            first = self.rows == 0
+            table.to_csv(self.path, mode='w' if first else 'a', header=first, index=False,
+                         encoding='utf-8-sig' if first else 'utf-8')
+        self.rows += len(table)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def score_file(path, output_dir, mapping=None, workers=None, chunk_rows=DEFAULT_CHUNK_ROWS, fmt='csv', on_progress=None):
+    """파일 전체 점수 계산 후 결과 파일 경로와 요약 반환"""
+    mapping = mapping or auto_map(read_columns(path))
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    writer = _ScoreWriter(os.path.join(output_dir, f"scores.{fmt}"))
+    partials = None
+
+    def collect(result):
+        nonlocal partials
+        table, chunk_partials = result
+        writer.write(table)
+        partials = merge_partials(partials, chunk_partials)
+        if on_progress is not None:
+            on_progress(writer.rows)
+
+    offset = 0
+    try:
+        if workers == 1:
+            for chunk in iter_chunks(path, chunk_rows):
+                collect(score_chunk(chunk, mapping, offset))
+                offset += len(chunk)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in iter_chunks(path, chunk_rows):
+                    pending.append(pool.submit(score_chunk, chunk, mapping, offset))
+                    offset += len(chunk)
+                    if len(pending) >= workers * 2:
+                        collect(pending.popleft().result())
+                while pending:
+                    collect(pending.popleft().result())
+    finally:
+        writer.close()
+
+    health_path = os.path.join(output_dir, 'department_health.csv')
+    if partials is not None:
+        finalize_department_health(partials).to_csv(health_path, index=False, encoding='utf-8-sig')
+    return {
+        'rows': writer.rows, 'scores': writer.path, 'department_health': health_path,
+        'level_counts': writer.level_counts, 'mapping': mapping,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m hr_analysis.cli', description='HR 데이터 파일의 조기 경보/잔류 위험 점수 일괄 계산')
+    parser.add_argument('input', help='입력 CSV 또는 Parquet 파일')
+    parser.add_argument('-o', '--output-dir', default='hr_scores', help='결과 폴더 (기본: hr_scores)')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='작업자 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help=f'청크당 행 수 (기본: {DEFAULT_CHUNK_ROWS:,})')
+    parser.add_argument('--format', choices=('csv', 'parquet'), default='csv', help='점수 파일 형식')
+    parser.add_argument('--mapping', help='표준 필드 → 컬럼명 JSON 파일 (생략 시 자동 매핑)')
+    args = parser.parse_args(argv)
+
+    mapping = None
+    if args.mapping:
+        with open(args.mapping, encoding='utf-8') as f:
+            mapping = json.load(f)
+
+    started = time.perf_counter()
+    result = score_file(args.input, args.output_dir, mapping=mapping, workers=args.workers,
+                        chunk_rows=args.chunk_rows, fmt=args.format)
+    elapsed = time.perf_counter() - started
+
+    print(f"{result['rows']:,}행 처리 ({elapsed:.1f}초, {result['rows'] / elapsed if elapsed else 0:,.0f}행/초)")
+    for spec in DEFAULT_SPECS:
+        counts = ', '.join(f"{label} {n:,}명" for label, n in result['level_counts'][spec.name].items())
+        print(f"  {spec.name}: {counts}")
+    print(f"점수: {result['scores']}")
+    print(f"부서 건강도: {result['department_health']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
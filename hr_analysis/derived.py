@@ -0,0 +1,189 @@
+"""데이터셋 지문 기반 파생 프레임 캐시
+
+Streamlit은 위젯을 조작할 때마다 스크립트 전체를 다시 실행한다. 점수, 연령대,
+퇴직/야근 플래그, 커스텀 필드처럼 원본에서 계산되는 값은 (데이터셋 지문, 컬럼 매핑,
+커스텀 필드) 조합이 같으면 결과도 같으므로 프로세스 단위 LRU 캐시에 보관한다.
+커스텀 필드는 필드별로 따로 캐시되어 필드를 추가·수정해도 나머지는 다시 계산하지 않는다.
+"""
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from hr_analysis.expressions import CustomFieldError, compile_field, evaluate_field, field_signature, resolve_order
+from hr_analysis.scoring import mapped_column, score_frame, yes_mask
+
+AGE_BINS = [17, 29, 39, 49, 100]
+AGE_LABELS = ['20대', '30대', '40대', '50대+']
+
+
+def dataset_fingerprint(df):
+    """컬럼 구성과 전체 값으로 만든 데이터셋 지문 (업로드 시 한 번만 계산)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(col, str(dtype)) for col, dtype in df.dtypes.items()]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def derived_key(fingerprint, mapping, custom_fields):
+    """캐시 키: 매핑은 순서 무관, 커스텀 필드는 정의 순서 유지"""
+    return fingerprint, tuple(sorted(mapping.items())), tuple(custom_fields.items())
+
+
+def age_bands(ages):
+    """나이를 연령대 범주로 변환"""
+    return pd.cut(ages, bins=AGE_BINS, labels=AGE_LABELS)
+
+
+def build_derived_frame(df, mapping, custom_fields, fingerprint=None, cache=None):
+    """원본을 수정하지 않고 파생 컬럼만 담은 프레임 생성
+
+    계산할 수 없는 커스텀 필드는 빠지고, 그 이유는 attrs['custom_field_errors']에 남는다.
+    """
+    derived = score_frame(df, mapping)
+
+    age_col = mapped_column(df, mapping, '나이')
+    if age_col is not None:
+        derived['연령대'] = age_bands(df[age_col])
+    leaver_col = mapped_column(df, mapping, '퇴직여부')
+    if leaver_col is not None:
+        derived['is_leaver'] = yes_mask(df[leaver_col])
+    overtime_col = mapped_column(df, mapping, '야근정도')
+    if overtime_col is not None:
+        derived['is_overtime'] = yes_mask(df[overtime_col])
+
+    computed, errors = compute_custom_fields(df, custom_fields, fingerprint, cache)
+    for field_name, values in computed.items():
+        derived[field_name] = values
+    derived.attrs['custom_field_errors'] = errors
+    return derived
+
+
+def compute_custom_fields(df, custom_fields, fingerprint=None, cache=None):
+    """커스텀 필드 값 {이름: Series}(정의 순서)와 {이름: 오류 메시지}
+
+    필드는 의존 관계 순서로 계산하며, fingerprint가 있으면 필드별 결과를
+    (지문, 공식과 의존 필드 공식) 키로 캐시한다.
+    """
+    cache = _field_cache if cache is None else cache
+    compiled, errors = {}, {}
+    for name, formula in custom_fields.items():
+        try: compiled[name] = compile_field(name, formula)
+        except CustomFieldError as e: errors[name] = str(e)
+    order, order_errors = resolve_order(compiled, df.columns)
+    errors.update(order_errors)
+
+    values, signatures = {}, {}
+    for name in order:
+        missing = [dep for dep in compiled[name].names if dep in compiled and dep not in df.columns and dep not in values]
+        if missing:
+            errors[name] = f"'{missing[0]}' 필드 오류로 계산할 수 없음"
+            continue
+        key = None
+        if fingerprint is not None:
+            key = ('custom_field', fingerprint, field_signature(name, compiled, df.columns, signatures))
+            result = cache.get(key)
+            if result is not None:
+                values[name] = result
+                continue
+        try: result = evaluate_field(compiled[name], df, values)
+        except Exception as e:
+            errors[name] = f"'{name}' 계산 오류: {e}"
+            continue
+        if key is not None:
+            cache.put(key, result)
+        values[name] = result
+    return {name: values[name] for name in custom_fields if name in values}, errors
+
+
+class DerivedFrameCache:
+    """항목 수와 총 메모리 한도를 갖는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, max_entries=8, max_bytes=512 * 1024 ** 2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def total_bytes(self):
+        return sum(self._sizes.values())
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key, frame):
+        """frame: DataFrame, Series, ndarray 또는 그 밖의 객체 (크기는 sys.getsizeof로 추정)"""
+        if isinstance(frame, (pd.DataFrame, pd.Series)):
+            size = frame.memory_usage(deep=True)
+            size = int(size.sum()) if isinstance(size, pd.Series) else int(size)
+        else:
+            size = getattr(frame, 'nbytes', None) or sys.getsizeof(frame)
+        with self._lock:
+            self._entries[key] = frame
+            self._sizes[key] = size
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        # 가장 최근 항목은 한도를 넘더라도 유지
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            key, _ = self._entries.popitem(last=False)
+            del self._sizes[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_default_cache = DerivedFrameCache()
+_field_cache = DerivedFrameCache(max_entries=256)
+
+
+def get_derived_frame(df, fingerprint, mapping, custom_fields, cache=None):
+    """캐시된 파생 프레임을 반환하고, 없으면 계산해서 저장
+
+    커스텀 필드 구성만 바뀐 경우 점수 등 기본 파생 컬럼은 캐시된 것을 재사용한다.
+    """
+    cache = _default_cache if cache is None else cache
+    key = derived_key(fingerprint, mapping, custom_fields)
+    derived = cache.get(key)
+    if derived is None:
+        base_key = derived_key(fingerprint, mapping, {})
+        base = cache.get(base_key) if custom_fields else None
+        if base is None:
+            base = build_derived_frame(df, mapping, {})
+            cache.put(base_key, base)
+        if not custom_fields:
+            return base
+        computed, errors = compute_custom_fields(df, custom_fields, fingerprint)
+        derived = base.assign(**computed)
+        derived.attrs['custom_field_errors'] = errors
+        cache.put(key, derived)
+    return derived
+
+
+def get_cached_aggregate(name, fingerprint, mapping, compute, cache=None):
+    """데이터셋·매핑 조합마다 한 번만 계산하는 집계 (홈 화면 큐브 등)"""
+    cache = _default_cache if cache is None else cache
+    key = (name,) + derived_key(fingerprint, mapping, {})
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.put(key, value)
+    return value
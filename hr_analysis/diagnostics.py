@@ -0,0 +1,166 @@
+"""재실행(rerun) 단위 성능 계측
+
+진단 모드에서 스크립트의 이름 붙은 단계마다 시작 시각, 소요 시간, 단계 시작 대비 메모리
+최고 증가량(tracemalloc, NumPy 배열 포함), DataFrame/Series.copy() 호출 수를 기록한다.
+꺼져 있을 때 stage()는 아무것도 하지 않으므로 계측 코드를 그대로 둬도 비용이 없다.
+
+tracemalloc과 copy() 계수용 패치는 프로세스 전체에 걸리므로, 진단 모드로 실행 중인 프로파일러 수를
+세어 첫 프로파일러가 켤 때 시작하고 마지막 프로파일러가 끝날 때(finish() 또는 finish 없이 버려졌을 때)
+tracemalloc을 멈추고 원래 copy()를 되돌린다. 진단 모드가 꺼진 세션은 그 뒤로 계측 비용을 내지 않는다.
+메모리 최고치와 copy 호출 수는 프로세스 전체 기준이어서, 여러 세션이 동시에 진단 모드로 실행 중이면
+서로의 할당과 복사가 섞일 수 있다.
+"""
+import json
+import threading
+import weakref
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+HISTORY_SIZE = 50
+
+_active = threading.local()
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_started_tracing = False
+_original_copies = {}
+
+
+def _install_copy_counter():
+    """DataFrame/Series.copy를 감싸 현재 스레드의 활성 프로파일러에 호출 수를 더함"""
+    for cls in (pd.DataFrame, pd.Series):
+        original = _original_copies[cls] = cls.copy
+
+        def copy(self, *args, _original=original, **kwargs):
+            profiler = getattr(_active, 'profiler', None)
+            if profiler is not None:
+                profiler._count_copy()
+            return _original(self, *args, **kwargs)
+
+        copy.__doc__ = original.__doc__
+        cls.copy = copy
+
+
+def _remove_copy_counter():
+    for cls, original in _original_copies.items():
+        cls.copy = original
+    _original_copies.clear()
+
+
+def _acquire_tracing():
+    """진단 모드 프로파일러 하나 추가 (첫 프로파일러면 tracemalloc과 copy 계수 시작)"""
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        _tracing_users += 1
+        if _tracing_users == 1:
+            _install_copy_counter()
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _started_tracing = True
+
+
+def _release_tracing():
+    """진단 모드 프로파일러 하나 종료 (마지막이면 직접 시작한 tracemalloc을 멈추고 copy 복원)"""
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0:
+            _remove_copy_counter()
+            if _started_tracing:
+                tracemalloc.stop()
+                _started_tracing = False
+
+
+class RerunProfiler:
+    """한 번의 재실행 동안의 단계별 계측 기록"""
+
+    def __init__(self, enabled=False, label=''):
+        self.enabled = enabled
+        self.label = label
+        self.records = []
+        self.total_ms = 0.0
+        self._stack = []
+        self._started = time.perf_counter()
+        self._finished = False
+        # 이전 재실행이 st.rerun() 등으로 finish() 없이 끝났으면 그 프로파일러를 닫고 교체
+        previous = getattr(_active, 'profiler', None)
+        if previous is not None:
+            previous.finish()
+        _active.profiler = self if enabled else None
+        if enabled:
+            _acquire_tracing()
+            # finish() 없이 버려져도 가비지 컬렉션 때 한 번만 해제
+            self._release = weakref.finalize(self, _release_tracing)
+            tracemalloc.reset_peak()
+
+    def _count_copy(self):
+        for frame in self._stack:
+            frame['copies'] += 1
+
+    @contextmanager
+    def stage(self, name):
+        """with profiler.stage('이름'): 블록 계측 (중첩 가능, 바깥 단계에 안쪽 비용 포함)"""
+        if not self.enabled or self._finished:
+            yield
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        for frame in self._stack:
+            frame['peak'] = max(frame['peak'], peak)
+        tracemalloc.reset_peak()
+        frame = {'copies': 0, 'peak': current, 'base': current}
+        self._stack.append(frame)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            _, peak = tracemalloc.get_traced_memory()
+            self._stack.pop()
+            frame['peak'] = max(frame['peak'], peak)
+            for outer in self._stack:
+                outer['peak'] = max(outer['peak'], frame['peak'])
+            self.records.append({
+                'stage': name,
+                'depth': len(self._stack),
+                'start_ms': (started - self._started) * 1000,
+                'duration_ms': (ended - started) * 1000,
+                'peak_mb': (frame['peak'] - frame['base']) / 1024 ** 2,
+                'copies': frame['copies'],
+            })
+
+    def finish(self):
+        """계측 종료 후 전체 소요 시간 기록 (이후 stage()는 무시)"""
+        if self.enabled and not self._finished:
+            self.total_ms = (time.perf_counter() - self._started) * 1000
+            self._finished = True
+            if getattr(_active, 'profiler', None) is self:
+                _active.profiler = None
+            self._release()
+        return self
+
+    def to_frame(self):
+        """시작 순서로 정렬한 단계 표"""
+        columns = ['stage', 'depth', 'start_ms', 'duration_ms', 'peak_mb', 'copies']
+        return pd.DataFrame(self.records, columns=columns).sort_values('start_ms', kind='stable', ignore_index=True)
+
+    def summary(self):
+        """기록 보관/내보내기용 dict"""
+        return {
+            'label': self.label,
+            'timestamp': time.time(),
+            'total_ms': self.total_ms,
+            'stages': self.to_frame().to_dict('records'),
+        }
+
+
+def history_to_json(history):
+    return json.dumps(history, ensure_ascii=False, indent=1)
+
+
+def history_to_csv(history):
+    """재실행 기록을 (rerun, label, stage, ...) 한 줄씩 펼친 CSV"""
+    rows = [{'rerun': i, 'label': entry['label'], 'timestamp': entry['timestamp'], 'total_ms': entry['total_ms'], **stage}
+            for i, entry in enumerate(history) for stage in entry['stages']]
+    return pd.DataFrame(rows).to_csv(index=False)
@@ -0,0 +1,290 @@
+"""점수가 붙은 전체 직원 명단과 부서 건강도 표 내보내기 (CSV, Parquet, 다중 시트 Excel)
+
+부서별로 행 위치를 한 번 모은 뒤 chunk_rows행씩 원본 행에 점수/위험군 컬럼을 붙여
+모든 형식의 파일에 이어 쓰므로, 출력 전체를 메모리에 만들지 않는다.
+
+    <root>/<작업 ID>/roster_<부서>.csv|parquet   부서별 명단
+    <root>/<작업 ID>/department_health.csv|parquet
+    <root>/<작업 ID>/hr_report.xlsx              '부서 건강도' 시트 + 부서별 명단 시트
+
+Excel은 openpyxl write-only 모드로 시트 하나씩 행을 흘려 쓰고, 시트 행 한도를 넘는 부서는
+'부서 (2)' 시트로 이어 쓴다. openpyxl은 Excel을 쓸 때만 불러온다.
+start_export()는 전용 작업자 스레드에서 export_report()를 실행하고 진행 상황 객체를 돌려준다.
+"""
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from hr_analysis.aggregates import department_keys
+from hr_analysis.page_data import department_summary
+from hr_analysis.scoring import DEFAULT_SPECS, LEVEL_LABELS
+from hr_analysis.store import DEFAULT_ROOT
+
+DEFAULT_EXPORT_ROOT = os.path.join(DEFAULT_ROOT, 'exports')
+DEFAULT_CHUNK_ROWS = 50_000
+FORMATS = ('csv', 'parquet', 'xlsx')
+NO_DEPARTMENT_LABEL = '(부서 없음)'
+HEALTH_SHEET = '부서 건강도'
+DOWNLOAD_LIMIT_MB = 200   # 이보다 큰 파일은 브라우저 다운로드 대신 출력 폴더에서 전달
+
+_EXCEL_MAX_ROWS = 1_048_576 - 1   # 머리글 행 제외
+_LEVEL_NAMES = np.array(LEVEL_LABELS + ('',), dtype=object)
+
+_executor = None
+_lock = threading.Lock()
+
+
+def excel_available():
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def department_groups(df, mapping):
+    """[(부서, 행 위치 배열)] (부서 이름순, 부서 내 원래 행 순서 유지)"""
+    keys = department_keys(df, mapping).fillna(NO_DEPARTMENT_LABEL)
+    codes, departments = pd.factorize(keys, sort=True)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(departments) + 1))
+    return [(departments[i], order[bounds[i]:bounds[i + 1]]) for i in range(len(departments))]
+
+
+def roster_chunk(df, derived, rows):
+    """rows 위치의 원본 행 + 점수별 `<점수>`, `<점수>_level`(위험군 이름) 컬럼"""
+    chunk = df.iloc[rows].reset_index(drop=True)
+    for spec in DEFAULT_SPECS:
+        chunk[spec.name] = derived[spec.name].to_numpy()[rows]
+        chunk[f"{spec.name}_level"] = _LEVEL_NAMES[derived[f"{spec.name}_level"].to_numpy()[rows]]
+    return chunk
+
+
+def safe_filename(name):
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', str(name)).strip('_') or '_'
+
+
+def unique_filenames(names):
+    """이름마다 겹치지 않는 safe_filename ('R/D'와 'R D'처럼 같아지면 '_2', '_3'을 붙임, 대소문자 무시)"""
+    used, result = set(), []
+    for name in names:
+        stem = base = safe_filename(name)
+        n = 2
+        while stem.lower() in used:
+            stem, n = f"{base}_{n}", n + 1
+        used.add(stem.lower())
+        result.append(stem)
+    return result
+
+
+class _ExcelReport:
+    """write-only 통합 문서에 시트를 차례로 추가하며 행 단위로 쓰기"""
+
+    def __init__(self, path):
+        from openpyxl import Workbook
+
+        self.path = path
+        self._workbook = Workbook(write_only=True)
+        self._titles = set()
+        self._sheet = None
+        self._rows = 0
+        self._name = None
+        self._part = 0
+        self._columns = None
+
+    def _title(self, name):
+        title = re.sub(r'[\[\]:*?/\\]', '_', str(name))[:31]
+        base, n = title, 2
+        while title.lower() in self._titles:
+            suffix = f" ({n})"
+            title, n = base[:31 - len(suffix)] + suffix, n + 1
+        self._titles.add(title.lower())
+        return title
+
+    def start_sheet(self, name, columns):
+        self._name, self._part, self._columns = name, 1, list(columns)
+        self._new_sheet(name)
+
+    def _new_sheet(self, title):
+        self._sheet = self._workbook.create_sheet(self._title(title))
+        self._sheet.append(self._columns)
+        self._rows = 0
+
+    def write(self, frame):
+        values = frame.astype(object).where(frame.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            if self._rows == _EXCEL_MAX_ROWS:
+                self._part += 1
+                self._new_sheet(f"{self._name} ({self._part})")
+            self._sheet.append(row)
+            self._rows += 1
+
+    def close(self):
+        self._workbook.save(self.path)
+
+
+class _RosterFile:
+    """부서 하나의 CSV 또는 Parquet 명단 파일에 청크 이어 쓰기"""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self._parquet = None
+
+    def write(self, chunk):
+        if self.path.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self._parquet is None:
+                arrow = pa.Table.from_pandas(chunk, preserve_index=False)
+                self._parquet = pq.ParquetWriter(self.path, arrow.schema)
+            else:
+                arrow = pa.Table.from_pandas(chunk, schema=self._parquet.schema, preserve_index=False)
+            self._parquet.write_table(arrow)
+        else:
+            first = self.rows == 0
+            chunk.to_csv(self.path, mode='w' if first else 'a', header=first, index=False,
+                         encoding='utf-8-sig' if first else 'utf-8')
+        self.rows += len(chunk)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def write_table(frame, path):
+    if path.endswith('.parquet'):
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False, encoding='utf-8-sig')
+
+
+def export_report(df, derived, mapping, output_dir, formats=FORMATS, health=None, chunk_rows=DEFAULT_CHUNK_ROWS,
+                  on_progress=None, cancelled=None):
+    """부서별 명단과 부서 건강도 표를 formats 형식으로 쓰고 만든 파일 경로 목록 반환
+
+    on_progress(쓴 행 수)는 청크마다 호출되고, cancelled()가 True를 돌려주면 ExportCancelled를 던진다.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    health = department_summary(df, derived, mapping) if health is None else health
+    files = []
+    for fmt in formats:
+        if fmt != 'xlsx':
+            files.append(os.path.join(output_dir, f"department_health.{fmt}"))
+            write_table(health, files[-1])
+
+    excel = None
+    if 'xlsx' in formats:
+        excel = _ExcelReport(os.path.join(output_dir, 'hr_report.xlsx'))
+        excel.start_sheet(HEALTH_SHEET, health.columns)
+        excel.write(health)
+
+    written = 0
+    groups = department_groups(df, mapping)
+    try:
+        for (department, rows), stem in zip(groups, unique_filenames(department for department, _ in groups)):
+            writers = [_RosterFile(os.path.join(output_dir, f"roster_{stem}.{fmt}")) for fmt in formats if fmt != 'xlsx']
+            try:
+                for start in range(0, len(rows), chunk_rows):
+                    if cancelled is not None and cancelled():
+                        raise ExportCancelled()
+                    chunk = roster_chunk(df, derived, rows[start:start + chunk_rows])
+                    for writer in writers:
+                        writer.write(chunk)
+                    if excel is not None:
+                        if start == 0:
+                            excel.start_sheet(department, chunk.columns)
+                        excel.write(chunk)
+                    written += len(chunk)
+                    if on_progress is not None:
+                        on_progress(written)
+            finally:
+                for writer in writers:
+                    writer.close()
+            files.extend(writer.path for writer in writers)
+    finally:
+        # 취소·실패 시에도 write-only 시트의 임시 파일을 정리하도록 저장까지 마침
+        if excel is not None:
+            excel.close()
+    if excel is not None:
+        files.append(excel.path)
+    return files
+
+
+class ExportJob:
+    """백그라운드 내보내기 한 건의 진행 상황"""
+
+    def __init__(self, output_dir, formats, total):
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.total = total
+        self.written = 0
+        self.files = []
+        self.error = None
+        self.started = time.perf_counter()
+        self.finished = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def progress(self):
+        return self.written / self.total if self.total else 1.0
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def cancel(self):
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def _run(self, df, derived, mapping, health, chunk_rows):
+        try:
+            self.files = export_report(df, derived, mapping, self.output_dir, self.formats, health, chunk_rows,
+                                       on_progress=lambda rows: setattr(self, 'written', rows),
+                                       cancelled=self._cancel.is_set)
+        except ExportCancelled:
+            shutil.rmtree(self.output_dir, ignore_errors=True)
+        except Exception as e:
+            self.error = str(e)
+            shutil.rmtree(self.output_dir, ignore_errors=True)
+        finally:
+            self.finished = time.perf_counter()
+            self._done.set()
+
+
+def start_export(df, derived, mapping, formats=FORMATS, health=None, name='hr_report', root=DEFAULT_EXPORT_ROOT,
+                 chunk_rows=DEFAULT_CHUNK_ROWS):
+    """전용 작업자 스레드에서 내보내기를 시작하고 ExportJob 반환 (앞선 작업이 있으면 끝난 뒤 실행)"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='hr-export')
+    output_dir = base = os.path.join(root, f"{time.strftime('%Y%m%d-%H%M%S')}-{safe_filename(name)}")
+    n = 2
+    while os.path.exists(output_dir):
+        output_dir, n = f"{base}-{n}", n + 1
+    os.makedirs(output_dir)
+    job = ExportJob(output_dir, formats, len(df))
+    _executor.submit(job._run, df, derived, mapping, health, chunk_rows)
+    return job
@@ -0,0 +1,174 @@
+"""커스텀 계산 필드 엔진
+
+공식은 추가할 때 한 번 파싱·검증해 컴파일된 식으로 보관한다. 공식이 참조하는 이름으로
+필드 간 의존 관계를 만들어 다른 커스텀 필드를 정의 순서와 무관하게 참조할 수 있고,
+결과는 (데이터셋 지문, 공식과 의존 필드 공식) 단위로 캐시되어 필드를 하나 추가해도
+나머지 필드는 다시 계산하지 않는다.
+"""
+import ast
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# 공식에서 쓸 수 있는 함수
+FUNCTIONS = {
+    'abs': np.abs, 'sqrt': np.sqrt, 'exp': np.exp, 'log': np.log, 'log10': np.log10, 'log1p': np.log1p,
+    'floor': np.floor, 'ceil': np.ceil, 'round': np.round,
+    'minimum': np.minimum, 'maximum': np.maximum, 'where': np.where,
+}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Name, ast.Load, ast.Constant, ast.Call,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.BitAnd, ast.BitOr, ast.BitXor, ast.Invert, ast.USub, ast.UAdd,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+)
+
+# `컬럼 이름` 처럼 역따옴표로 감싼 이름 (공백 등 식별자로 쓸 수 없는 컬럼용)
+_BACKTICK = re.compile(r'`([^`]+)`')
+
+
+class CustomFieldError(ValueError):
+    """공식 문법 오류, 알 수 없는 이름, 순환 참조"""
+
+
+class _ElementwiseLogic(ast.NodeTransformer):
+    """and/or/not과 연쇄 비교(a < b < c)를 원소별 연산(&, |, ~)으로 변환 (DataFrame.eval과 같은 의미)"""
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = ast.BinOp(left=result, op=op, right=value)
+        return result
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.UnaryOp(op=ast.Invert(), operand=node.operand)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        parts, left = [], node.left
+        for op, right in zip(node.ops, node.comparators):
+            parts.append(ast.Compare(left=left, ops=[op], comparators=[right]))
+            left = right
+        result = parts[0]
+        for part in parts[1:]:
+            result = ast.BinOp(left=result, op=ast.BitAnd(), right=part)
+        return result
+
+
+@dataclass(frozen=True)
+class CompiledField:
+    """검증된 공식: 참조하는 이름(names), 실행할 코드, 역따옴표 이름의 별칭"""
+    name: str
+    formula: str
+    names: frozenset
+    code: object
+    aliases: tuple = ()
+
+
+@lru_cache(maxsize=256)
+def compile_field(name, formula):
+    """공식을 파싱·검증해 CompiledField 생성 (실패 시 CustomFieldError)"""
+    aliases = {}
+
+    def alias(match):
+        return aliases.setdefault(match.group(1), f'__col{len(aliases)}')
+
+    try:
+        tree = ast.parse(_BACKTICK.sub(alias, formula.strip()), mode='eval')
+    except SyntaxError as e:
+        raise CustomFieldError(f"'{name}' 공식 문법 오류: {e.msg}") from None
+    tree = ast.fix_missing_locations(_ElementwiseLogic().visit(tree))
+
+    names = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise CustomFieldError(f"'{name}' 공식에 사용할 수 없는 구문: {type(node).__name__}")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+                raise CustomFieldError(f"'{name}' 공식에 사용할 수 없는 함수 (가능: {', '.join(FUNCTIONS)})")
+        elif isinstance(node, ast.Name):
+            names.add(node.id)
+    names -= {node.func.id for node in ast.walk(tree) if isinstance(node, ast.Call)}
+
+    # 역따옴표 별칭은 실제 컬럼 이름으로 되돌려 의존 관계에 기록하고, 실행 시 별칭으로 전달
+    reverse = {placeholder: original for original, placeholder in aliases.items()}
+    code = compile(tree, f'<{name}>', 'eval')
+    return CompiledField(name, formula, frozenset(reverse.get(n, n) for n in names), code, tuple(aliases.items()))
+
+
+def resolve_order(fields, columns):
+    """의존 관계 순서로 정렬한 필드 이름과 {필드: 오류 메시지}
+
+    알 수 없는 이름을 참조하거나 순환 참조에 포함된 필드, 그리고 그런 필드에 의존하는
+    필드는 오류로 분류된다. 원본 컬럼과 이름이 같은 필드는 원본 컬럼을 가리킨다.
+    """
+    columns = set(columns)
+    order, errors, state = [], {}, {}
+
+    def visit(name, path):
+        if state.get(name) == 'done':
+            return name not in errors
+        if state.get(name) == 'visiting':
+            cycle = path[path.index(name):] + [name]
+            errors[name] = f"순환 참조: {' → '.join(cycle)}"
+            return False
+        state[name] = 'visiting'
+        ok = True
+        for dep in sorted(fields[name].names):
+            if dep in fields and dep not in columns:
+                if not visit(dep, path + [name]):
+                    errors.setdefault(name, f"'{dep}' 필드 오류로 계산할 수 없음")
+                    ok = False
+            elif dep not in columns:
+                errors.setdefault(name, f"알 수 없는 컬럼 또는 필드: '{dep}'")
+                ok = False
+        state[name] = 'done'
+        if ok and name not in errors:
+            order.append(name)
+        return ok and name not in errors
+
+    for name in fields:
+        visit(name, [])
+    return order, errors
+
+
+def field_signature(name, fields, columns, _memo=None):
+    """필드 결과의 캐시 키: 자기 공식과 참조하는 커스텀 필드들의 서명"""
+    memo = {} if _memo is None else _memo
+    if name not in memo:
+        field = fields[name]
+        deps = tuple(sorted(
+            (dep, field_signature(dep, fields, columns, memo))
+            for dep in field.names if dep in fields and dep not in columns
+        ))
+        memo[name] = (field.formula, deps)
+    return memo[name]
+
+
+def _widen(series):
+    """저장용으로 축소된 정수(uint8 척도, int32 등)는 int64로 (뺄셈·곱셈에서 값이 넘치거나 돌아가지 않도록)"""
+    if series.dtype.kind in 'iu' and series.dtype.itemsize < 8:
+        return series.astype(np.int64)
+    return series
+
+
+def evaluate_field(field, df, values):
+    """컴파일된 공식을 원본 컬럼과 계산된 필드 값(values)으로 실행해 Series 반환"""
+    aliases = dict(field.aliases)
+    namespace = dict(FUNCTIONS)
+    for original in field.names:
+        source = df[original] if original in df.columns else values[original]
+        namespace[aliases.get(original, original)] = _widen(source)
+    result = eval(field.code, {'__builtins__': {}}, namespace)
+    return pd.Series(result, index=df.index, name=field.name)
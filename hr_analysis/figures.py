@@ -0,0 +1,53 @@
+"""테마와 무관한 Plotly figure 캐시
+
+figure는 (이름, 데이터셋 지문, 매핑, 차트 파라미터)마다 한 번만 만들어 프로세스 공용 캐시에 넣고,
+다크/라이트 테마(layout.template)는 화면에 보내기 직전에 입힌다. 테마를 바꾸거나 페이지를 다시
+열어도 집계와 figure 생성은 다시 하지 않는다.
+
+같은 figure 객체를 여러 세션이 공유하므로 테마 적용과 직렬화(st.plotly_chart 안의 to_dict)는
+figure별 잠금 안에서 한다. 만들 때 대시보드 테마 템플릿이 들어간 figure(px 차트)만 테마를 바꾸고,
+go.Figure처럼 기본 템플릿으로 만든 figure는 그대로 둔다.
+"""
+import threading
+from contextlib import contextmanager
+
+from hr_analysis.derived import DerivedFrameCache, get_cached_aggregate
+
+THEMES = {True: 'plotly_dark', False: 'plotly_white'}
+
+_figure_cache = DerivedFrameCache(max_entries=64, max_bytes=256 * 1024 ** 2)
+
+
+def _theme_of(figure):
+    """figure에 들어 있는 대시보드 테마 이름 (다른 템플릿이면 None)"""
+    import plotly.io as pio
+
+    return next((name for name in THEMES.values() if figure.layout.template == pio.templates[name]), None)
+
+
+class ThemedFigure:
+    """공유 캐시에 보관하는 figure와 현재 입혀진 테마"""
+
+    def __init__(self, figure):
+        self.figure = figure
+        self.theme = _theme_of(figure)
+        self.nbytes = 4096 + sum(getattr(value, 'nbytes', 0)
+                                 for trace in figure.data for value in trace.to_plotly_json().values())
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def themed(self, theme):
+        """theme을 입힌 figure (with 블록 안에서만 유효)"""
+        with self._lock:
+            if self.theme is not None and self.theme != theme:
+                self.figure.layout.template = theme
+                self.theme = theme
+            yield self.figure
+
+
+def cached_figure(name, fingerprint, mapping, params, build, cache=None):
+    """데이터셋·매핑·params 조합마다 한 번만 build()한 ThemedFigure (지문이 없으면 매번 만듦)"""
+    if fingerprint is None:
+        return ThemedFigure(build())
+    cache = _figure_cache if cache is None else cache
+    return get_cached_aggregate(f"figure:{name}:{params!r}", fingerprint, mapping, lambda: ThemedFigure(build()), cache)
@@ -0,0 +1,139 @@
+"""타입 지정 CSV 로드
+
+`default_mapping`으로 찾은 표준 필드에 맞춰 저장 타입을 정한다.
+범주형 필드는 category, Yes/No 필드는 bool, 1~4 척도는 uint8로 읽고,
+나머지 정수 컬럼은 축소하며, 값이 하나뿐인 채움 컬럼(직원수, 18세이상 등 FILLER_COLUMNS)은 버린다.
+그 밖의 상수 컬럼은 나중에 퍼지 매칭이나 사용자가 매핑할 수 있으므로 남기고 report.constant_columns에만 적는다.
+"""
+import sys
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from hr_analysis.mapping import CATEGORY_FIELDS, SCALE_FIELDS, YES_NO_FIELDS, auto_map
+from hr_analysis.scoring import YES_VALUES
+
+NO_VALUES = ('No', 'no', '아니오', '아니요')
+
+# 척도는 가능한 가장 작은 타입, 일반 정수는 int32부터 (커스텀 필드 공식은 expressions.evaluate_field에서 int64로 넓혀 계산)
+_SCALE_DTYPES = (np.uint8, np.int8, np.int16, np.int32, np.int64)
+_INT_DTYPES = (np.int32, np.int64)
+
+# 모든 행이 같은 값이면 버리는 채움 컬럼 (IBM HR 데이터의 한글/영문 이름)
+FILLER_COLUMNS = ('직원수', '18세이상', '표준근무시간', 'EmployeeCount', 'Over18', 'StandardHours')
+
+
+@dataclass
+class IngestReport:
+    """로드 결과 요약: 기본 read_csv 대비 메모리"""
+    rows: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    dropped_columns: list = field(default_factory=list)
+    constant_columns: list = field(default_factory=list)   # 값이 하나뿐이지만 남긴 컬럼
+    sources: list = field(default_factory=list)   # 여러 파일 병합 시 파일별 요약
+
+    @property
+    def reduction(self):
+        return self.bytes_before / self.bytes_after if self.bytes_after else 0.0
+
+
+def infer_schema(columns):
+    """컬럼별 저장 종류 {컬럼명: 'category' | 'yes_no' | 'scale'}"""
+    schema = {}
+    for std_field, col in auto_map(columns).items():
+        if std_field in CATEGORY_FIELDS: schema[col] = 'category'
+        elif std_field in YES_NO_FIELDS: schema[col] = 'yes_no'
+        elif std_field in SCALE_FIELDS: schema[col] = 'scale'
+    return schema
+
+
+def _object_nbytes(categorical):
+    """같은 값을 object 컬럼으로 읽었을 때의 memory_usage(deep=True)"""
+    counts = categorical.value_counts(dropna=False)
+    return 8 * len(categorical) + sum(sys.getsizeof(value) * int(n) for value, n in counts.items())
+
+
+def to_yes_no(series):
+    """값이 모두 Yes/No 계열이면 bool(결측이 있으면 nullable boolean), 아니면 None"""
+    if not set(series.cat.categories) <= set(YES_VALUES) | set(NO_VALUES):
+        return None
+    flags = series.isin(YES_VALUES)
+    missing = series.isna()
+    if missing.any():
+        return flags.astype('boolean').mask(missing)
+    return flags
+
+
+def _downcast_int(series, candidates):
+    if series.dtype.kind not in 'iu' or len(series) == 0:
+        return series
+    lo, hi = series.min(), series.max()
+    for dtype in candidates:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return series.astype(dtype)
+    return series
+
+
+def _is_constant(series):
+    if len(series) == 0:
+        return False
+    first = series.iloc[0]
+    if pd.isna(first):
+        return bool(series.isna().all())
+    return bool((series == first).all())
+
+
+def constant_columns(df):
+    """(버릴 채움 컬럼, 남길 상수 컬럼): 모든 행의 값이 같은 컬럼을 FILLER_COLUMNS 여부로 나눔"""
+    constant = [col for col in df.columns if _is_constant(df[col])]
+    return [col for col in constant if col in FILLER_COLUMNS], [col for col in constant if col not in FILLER_COLUMNS]
+
+
+def optimize_frame(df, schema, report, drop_constant=True):
+    """스키마 적용, 정수 축소, 상수 채움 컬럼 제거 (drop_constant=False면 유지)"""
+    if drop_constant:
+        dropped, kept = constant_columns(df)
+        report.dropped_columns.extend(dropped)
+        report.constant_columns.extend(kept)
+    for col in list(df.columns):
+        series = df[col]
+        kind = schema.get(col)
+        if col in report.dropped_columns:
+            continue
+        if kind == 'yes_no' and isinstance(series.dtype, pd.CategoricalDtype):
+            converted = to_yes_no(series)
+            if converted is not None:
+                df[col] = converted
+        elif kind == 'scale':
+            df[col] = _downcast_int(series, _SCALE_DTYPES)
+        elif kind is None:
+            df[col] = _downcast_int(series, _INT_DTYPES)
+    return df.drop(columns=report.dropped_columns)
+
+
+def read_typed_csv(file, drop_constant=True, **read_kwargs):
+    """CSV를 타입 지정으로 읽고 (DataFrame, IngestReport) 반환
+
+    여러 파일을 병합할 때처럼 컬럼을 나중에 매핑하면 drop_constant=False로 읽고 합친 뒤 상수 컬럼을 버린다.
+    """
+    header = pd.read_csv(file, nrows=0, **read_kwargs)
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    schema = infer_schema(header.columns)
+    dtypes = {col: 'category' for col, kind in schema.items() if kind in ('category', 'yes_no')}
+    df = pd.read_csv(file, dtype=dtypes, **read_kwargs)
+
+    report = IngestReport(rows=len(df))
+    for col in df.columns:
+        if col in dtypes:
+            report.bytes_before += _object_nbytes(df[col])
+        else:
+            report.bytes_before += int(df[col].memory_usage(index=False, deep=True))
+    report.bytes_before += int(df.index.memory_usage())
+
+    df = optimize_frame(df, schema, report, drop_constant)
+    report.bytes_after = int(df.memory_usage(deep=True).sum())
+    return df, report
@@ -0,0 +1,136 @@
+"""표준 필드 정의와 컬럼 자동 매핑
+
+이름이 정확히 같은 컬럼을 먼저 찾고, 컬럼 프로필(profile.column_profile)이 있으면 남은 필드는
+정규화한 이름의 유사도와 값 모양(고유값 수, 범위, 타입)이 맞는 컬럼으로 채운다.
+"""
+import re
+from difflib import SequenceMatcher
+
+# 기본 컬럼 매핑 (표준 필드 → 영문 원본 컬럼명)
+default_mapping = {
+    '직원ID': 'EmployeeNumber', '퇴직여부': 'Attrition', '나이': 'Age', '성별': 'Gender', '출장빈도': 'BusinessTravel',
+    '일대비급여수준': 'DailyRate', '부서': 'Department', '집과의거리': 'DistanceFromHome', '전공': 'EducationField',
+    '업무환경만족도': 'EnvironmentSatisfaction', '업무참여도': 'JobInvolvement', '업무만족도': 'JobSatisfaction',
+    '결혼여부': 'MaritalStatus', '월급여': 'MonthlyIncome', '일한회사수': 'NumCompaniesWorked', '총경력': 'TotalWorkingYears',
+    '야근정도': 'OverTime', '급여인상률': 'PercentSalaryHike', '스톡옵션': 'StockOptionLevel', '근속연수': 'YearsAtCompany',
+    '현재역할년수': 'YearsInCurrentRole', '마지막승진년수': 'YearsSinceLastPromotion'
+}
+
+# 표준 필드별 저장 타입
+CATEGORY_FIELDS = ('부서', '성별', '출장빈도', '전공', '결혼여부')
+YES_NO_FIELDS = ('퇴직여부', '야근정도')
+SCALE_FIELDS = ('업무환경만족도', '업무참여도', '업무만족도')
+
+# 퍼지 매칭에 쓰는 표준 필드의 다른 이름 (한글명, 영문명 외)
+FIELD_ALIASES = {
+    '직원ID': ('EmployeeID', 'EmpID', 'EmpNo', '사번', '사원번호'), '퇴직여부': ('퇴사여부', 'Terminated'),
+    '나이': ('연령',), '성별': ('Sex',), '부서': ('Dept', '부서명'), '월급여': ('Salary', 'MonthlySalary', '급여'),
+    '야근정도': ('초과근무',), '근속연수': ('Tenure', '재직연수'),
+}
+FUZZY_THRESHOLD = 0.8    # 이 이상이면 자동 매핑
+RANK_THRESHOLD = 0.5     # 이 이상이면 매핑 후보 목록 앞쪽에 유사도순으로
+CATEGORY_MAX_UNIQUE = 100
+SCALE_MAX = 10
+
+
+def auto_map(columns, profile=None):
+    """한글 필드명, 영문 컬럼명, 대소문자 무시 영문명 순으로 매칭 (profile이 있으면 나머지는 퍼지 매칭)"""
+    columns = list(columns)
+    col_set = set(columns)
+    cols_lower = {col.lower(): col for col in columns}
+    mapping = {}
+    for korean, english in default_mapping.items():
+        if korean in col_set: mapping[korean] = korean
+        elif english in col_set: mapping[korean] = english
+        elif english.lower() in cols_lower: mapping[korean] = cols_lower[english.lower()]
+    if profile is not None:
+        mapping.update(fuzzy_map(profile, mapping))
+    return mapping
+
+
+def field_shape(field):
+    """표준 필드 값의 모양: 'id' | 'yes_no' | 'category' | 'scale' | 'number'"""
+    if field == '직원ID': return 'id'
+    if field in YES_NO_FIELDS: return 'yes_no'
+    if field in CATEGORY_FIELDS: return 'category'
+    if field in SCALE_FIELDS: return 'scale'
+    return 'number'
+
+
+def shape_mask(profile, shape):
+    """프로필의 컬럼마다 shape 값을 담을 수 있는지 (bool 배열)"""
+    kind, nunique = profile['kind'], profile['nunique']
+    numeric = kind.isin(('int', 'float'))
+    if shape == 'id':
+        mask = (numeric | kind.isin(('text', 'category'))) & (profile['unique_ratio'] >= 0.95)
+    elif shape == 'yes_no':
+        # 한 파일에서 모두 'No'처럼 값이 하나뿐인 문자 컬럼도 후보
+        mask = (kind == 'bool') | (nunique == 2) | (kind.isin(('text', 'category')) & (nunique == 1))
+    elif shape == 'category':
+        mask = kind.isin(('text', 'category')) & (nunique <= CATEGORY_MAX_UNIQUE)
+    elif shape == 'scale':
+        mask = (kind == 'int') & (profile['min'] >= 0) & (profile['max'] <= SCALE_MAX)
+    else:
+        mask = numeric
+    return mask.to_numpy()
+
+
+def _normalize(name):
+    return re.sub(r'[\W_]+', '', str(name)).lower()
+
+
+def _aliases(field):
+    return [alias for alias in map(_normalize, (field, default_mapping[field]) + FIELD_ALIASES.get(field, ())) if alias]
+
+
+def name_score(column, aliases, threshold=0.0):
+    """정규화한 컬럼명과 필드 별칭들의 최대 유사도 0~1 (threshold 미만이 확실하면 0)
+
+    별칭이 컬럼명 안에 통째로 들어 있으면(MonthlyIncomeKRW) 0.85 이상으로 본다.
+    """
+    best = 0.0
+    for alias in aliases:
+        if column == alias:
+            return 1.0
+        if len(alias) >= 4 and alias in column:
+            best = max(best, 0.85 + 0.15 * len(alias) / len(column))
+            continue
+        # 길이만으로 구한 상한이 threshold와 현재 최댓값보다 작으면 비교 생략
+        if 2 * min(len(column), len(alias)) / (len(column) + len(alias)) < max(threshold, best):
+            continue
+        matcher = SequenceMatcher(None, column, alias)
+        if matcher.quick_ratio() >= max(threshold, best):
+            best = max(best, matcher.ratio())
+    return best if best >= threshold else 0.0
+
+
+def _scored_columns(profile, field, threshold):
+    """field 모양에 맞는 컬럼별 (유사도, 컬럼) (threshold 미만은 유사도 0)"""
+    aliases = _aliases(field)
+    columns = profile.index[shape_mask(profile, field_shape(field))]
+    return [(name_score(_normalize(col), aliases, threshold), col) for col in columns]
+
+
+def fuzzy_map(profile, mapping=None):
+    """mapping에 없는 표준 필드를 이름 유사도와 값 모양으로 찾은 {필드: 컬럼} (유사도가 높은 쌍부터 배정)"""
+    mapping = mapping or {}
+    used = set(mapping.values())
+    matches = [(score, field, col)
+               for field in default_mapping if field not in mapping
+               for score, col in _scored_columns(profile, field, FUZZY_THRESHOLD) if score and col not in used]
+    result = {}
+    for _, field, col in sorted(matches, key=lambda match: -match[0]):
+        if field not in result and col not in used:
+            result[field] = col
+            used.add(col)
+    return result
+
+
+def rank_candidates(profile):
+    """표준 필드별 매핑 후보 컬럼: 모양이 맞는 컬럼 중 이름이 비슷한 것부터, 나머지는 원래 순서"""
+    ranked = {}
+    for field in default_mapping:
+        scored = _scored_columns(profile, field, RANK_THRESHOLD)
+        ranked[field] = ([col for score, col in sorted((item for item in scored if item[0]), key=lambda item: -item[0])]
+                         + [col for score, col in scored if not score])
+    return ranked
@@ -0,0 +1,103 @@
+"""여러 CSV를 병렬로 읽어 표준 컬럼명으로 맞춘 뒤 하나의 데이터셋으로 병합
+
+계열사마다 헤더가 조금씩 다른 파일을 작업자 프로세스에서 하나씩 타입 지정으로 읽고,
+auto_map(컬럼 프로필로 퍼지 매칭 포함)으로 찾은 컬럼을 표준 필드명(default_mapping의 키)으로 바꾼다. 병합한 뒤
+직원ID가 겹치는 행은 해시 인덱스(pd.Index.duplicated) 한 번으로 찾아 나중 파일의 행만 남긴다.
+파일 하나에서만 값이 같은 컬럼(Dept가 모두 'Sales')이 매핑 전에 버려지지 않도록 상수 채움 컬럼은 병합 뒤에 한 번 버린다.
+"""
+import hashlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from hr_analysis.ingest import IngestReport, constant_columns, read_typed_csv, to_yes_no
+from hr_analysis.mapping import YES_NO_FIELDS, auto_map
+from hr_analysis.profile import column_profile
+
+SOURCE_COLUMN = '원본파일'
+
+
+def read_standardized(name, data):
+    """작업자 프로세스: CSV 내용(bytes 또는 경로)을 읽어 표준 컬럼명으로 바꾼 (DataFrame, IngestReport, 파일 요약)"""
+    started = time.perf_counter()
+    df, report = read_typed_csv(io.BytesIO(data) if isinstance(data, bytes) else data, drop_constant=False)
+    mapping = auto_map(df.columns, column_profile(df))
+    df = df.rename(columns={col: field for field, col in mapping.items()})
+    for field in YES_NO_FIELDS:
+        # 퍼지 매칭으로 찾은 컬럼은 문자열로 읽혔으므로 bool로 맞춤 (bool과 섞여 object가 되지 않도록)
+        if field in df.columns and not pd.api.types.is_bool_dtype(df[field].dtype):
+            converted = to_yes_no(df[field].astype('category'))
+            if converted is not None:
+                df[field] = converted
+    source = {'파일': name, '행 수': len(df), '매핑 필드': len(mapping), '중복 제거': 0,
+              '읽기(초)': round(time.perf_counter() - started, 3)}
+    return df, report, source
+
+
+def _concat(frames):
+    """범주형 컬럼은 범주를 합쳐 category로 유지하며 세로로 이어 붙이기"""
+    merged = pd.concat(frames, ignore_index=True)
+    for col in merged.columns:
+        parts = [frame[col] for frame in frames if col in frame.columns]
+        if len(parts) == len(frames) and all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            merged[col] = union_categoricals(parts, ignore_order=True)
+    return merged
+
+
+def deduplicate(df, id_col, keep='last'):
+    """직원ID가 같은 행 중 keep 쪽 하나만 남긴 (DataFrame, 제거된 행 위치) (ID가 빈 행은 그대로 둠)"""
+    ids = df[id_col]
+    duplicated = pd.Index(ids).duplicated(keep=keep) & ids.notna().to_numpy()
+    return df[~duplicated].reset_index(drop=True), duplicated.nonzero()[0]
+
+
+def merge_files(files, workers=None, keep='last'):
+    """[(파일 이름, bytes 또는 경로)]를 병합해 (DataFrame, IngestReport) 반환
+
+    report.sources에 파일별 행 수, 매핑된 표준 필드 수, 중복으로 제거된 행 수, 읽기 시간이 담긴다.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(files))
+    if workers <= 1:
+        results = [read_standardized(name, data) for name, data in files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(read_standardized, *zip(*files)))
+
+    frames = [df for df, _, _ in results]
+    file_index = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames])
+    merged = _concat(frames)
+    labels = [name for name, _ in files]
+    if len(set(labels)) < len(labels):
+        labels = [f"{i + 1}. {name}" for i, name in enumerate(labels)]
+    merged[SOURCE_COLUMN] = pd.Categorical.from_codes(file_index, categories=labels)
+
+    sources = [source for _, _, source in results]
+    if '직원ID' in merged.columns:
+        if merged['직원ID'].dtype == object:
+            # 파일마다 숫자/문자 ID가 섞였으면 문자열로 맞춰 비교하고 저장
+            merged['직원ID'] = merged['직원ID'].where(merged['직원ID'].isna(), merged['직원ID'].astype(str))
+        merged, removed = deduplicate(merged, '직원ID', keep)
+        for source, n in zip(sources, np.bincount(file_index[removed], minlength=len(frames))):
+            source['중복 제거'] = int(n)
+
+    dropped, kept = constant_columns(merged)
+    merged = merged.drop(columns=dropped)
+    report = IngestReport(
+        rows=len(merged),
+        bytes_before=sum(report.bytes_before for _, report, _ in results),
+        bytes_after=int(merged.memory_usage(deep=True).sum()),
+        dropped_columns=dropped,
+        constant_columns=[col for col in kept if col != SOURCE_COLUMN],
+        sources=sources,
+    )
+    return merged, report
+
+
+def files_hash(hashes):
+    """파일별 내용 해시(순서 유지)로 만든 병합 데이터셋 ID"""
+    return hashlib.sha256('|'.join(hashes).encode()).hexdigest()
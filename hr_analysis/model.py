@@ -0,0 +1,152 @@
+"""퇴직여부 로지스틱 회귀 모델
+
+규칙 기반 점수와 나란히 볼 수 있도록 매핑된 수치/범주/Yes-No 필드로 퇴직 확률을 추정한다.
+큰 데이터는 퇴직자·재직자 비율을 유지한 층화 표본으로 적합하고(절편 보정 불필요),
+예측은 전체 행의 설계행렬과 계수의 행렬곱 한 번으로 계산한다.
+statsmodels는 적합할 때만 불러오므로 이 모듈을 import해도 로드되지 않는다.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from hr_analysis.scoring import LEVEL_HIGH, LEVEL_LOW, LEVEL_MEDIUM, mapped_column, yes_mask
+
+NUMERIC_FEATURES = ('나이', '일대비급여수준', '집과의거리', '업무환경만족도', '업무참여도', '업무만족도', '월급여',
+                    '일한회사수', '총경력', '급여인상률', '스톡옵션', '근속연수', '현재역할년수', '마지막승진년수')
+FLAG_FEATURES = ('야근정도',)
+CATEGORY_FEATURES = ('부서', '결혼여부', '출장빈도')
+
+DEFAULT_MAX_ROWS = 200_000
+
+
+def statsmodels_available():
+    try:
+        import statsmodels.api  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass(frozen=True)
+class AttritionModel:
+    """적합된 계수와 설계행렬 재구성 정보 (수치 특성은 표준화된 단위)"""
+    columns: tuple        # 설계행렬 컬럼명 ('const' 포함)
+    numeric: tuple        # (필드, 평균, 표준편차)
+    flags: tuple          # 필드
+    categories: tuple     # (필드, (기준 범주 제외 범주들))
+    params: np.ndarray
+    bse: np.ndarray
+    pvalues: np.ndarray
+    n_train: int
+    n_rows: int
+    pseudo_r2: float
+
+    def design_matrix(self, df, mapping):
+        return design_matrix(df, mapping, self.numeric, self.flags, self.categories)
+
+    def predict(self, df, mapping):
+        """전체 행의 퇴직 확률 (행렬곱 한 번)"""
+        return 1 / (1 + np.exp(-(self.design_matrix(df, mapping) @ self.params)))
+
+    def coefficients(self):
+        """계수 표 (수치 특성은 1 표준편차당, 플래그·범주는 해당 여부의 오즈비)"""
+        table = pd.DataFrame({'특성': self.columns, '계수': self.params, '표준오차': self.bse, 'p값': self.pvalues})
+        table['오즈비'] = np.exp(table['계수'])
+        return table[table['특성'] != 'const'].sort_values('계수', key=np.abs, ascending=False, ignore_index=True)
+
+
+def design_matrix(df, mapping, numeric, flags, categories):
+    """const, 표준화 수치, 플래그, 범주 더미 순의 float64 설계행렬 (결측 수치는 학습 평균, 즉 0으로 대체)"""
+    blocks = [np.ones((len(df), 1))]
+    for field, mean, std in numeric:
+        values = (df[mapping[field]].to_numpy(dtype=np.float64, na_value=np.nan) - mean) / std
+        blocks.append(np.nan_to_num(values, nan=0.0)[:, None])
+    for field in flags:
+        blocks.append(yes_mask(df[mapping[field]]).astype(np.float64)[:, None])
+    for field, levels in categories:
+        codes, uniques = pd.factorize(df[mapping[field]])
+        positions = {value: i for i, value in enumerate(uniques)}
+        blocks.extend((codes == positions.get(level, -2)).astype(np.float64)[:, None] for level in levels)
+    return np.hstack(blocks)
+
+
+def model_fields(df, mapping):
+    """데이터에 매핑되어 있고 값이 두 가지 이상인 특성 필드"""
+    def usable(field):
+        col = mapped_column(df, mapping, field)
+        return col is not None and df[col].nunique() > 1
+
+    numeric = [f for f in NUMERIC_FEATURES if usable(f) and df[mapping[f]].dtype.kind in 'iuf']
+    flags = [f for f in FLAG_FEATURES if usable(f)]
+    categories = [f for f in CATEGORY_FEATURES if usable(f)]
+    return numeric, flags, categories
+
+
+def stratified_rows(y, max_rows, seed=0):
+    """퇴직/재직 비율을 유지한 최대 max_rows개 행 위치 (정렬됨)"""
+    if len(y) <= max_rows:
+        return np.arange(len(y))
+    rng = np.random.default_rng(seed)
+    fraction = max_rows / len(y)
+    picked = [rng.choice(group, size=max(1, round(len(group) * fraction)), replace=False)
+              for group in (np.flatnonzero(y), np.flatnonzero(~y)) if len(group)]
+    return np.sort(np.concatenate(picked))
+
+
+def fit_attrition_model(df, mapping, max_rows=DEFAULT_MAX_ROWS, seed=0):
+    """퇴직여부 ~ 특성 로지스틱 회귀 (퇴직여부 미매핑이나 한쪽 클래스뿐이면 ValueError)"""
+    import statsmodels.api as sm
+
+    leaver_col = mapped_column(df, mapping, '퇴직여부')
+    if leaver_col is None:
+        raise ValueError("퇴직여부 필드가 매핑되어 있지 않습니다")
+    y = yes_mask(df[leaver_col])
+    if y.all() or not y.any():
+        raise ValueError("퇴직자와 재직자가 모두 있어야 모델을 적합할 수 있습니다")
+
+    numeric, flags, categories = model_fields(df, mapping)
+    rows = stratified_rows(y, max_rows, seed)
+    sample = df.iloc[rows]
+
+    numeric_stats = []
+    for field in numeric:
+        values = sample[mapping[field]].to_numpy(dtype=np.float64, na_value=np.nan)
+        numeric_stats.append((field, float(np.nanmean(values)), float(np.nanstd(values)) or 1.0))
+    category_levels = []
+    for field in categories:
+        counts = sample[mapping[field]].astype(object).value_counts()
+        category_levels.append((field, tuple(counts.index[1:])))   # 최빈 범주가 기준
+
+    columns = (['const'] + numeric + list(flags)
+               + [f"{field}={level}" for field, levels in category_levels for level in levels])
+    X = design_matrix(sample, mapping, numeric_stats, flags, category_levels)
+    result = sm.Logit(y[rows].astype(np.float64), X).fit(disp=0, maxiter=100)
+    return AttritionModel(
+        columns=tuple(columns), numeric=tuple(numeric_stats), flags=tuple(flags), categories=tuple(category_levels),
+        params=np.asarray(result.params), bse=np.asarray(result.bse), pvalues=np.asarray(result.pvalues),
+        n_train=len(rows), n_rows=len(df), pseudo_r2=float(result.prsquared),
+    )
+
+
+def rank_levels(values, counts):
+    """values 내림차순으로 상위 counts[2]명은 고위험, 다음 counts[1]명은 중위험, 나머지는 저위험
+
+    규칙 기반 위험군과 같은 인원으로 나눠 두 방식의 위험군별 실제 퇴직률을 공정하게 비교한다.
+    """
+    order = np.argsort(-values, kind='stable')
+    levels = np.full(len(values), LEVEL_LOW, dtype=np.int8)
+    _, n_medium, n_high = counts
+    levels[order[:n_high]] = LEVEL_HIGH
+    levels[order[n_high:n_high + n_medium]] = LEVEL_MEDIUM
+    return levels
+
+
+def roc_auc(scores, y):
+    """순위 기반 ROC AUC (동점은 평균 순위)"""
+    y = np.asarray(y, dtype=bool)
+    n_pos, n_neg = int(y.sum()), int((~y).sum())
+    if not n_pos or not n_neg:
+        return float('nan')
+    ranks = pd.Series(scores).rank(method='average').to_numpy()
+    return float((ranks[y].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg))
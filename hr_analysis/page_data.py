@@ -0,0 +1,64 @@
+"""대시보드 페이지별 집계 (Streamlit 비의존)
+
+각 함수는 (원본, 파생 프레임, 매핑)만으로 페이지에 필요한 값을 계산하므로, 페이지를 열 때
+바로 호출하거나 precompute 모듈이 업로드 직후 작업자 스레드에서 미리 계산해 캐시에 넣을 수 있다.
+"""
+from hr_analysis.aggregates import department_health, department_keys, home_cube
+from hr_analysis.scoring import EARLY_WARNING, RETENTION_RISK, level_counts, level_means, mapped_column
+
+
+def early_warning_summary(df, derived, mapping):
+    """조기 경보: 위험군 인원, 평균 점수, 부서별 고위험군 비율"""
+    scores = derived[EARLY_WARNING.name]
+    dept_risk = None
+    dept_col = mapped_column(df, mapping, '부서')
+    if dept_col is not None:
+        dept_risk = ((scores >= EARLY_WARNING.bands[1]).groupby(df[dept_col], observed=True).mean() * 100).reset_index()
+        dept_risk.columns = ['부서', '고위험군 비율(%)']
+    return {
+        'total': len(df),
+        'counts': level_counts(derived[f"{EARLY_WARNING.name}_level"].to_numpy()),
+        'mean': float(scores.mean()),
+        'dept_risk': dept_risk,
+    }
+
+
+def retention_summary(df, derived, mapping):
+    """잔류 위험: 위험군 인원, 평균 점수, 위험군별 실제 퇴직률(%), 요인별 평균 점수"""
+    scores = derived[RETENTION_RISK.name]
+    levels = derived[f"{RETENTION_RISK.name}_level"].to_numpy()
+    attrition_by_risk = None
+    if 'is_leaver' in derived.columns:
+        attrition_by_risk = [rate * 100 for rate in level_means(levels, derived['is_leaver'])]
+
+    factors = []
+    if 'is_overtime' in derived.columns:
+        factors.append(('야근', scores[derived['is_overtime']].mean()))
+    sat_col = mapped_column(df, mapping, '업무만족도')
+    if sat_col is not None:
+        factors.append(('낮은 만족도', scores[df[sat_col] <= 2].mean()))
+    promo_col = mapped_column(df, mapping, '마지막승진년수')
+    if promo_col is not None:
+        factors.append(('승진 정체', scores[df[promo_col] >= 3].mean()))
+    return {
+        'total': len(df),
+        'counts': level_counts(levels),
+        'mean': float(scores.mean()),
+        'attrition_by_risk': attrition_by_risk,
+        'factors': factors,
+    }
+
+
+def department_summary(df, derived, mapping, extra_fields=()):
+    """부서(× extra_fields)별 건강도 표"""
+    keys = [department_keys(df, mapping)] + [df[mapping[field]] for field in extra_fields]
+    return department_health(df, derived, mapping, keys)
+
+
+# 업로드 직후 미리 계산하는 집계: 캐시 이름 → 함수(df, derived, mapping)
+PAGE_AGGREGATES = {
+    'home_cube': home_cube,
+    'early_warning': early_warning_summary,
+    'retention_risk': retention_summary,
+    'department_health': department_summary,
+}
@@ -0,0 +1,122 @@
+"""데이터셋을 불러온 직후 페이지 집계를 작업자 스레드에서 미리 계산
+
+(데이터셋 지문, 매핑) 조합마다 한 번 page_data.PAGE_AGGREGATES의 집계를 프로세스 공용
+스레드 풀(코어 수만큼)에 동시에 제출하고, 결과는 페이지 집계 전용 캐시에 넣는다. 파생 프레임,
+모델 등이 들어가는 derived 모듈의 작은 공유 캐시와 분리해 다른 페이지를 열어도 밀려나지 않게 한다.
+페이지는 page_aggregate()로 값을 얻는데, 아직 계산 중이면 같은 작업을 다시 하지 않고 그 결과를 기다리고,
+그래도 캐시에서 밀려났으면 화면 스레드에서 바로 계산하지 않고 풀에 다시 제출한다.
+NumPy/pandas 연산은 대부분 GIL을 풀고 실행되므로 스레드로도 여러 코어를 쓴다.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+
+from hr_analysis.derived import DerivedFrameCache, derived_key, get_cached_aggregate
+from hr_analysis.page_data import PAGE_AGGREGATES
+
+MAX_JOBS = 8
+
+_lock = threading.Lock()
+_aggregate_cache = DerivedFrameCache(max_entries=MAX_JOBS * 16, max_bytes=512 * 1024 ** 2)
+_executor = None
+_jobs = OrderedDict()
+
+
+def _pool():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='hr-precompute')
+        return _executor
+
+
+class PrecomputeJob:
+    """한 (데이터셋, 매핑) 조합의 미리 계산 진행 상황"""
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        self.pending = {}
+        self.errors = {}
+        self.started = time.perf_counter()
+        self.finished = None
+        self._lock = threading.Lock()
+
+    @property
+    def total(self):
+        return len(self.names)
+
+    @property
+    def completed(self):
+        return self.total - len(self.pending)
+
+    @property
+    def done(self):
+        return not self.pending
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def _finish(self, name, future):
+        with self._lock:
+            self.pending.pop(name, None)
+            if future.exception() is not None:
+                self.errors[name] = str(future.exception())
+            if not self.pending:
+                self.finished = time.perf_counter()
+
+    def wait(self, timeout=None):
+        wait(list(self.pending.values()), timeout=timeout)
+        return self.done
+
+    def submit(self, name, fingerprint, mapping, compute, cache):
+        """name 집계를 풀에 제출 (이미 계산 중이면 그 작업)하고 Future 반환"""
+        with self._lock:
+            future = self.pending.get(name)
+            if future is not None:
+                return future
+            if name not in self.names:
+                self.names += (name,)
+            if not self.pending:
+                self.finished = None
+            future = self.pending[name] = _pool().submit(get_cached_aggregate, name, fingerprint, mapping, compute, cache)
+        future.add_done_callback(partial(self._finish, name))
+        return future
+
+
+def start_precompute(df, derived, fingerprint, mapping, tasks=PAGE_AGGREGATES, cache=None):
+    """아직 시작하지 않은 조합이면 모든 집계를 풀에 제출하고 작업 상태 반환"""
+    cache = _aggregate_cache if cache is None else cache
+    key = derived_key(fingerprint, mapping, {})
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None:
+            _jobs.move_to_end(key)
+            return job
+        job = _jobs[key] = PrecomputeJob(tasks)
+        while len(_jobs) > MAX_JOBS:
+            _jobs.popitem(last=False)
+
+    for name, compute in tasks.items():
+        job.submit(name, fingerprint, mapping, partial(compute, df, derived, mapping), cache)
+    return job
+
+
+def page_aggregate(name, fingerprint, mapping, compute, cache=None):
+    """캐시된 집계 (계산 중이면 완료를 기다리고, 캐시에서 밀려났으면 풀에 다시 제출해 기다림)
+
+    미리 계산을 시작하지 않은 조합이거나 작업이 실패했으면 직접 계산한다.
+    """
+    cache = _aggregate_cache if cache is None else cache
+    job = _jobs.get(derived_key(fingerprint, mapping, {}))
+    if job is not None and name not in job.errors:
+        value = cache.get((name,) + derived_key(fingerprint, mapping, {}))
+        if value is not None:
+            return value
+        future = job.submit(name, fingerprint, mapping, compute, cache)
+        if future.exception() is None:
+            return future.result()
+    return get_cached_aggregate(name, fingerprint, mapping, compute, cache)
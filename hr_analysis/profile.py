@@ -0,0 +1,107 @@
+"""컬럼 프로필: 컬럼별 종류, 고유값 수, 결측률, 최솟값/최댓값, 예시 값
+
+컬럼이 수천 개인 파일에서도 컬럼 매핑 화면과 커스텀 차트가 가볍도록 데이터셋마다 한 번 계산해
+공유 캐시에 둔다. 결측률과 최솟값/최댓값은 전체 행에서 타입 블록 단위로 구하고, 고유값 수와
+예시 값은 최대 SAMPLE_ROWS행 표본에서 구한다(범주형 컬럼의 고유값 수는 범주 수).
+"""
+import numpy as np
+import pandas as pd
+
+from hr_analysis.derived import get_cached_aggregate
+
+SAMPLE_ROWS = 10_000
+SAMPLE_VALUES = 5
+DIMENSION_MAX_UNIQUE = 50   # 이하이면 파이 레이블·색상 기준으로 쓸 수 있는 컬럼
+MAX_OPTIONS = 200           # 선택 상자 하나에 보여 줄 최대 후보 수
+
+KIND_LABELS = {'bool': '예/아니오', 'int': '정수', 'float': '실수', 'category': '범주', 'text': '문자', 'datetime': '날짜'}
+NUMERIC_KINDS = ('int', 'float')
+
+# 차트 역할별 허용 조건 (None이면 모든 컬럼)
+CHART_ROLES = {
+    'axis': None,
+    'numeric': lambda profile: profile['kind'].isin(NUMERIC_KINDS),
+    'value': lambda profile: profile['kind'].isin(NUMERIC_KINDS + ('bool',)),
+    'dimension': lambda profile: profile['nunique'] <= DIMENSION_MAX_UNIQUE,
+}
+
+
+def column_kind(series):
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return 'category'
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'bool'
+    if pd.api.types.is_integer_dtype(dtype):
+        return 'int'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'float'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    return 'text'
+
+
+def column_profile(df, sample_rows=SAMPLE_ROWS, seed=0):
+    """컬럼명 인덱스의 프로필 프레임 (kind, dtype, nunique, unique_ratio, null_rate, min, max, samples)"""
+    n = len(df)
+    if n > sample_rows:
+        sample = df.iloc[np.sort(np.random.default_rng(seed).choice(n, sample_rows, replace=False))]
+    else:
+        sample = df
+    numeric = df.select_dtypes(include='number')
+    lo, hi = numeric.min(), numeric.max()
+    counts = df.count().to_numpy()
+
+    rows = []
+    for (col, series), (_, part), count in zip(df.items(), sample.items(), counts):
+        kind = column_kind(series)
+        if kind == 'category':
+            uniques = series.cat.categories
+        else:
+            uniques = part.unique()
+            uniques = uniques[~pd.isna(uniques)]
+        non_null = len(part) - int(part.isna().sum())
+        rows.append({
+            'kind': kind,
+            'dtype': str(series.dtype),
+            'nunique': len(uniques),
+            'unique_ratio': len(uniques) / non_null if non_null else 0.0,
+            'null_rate': 1 - count / n if n else 0.0,
+            'min': lo.get(col, np.nan),
+            'max': hi.get(col, np.nan),
+            'samples': ', '.join(map(str, uniques[:SAMPLE_VALUES])),
+        })
+    return pd.DataFrame(rows, index=pd.Index(df.columns, name='컬럼'))
+
+
+def cached_profile(df, fingerprint, cache=None):
+    """데이터셋마다 한 번만 계산하는 컬럼 프로필 (지문이 없으면 매번 계산)"""
+    if fingerprint is None:
+        return column_profile(df)
+    return get_cached_aggregate('column_profile', fingerprint, {}, lambda: column_profile(df), cache)
+
+
+def column_labels(profile):
+    """선택 상자 표시용 {컬럼: `월급여 · 정수 · 고유 1,349 · 결측 2%`}"""
+    labels = {}
+    for col, kind, nunique, null_rate in zip(profile.index, profile['kind'], profile['nunique'], profile['null_rate']):
+        label = f"{col} · {KIND_LABELS[kind]} · 고유 {nunique:,}"
+        labels[col] = label + f" · 결측 {null_rate:.0%}" if null_rate > 0 else label
+    return labels
+
+
+def filter_columns(columns, query='', limit=MAX_OPTIONS, pinned=()):
+    """이름에 query가 들어간 컬럼 최대 limit개 (pinned는 목록에 없어도 앞에 붙임)"""
+    query = query.strip().lower()
+    matched = [col for col in columns if query in str(col).lower()] if query else list(columns)
+    matched = matched[:limit]
+    extra = [col for col in dict.fromkeys(pinned) if col is not None and col not in matched]
+    return extra + matched
+
+
+def chart_columns(profile, role=None):
+    """차트 역할(CHART_ROLES의 키)에 맞는 컬럼 (원래 순서 유지)"""
+    condition = CHART_ROLES.get(role)
+    if condition is None:
+        return list(profile.index)
+    return list(profile.index[condition(profile).to_numpy()])
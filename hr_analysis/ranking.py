@@ -0,0 +1,46 @@
+"""점수 순위 목록: 부분 선택(top-k)과 서버 측 페이지 계산
+
+고위험군 전체를 정렬하거나 필터링한 복사본을 만들지 않고, 정렬 키 배열에서 요청한 페이지까지의
+상위 k개 위치만 np.partition으로 골라 정렬한다. 같은 값은 원래 행 순서를 따르므로 페이지를
+넘겨도 행이 겹치거나 빠지지 않는다.
+"""
+import numpy as np
+import pandas as pd
+
+
+def sort_keys(series):
+    """정렬용 float64 배열 (문자열/범주는 정렬된 코드, 결측은 NaN)"""
+    if series.dtype.kind in 'biuf':
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    codes, _ = pd.factorize(series, sort=True)
+    keys = codes.astype(np.float64)
+    keys[codes < 0] = np.nan
+    return keys
+
+
+def top_k(keys, k, descending=True):
+    """keys 기준 상위 k개의 위치를 순위 순으로 반환 (NaN은 항상 마지막)"""
+    n = len(keys)
+    k = min(max(k, 0), n)
+    order_keys = np.array(keys, dtype=np.float64)
+    if descending:
+        order_keys = -order_keys
+    order_keys[np.isnan(order_keys)] = np.inf
+    if k < n:
+        kth = np.partition(order_keys, k - 1)[k - 1] if k else -np.inf
+        ahead = np.flatnonzero(order_keys < kth)
+        ties = np.flatnonzero(order_keys == kth)[:k - len(ahead)]
+        chosen = np.concatenate([ahead, ties])
+    else:
+        chosen = np.arange(n)
+    return chosen[np.lexsort((chosen, order_keys[chosen]))]
+
+
+def page_positions(candidates, keys, page, page_size, descending=True):
+    """candidates(행 위치)를 keys(candidates와 같은 길이) 순위로 나열했을 때 page번째(0부터) 페이지의 행 위치"""
+    start = page * page_size
+    return candidates[top_k(keys, start + page_size, descending)[start:]]
+
+
+def page_count(total, page_size):
+    return max(1, -(-total // page_size))
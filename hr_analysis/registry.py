@@ -0,0 +1,119 @@
+"""프로세스 전역 데이터셋 레지스트리
+
+같은 파일(내용 해시)을 연 세션들이 하나의 DataFrame을 공유하도록 서버 프로세스 안에서
+데이터셋을 보관한다. 세션은 acquire()로 참조를 얻고, 참조 수는 세션이 가진 토큰 객체의
+약한 참조로 세므로 브라우저를 닫아 세션 상태가 사라지면 자동으로 줄어든다. 참조가 없는
+데이터셋은 max_idle개까지 최근 사용 순으로 남겨 두고 나머지는 내보낸다(디스크 저장소에는 남음).
+
+공유 프레임은 읽기 전용으로 다뤄야 한다. 점수·커스텀 필드 등 파생 컬럼은 derived 모듈이
+별도 프레임으로 만들므로 원본을 수정하는 코드는 없다.
+"""
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+
+class SessionToken:
+    """세션 상태에 보관하는 참조 표식 (세션이 사라지면 함께 수거됨)"""
+    __slots__ = ('__weakref__',)
+
+
+class _Entry:
+    def __init__(self, df, report):
+        self.df = df
+        self.report = report
+        self.sessions = weakref.WeakSet()
+        self.last_used = time.time()
+        self.nbytes = int(df.memory_usage(deep=True).sum())
+
+
+class DatasetRegistry:
+    """dataset_id → 공유 (DataFrame, IngestReport) 와 세션 참조"""
+
+    def __init__(self, max_idle=2):
+        self.max_idle = max_idle
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+
+    def acquire(self, dataset_id, token, loader):
+        """공유 데이터셋을 반환하고 token의 참조를 등록 (없으면 loader()로 한 번만 로드)
+
+        여러 세션이 동시에 같은 데이터셋을 요청해도 loader는 한 번만 실행된다.
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(dataset_id)
+                if entry is not None:
+                    self.hits += 1
+                    return self._attach(dataset_id, entry, token)
+                event = self._loading.get(dataset_id)
+                if event is None:
+                    event = self._loading[dataset_id] = threading.Event()
+                    break
+            event.wait()
+
+        try:
+            df, report = loader()
+        except BaseException:
+            with self._lock:
+                del self._loading[dataset_id]
+            event.set()
+            raise
+        with self._lock:
+            entry = self._entries[dataset_id] = _Entry(df, report)
+            del self._loading[dataset_id]
+            self.loads += 1
+            result = self._attach(dataset_id, entry, token)
+            self._evict()
+        event.set()
+        return result
+
+    def _attach(self, dataset_id, entry, token):
+        entry.sessions.add(token)
+        entry.last_used = time.time()
+        self._entries.move_to_end(dataset_id)
+        return entry.df, entry.report
+
+    def release(self, dataset_id, token):
+        """token의 참조 해제 (데이터셋을 바꾸거나 닫을 때)"""
+        with self._lock:
+            entry = self._entries.get(dataset_id)
+            if entry is not None:
+                entry.sessions.discard(token)
+            self._evict()
+
+    def _evict(self):
+        idle = [key for key, entry in self._entries.items() if not entry.sessions]
+        for key in idle[:max(len(idle) - self.max_idle, 0)]:
+            del self._entries[key]
+
+    def refcount(self, dataset_id):
+        entry = self._entries.get(dataset_id)
+        return len(entry.sessions) if entry is not None else 0
+
+    def stats(self):
+        """보관 중인 데이터셋별 (id, 행 수, 세션 수, 바이트)"""
+        with self._lock:
+            return [{'id': key, 'rows': len(entry.df), 'sessions': len(entry.sessions), 'bytes': entry.nbytes}
+                    for key, entry in self._entries.items()]
+
+    @property
+    def total_bytes(self):
+        with self._lock:
+            return sum(entry.nbytes for entry in self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_default_registry = DatasetRegistry()
+
+
+def get_registry():
+    """서버 프로세스 전체에서 공유하는 레지스트리"""
+    return _default_registry
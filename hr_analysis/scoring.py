@@ -0,0 +1,207 @@
+"""선언적 규칙 테이블 기반 위험 점수 엔진
+
+조기 경보 점수와 잔류 위험 점수를 매핑된 컬럼에 대해 한 번의 NumPy 벡터 연산으로
+계산한다. 각 컬럼은 한 번만 배열로 변환되고, 두 점수의 규칙이 그 배열을 공유한다.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+YES_VALUES = ('Yes', 'yes', '예', '네')
+
+# 위험군 코드: -1은 점수가 NaN이라 어느 구간에도 속하지 않는 경우
+LEVEL_LOW, LEVEL_MEDIUM, LEVEL_HIGH = 0, 1, 2
+LEVEL_LABELS = ('저위험', '중위험', '고위험')
+
+_COMPARATORS = {
+    'lt': np.less, 'le': np.less_equal, 'eq': np.equal,
+    'ge': np.greater_equal, 'gt': np.greater,
+}
+
+
+@dataclass(frozen=True)
+class Rule:
+    """점수 규칙 한 줄
+
+    kind
+      - 'cases':  (비교연산, 기준값, 점수) 목록 중 처음 만족하는 조건의 점수, 없으면 0
+      - 'flag':   Yes 계열 값이면 points
+      - 'linear': (값 - offset) × weight, cap이 있으면 상한 적용
+    """
+    field: str
+    kind: str
+    points: int = 0
+    cases: tuple = ()
+    offset: float = 0
+    weight: float = 1
+    cap: float = None
+
+
+@dataclass(frozen=True)
+class ScoreSpec:
+    """점수 정의: 결과 컬럼명, 규칙 목록, (중위험, 고위험) 기준점"""
+    name: str
+    rules: tuple
+    bands: tuple
+
+
+EARLY_WARNING = ScoreSpec(
+    name='early_warning_score',
+    rules=(
+        Rule('업무만족도', 'cases', cases=(('le', 2, 40), ('eq', 3, 20))),
+        Rule('야근정도', 'flag', points=30),
+        Rule('마지막승진년수', 'cases', cases=(('ge', 3, 20), ('ge', 2, 10))),
+        Rule('집과의거리', 'cases', cases=(('gt', 20, 10),)),
+    ),
+    bands=(40, 70),
+)
+
+RETENTION_RISK = ScoreSpec(
+    name='retention_risk_score',
+    rules=(
+        Rule('야근정도', 'flag', points=25),
+        Rule('업무만족도', 'linear', offset=5, weight=-10),
+        Rule('업무환경만족도', 'linear', offset=5, weight=-8),
+        Rule('마지막승진년수', 'linear', weight=4, cap=20),
+        Rule('일한회사수', 'linear', weight=2, cap=15),
+    ),
+    bands=(50, 70),
+)
+
+DEFAULT_SPECS = (EARLY_WARNING, RETENTION_RISK)
+
+
+def yes_mask(series):
+    """Yes/예/네 여부를 bool 배열로 반환 (이미 bool로 읽은 컬럼은 그대로, 결측은 False)"""
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series.fillna(False).to_numpy(dtype=bool)
+    return series.isin(YES_VALUES).to_numpy()
+
+
+def _numeric(series):
+    """정수/불리언은 int64, 그 외는 float64 배열로 변환 (작은 정수 dtype 오버플로 방지)"""
+    values = series.to_numpy()
+    if values.dtype.kind in 'biu':
+        return values.astype(np.int64, copy=False)
+    return values.astype(np.float64, copy=False)
+
+
+def mapped_column(df, mapping, field):
+    """표준 필드에 매핑된 실제 컬럼명 (매핑이 없거나 컬럼이 없으면 None)"""
+    col = mapping.get(field)
+    return col if col is not None and col in df.columns else None
+
+
+class _ColumnCache:
+    """한 번의 계산 동안 컬럼 변환 결과를 공유"""
+
+    def __init__(self, df):
+        self.df = df
+        self._numeric = {}
+        self._flags = {}
+
+    def numeric(self, col):
+        if col not in self._numeric:
+            self._numeric[col] = _numeric(self.df[col])
+        return self._numeric[col]
+
+    def flag(self, col):
+        if col not in self._flags:
+            self._flags[col] = yes_mask(self.df[col])
+        return self._flags[col]
+
+
+def _evaluate_rule(rule, values):
+    if rule.kind == 'cases':
+        conditions = [_COMPARATORS[op](values, threshold) for op, threshold, _ in rule.cases]
+        return np.select(conditions, [pts for _, _, pts in rule.cases], default=0)
+    if rule.kind == 'flag':
+        return values.astype(np.int64) * rule.points
+    if rule.kind == 'linear':
+        contribution = (values - rule.offset) * rule.weight
+        if rule.cap is not None:
+            contribution = np.minimum(contribution, rule.cap)
+        return contribution
+    raise ValueError(f"알 수 없는 규칙 종류: {rule.kind}")
+
+
+def _score(spec, df, mapping, cache):
+    scores = np.zeros(len(df), dtype=np.int64)
+    for rule in spec.rules:
+        col = mapped_column(df, mapping, rule.field)
+        if col is None:
+            continue
+        values = cache.flag(col) if rule.kind == 'flag' else cache.numeric(col)
+        scores = scores + _evaluate_rule(rule, values)
+    return scores
+
+
+_OPERATOR_LABELS = {'lt': '<', 'le': '≤', 'eq': '=', 'ge': '≥', 'gt': '>'}
+
+
+def describe_rule(rule):
+    """규칙 한 줄 설명 (예: '업무만족도 ≤2 +40, =3 +20')"""
+    if rule.kind == 'cases':
+        return f"{rule.field} " + ', '.join(f"{_OPERATOR_LABELS[op]}{threshold} +{pts}" for op, threshold, pts in rule.cases)
+    if rule.kind == 'flag':
+        return f"{rule.field} Yes +{rule.points}"
+    base = f"({rule.field} - {rule.offset:g})" if rule.offset else rule.field
+    return f"{base} × {rule.weight:g}" + (f", 최대 {rule.cap:g}" if rule.cap is not None else "")
+
+
+def rule_contributions(df, mapping, spec):
+    """규칙별 점수 기여 (행 × 규칙) float64 행렬, 매핑되지 않은 규칙은 0
+
+    행렬 @ 규칙별 배율로 가중치를 바꾼 점수를 원본을 다시 읽지 않고 계산할 수 있다 (배율이 모두 1이면 원래 점수).
+    """
+    cache = _ColumnCache(df)
+    contributions = np.zeros((len(df), len(spec.rules)))
+    for i, rule in enumerate(spec.rules):
+        col = mapped_column(df, mapping, rule.field)
+        if col is not None:
+            contributions[:, i] = _evaluate_rule(rule, cache.flag(col) if rule.kind == 'flag' else cache.numeric(col))
+    return contributions
+
+
+def bucket(scores, bands):
+    """점수를 위험군 코드(0=저, 1=중, 2=고, NaN은 -1)로 변환"""
+    medium, high = bands
+    levels = np.where(scores >= high, LEVEL_HIGH, np.where(scores >= medium, LEVEL_MEDIUM, LEVEL_LOW))
+    levels = levels.astype(np.int8)
+    if scores.dtype.kind == 'f':
+        levels[np.isnan(scores)] = -1
+    return levels
+
+
+def level_counts(levels):
+    """위험군별 인원 (저, 중, 고)"""
+    counts = np.bincount(levels[levels >= 0], minlength=3)
+    return int(counts[LEVEL_LOW]), int(counts[LEVEL_MEDIUM]), int(counts[LEVEL_HIGH])
+
+
+def level_means(levels, values):
+    """위험군별 values 평균 [저, 중, 고] (인원이 없으면 NaN)"""
+    valid = levels >= 0
+    counts = np.bincount(levels[valid], minlength=3)
+    sums = np.bincount(levels[valid], weights=np.asarray(values, dtype=np.float64)[valid], minlength=3)
+    return list(np.divide(sums, counts, out=np.full(3, np.nan), where=counts > 0))
+
+
+def compute_score(df, mapping, spec):
+    """단일 점수를 pd.Series로 계산"""
+    return pd.Series(_score(spec, df, mapping, _ColumnCache(df)), index=df.index)
+
+
+def score_frame(df, mapping, specs=DEFAULT_SPECS):
+    """여러 점수와 위험군을 한 번에 계산
+
+    반환 컬럼: 각 spec마다 `<name>`(점수)와 `<name>_level`(위험군 코드)
+    """
+    cache = _ColumnCache(df)
+    result = {}
+    for spec in specs:
+        scores = _score(spec, df, mapping, cache)
+        result[spec.name] = scores
+        result[f"{spec.name}_level"] = bucket(scores, spec.bands)
+    return pd.DataFrame(result, index=df.index)
@@ -0,0 +1,219 @@
+"""날짜별 스냅샷 시계열과 변경분(delta) 적재
+
+월별 HR 내보내기 파일을 날짜를 붙여 한 시계열에 차례로 추가하고, 스냅샷마다 부서별
+부분 집계(인원, 퇴직자, 만족도/근속 합계, 위험 점수 합계와 고위험 인원)를 trend 표에 덧붙인다.
+
+새 스냅샷은 직원ID로 직전 스냅샷과 맞춰 행 해시를 비교하고, 바뀌었거나 새로 생긴 직원만
+점수를 계산한다. 집계는 직전 스냅샷의 집계에서 사라졌거나 바뀐 직원의 이전 기여분을 빼고
+새 기여분을 더해 구하므로, 과거 스냅샷은 다시 읽지 않는다. 몇 번째 스냅샷이든 비용은
+직전 스냅샷 크기와 변경 행 수에만 비례한다.
+
+    <root>/<이름>/latest.arrow   직전 스냅샷 원본 + 행 해시
+    <root>/<이름>/trend.arrow    (날짜, 부서)별 부분 집계
+    <root>/<이름>/meta.json      매핑, 스냅샷별 변경 통계
+"""
+import json
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from hr_analysis.aggregates import department_keys, department_partials, finalize_department_health, merge_partials
+from hr_analysis.derived import build_derived_frame
+from hr_analysis.mapping import auto_map
+from hr_analysis.scoring import DEFAULT_SPECS, LEVEL_HIGH, mapped_column
+from hr_analysis.store import DEFAULT_ROOT
+
+DEFAULT_SERIES_ROOT = os.path.join(DEFAULT_ROOT, 'series')
+ALL_DEPARTMENTS_LABEL = '전체'
+
+_HASH_COLUMN = '__row_hash'
+_INVALID_NAME = re.compile(r'[\\/:*?"<>|]')
+
+
+def row_hashes(df):
+    """행 내용의 64비트 해시 (인덱스 제외)"""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def conform_to(df, previous):
+    """df를 직전 스냅샷과 같은 컬럼 순서와 dtype으로 맞춤 (컬럼 구성이 다르면 None)
+
+    read_typed_csv는 달마다 값 범위에 맞춰 정수 폭을 줄이므로 같은 값도 dtype이 달라질 수 있다.
+    값을 잃지 않고 바꿀 수 있는 컬럼만 직전 dtype으로 바꾸고, 나머지는 그대로 둔다.
+    """
+    if len(df.columns) != len(previous.columns) or set(df.columns) != set(previous.columns):
+        return None
+    df = df[list(previous.columns)]
+    columns = {}
+    for col, dtype in previous.dtypes.items():
+        series = df[col]
+        if series.dtype == dtype:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype):
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                columns[col] = series.astype('category')
+            continue
+        try:
+            cast = series.astype(dtype)
+        except (TypeError, ValueError):
+            continue
+        if cast.astype(object).equals(series.astype(object)):
+            columns[col] = cast
+    return df.assign(**columns) if columns else df
+
+
+def snapshot_partials(df, mapping):
+    """부서별 합산 가능한 집계 (부서 건강도 + 점수별 합계/고위험 인원)"""
+    derived = build_derived_frame(df, mapping, {})
+    keys = department_keys(df, mapping)
+    partials = department_partials(df, derived, mapping, keys).drop(columns='first_row')
+    scores = {}
+    for spec in DEFAULT_SPECS:
+        scores[f"{spec.name}_sum"] = derived[spec.name].to_numpy(dtype=np.float64)
+        scores[f"{spec.name}_high"] = (derived[f"{spec.name}_level"].to_numpy() == LEVEL_HIGH).astype(np.int64)
+    scores = pd.DataFrame(scores, index=df.index).groupby(keys, observed=True, sort=False).sum()
+    return partials.join(scores)
+
+
+def _write_arrow(path, df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path + '.tmp', 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(path + '.tmp', path)
+
+
+def _read_arrow(path):
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all().to_pandas(split_blocks=True)
+
+
+class SnapshotSeries:
+    """이름 하나에 해당하는 스냅샷 시계열"""
+
+    def __init__(self, name, root=DEFAULT_SERIES_ROOT):
+        # 이름이 그대로 폴더 이름이 되므로 경로 구분자나 '..'로 root 밖을 가리키지 못하게 한다
+        if not name or name.strip('. ') == '' or _INVALID_NAME.search(name):
+            raise ValueError(f"시계열 이름에는 \\ / : * ? \" < > | 를 쓸 수 없고 점만으로 지을 수 없습니다: {name!r}")
+        self.name = name
+        self.path = os.path.join(root, name)
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    @property
+    def meta(self):
+        if not os.path.exists(self._file('meta.json')):
+            return {'name': self.name, 'mapping': None, 'snapshots': []}
+        with open(self._file('meta.json'), encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_meta(self, meta):
+        with open(self._file('meta.json') + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(self._file('meta.json') + '.tmp', self._file('meta.json'))
+
+    @property
+    def dates(self):
+        return [snapshot['date'] for snapshot in self.meta['snapshots']]
+
+    def add(self, df, date, mapping=None):
+        """date(YYYY-MM-DD) 스냅샷 추가 후 변경 통계 반환
+
+        날짜는 직전 스냅샷보다 뒤여야 한다. 행 해시를 구하기 전에 컬럼 순서와 dtype을 직전 스냅샷에
+        맞추고(conform_to), 컬럼 구성이 직전 스냅샷과 다르면 전체를 새로 집계한다.
+        """
+        started = time.perf_counter()
+        date = str(pd.Timestamp(date).date())
+        meta = self.meta
+        if meta['snapshots'] and date <= meta['snapshots'][-1]['date']:
+            raise ValueError(f"{meta['snapshots'][-1]['date']} 이후 날짜만 추가할 수 있습니다: {date}")
+        mapping = meta['mapping'] or mapping or auto_map(df.columns)
+        id_col = mapped_column(df, mapping, '직원ID')
+        if id_col is None:
+            raise ValueError("스냅샷에는 직원ID 컬럼이 필요합니다")
+        if df[id_col].duplicated().any():
+            raise ValueError(f"직원ID가 중복된 행이 있습니다 ({int(df[id_col].duplicated().sum()):,}행)")
+
+        df = df.reset_index(drop=True)
+        previous = _read_arrow(self._file('latest.arrow')) if meta['snapshots'] else None
+        conformed = None if previous is None else conform_to(df, previous.drop(columns=_HASH_COLUMN))
+        if conformed is not None:
+            df = conformed
+        hashes = row_hashes(df)
+
+        if conformed is None:
+            partials = snapshot_partials(df, mapping)
+            stats = {'added': len(df), 'changed': 0, 'removed': 0 if previous is None else len(previous)}
+        else:
+            previous_hashes = previous[_HASH_COLUMN].to_numpy()
+            previous = previous.drop(columns=_HASH_COLUMN)
+            matched = pd.Index(previous[id_col]).get_indexer(df[id_col])
+            unchanged = np.zeros(len(df), dtype=bool)
+            found = matched >= 0
+            unchanged[found] = previous_hashes[matched[found]] == hashes[found]
+            outdated = np.ones(len(previous), dtype=bool)
+            outdated[matched[unchanged]] = False
+
+            trend = _read_arrow(self._file('trend.arrow'))
+            last = trend[trend['date'] == meta['snapshots'][-1]['date']].drop(columns='date').set_index('부서')
+            partials = merge_partials(last, -snapshot_partials(previous[outdated], mapping))
+            partials = merge_partials(partials, snapshot_partials(df[~unchanged], mapping))
+            partials = partials[partials['n'] > 0]
+            stats = {'added': int((~found).sum()), 'changed': int((found & ~unchanged).sum()),
+                     'removed': int(len(previous) - found.sum())}
+
+        os.makedirs(self.path, exist_ok=True)
+        _write_arrow(self._file('latest.arrow'), df.assign(**{_HASH_COLUMN: hashes}))
+        rows = partials.rename_axis('부서').reset_index().assign(date=date)
+        if meta['snapshots']:
+            rows = pd.concat([_read_arrow(self._file('trend.arrow')), rows], ignore_index=True)
+        _write_arrow(self._file('trend.arrow'), rows)
+
+        stats.update(date=date, rows=len(df), seconds=round(time.perf_counter() - started, 3))
+        meta['mapping'] = mapping
+        meta['snapshots'].append(stats)
+        self._save_meta(meta)
+        return stats
+
+    def partials(self):
+        """(날짜, 부서)별 부분 집계"""
+        if not self.dates:
+            return None
+        return _read_arrow(self._file('trend.arrow'))
+
+    def trend(self, by_department=True):
+        """날짜(와 부서)별 인원, 퇴직률, 건강도 지표, 평균 위험 점수, 고위험 비율(%)"""
+        partials = self.partials()
+        if partials is None:
+            return pd.DataFrame()
+        if not by_department:
+            partials = partials.drop(columns='부서').groupby('date', sort=False).sum().reset_index()
+            partials['부서'] = ALL_DEPARTMENTS_LABEL
+        tables = []
+        for date, group in partials.groupby('date', sort=True):
+            group = group.drop(columns='date').set_index('부서').sort_index()
+            health = finalize_department_health(group.assign(first_row=np.arange(len(group))))
+            for spec in DEFAULT_SPECS:
+                health[f"{spec.name}_mean"] = (group[f"{spec.name}_sum"] / group['n']).to_numpy()
+                health[f"{spec.name}_high_pct"] = (group[f"{spec.name}_high"] / group['n'] * 100).to_numpy()
+            tables.append(health.assign(date=date))
+        trend = pd.concat(tables, ignore_index=True)
+        return trend[['date'] + [col for col in trend.columns if col != 'date']]
+
+    def delete(self):
+        for name in ('latest.arrow', 'trend.arrow', 'meta.json'):
+            if os.path.exists(self._file(name)):
+                os.remove(self._file(name))
+        if os.path.isdir(self.path) and not os.listdir(self.path):
+            os.rmdir(self.path)
+
+
+def list_series(root=DEFAULT_SERIES_ROOT):
+    """저장된 시계열 이름 목록"""
+    if not os.path.isdir(root):
+        return []
+    return sorted(name for name in os.listdir(root) if os.path.exists(os.path.join(root, name, 'meta.json')))
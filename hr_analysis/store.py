@@ -0,0 +1,95 @@
+"""업로드 데이터셋의 컬럼형(Arrow IPC) 로컬 저장소
+
+업로드된 CSV는 내용 해시를 키로 한 번만 파싱해 Arrow IPC 파일로 저장한다.
+다시 열 때는 파일을 메모리 맵으로 읽으므로 CSV 재파싱이 없고, 결측 없는 수치 컬럼은
+복사 없이 그대로 DataFrame이 된다.
+"""
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict
+
+import pyarrow as pa
+
+from hr_analysis.ingest import IngestReport
+
+DEFAULT_ROOT = os.environ.get(
+    'HR_DATASET_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.hr_datasets'),
+)
+
+_BLOCK_SIZE = 1024 * 1024
+
+
+def content_hash(file):
+    """파일 내용의 SHA-256 (파일 객체는 읽은 뒤 처음 위치로 되돌림)"""
+    digest = hashlib.sha256()
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as f:
+            for block in iter(lambda: f.read(_BLOCK_SIZE), b''):
+                digest.update(block)
+    else:
+        file.seek(0)
+        for block in iter(lambda: file.read(_BLOCK_SIZE), b''):
+            digest.update(block)
+        file.seek(0)
+    return digest.hexdigest()
+
+
+class DatasetStore:
+    """내용 해시별 `<id>.arrow` 데이터 파일과 `<id>.json` 메타데이터"""
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+
+    def _data_path(self, dataset_id):
+        return os.path.join(self.root, f"{dataset_id}.arrow")
+
+    def _meta_path(self, dataset_id):
+        return os.path.join(self.root, f"{dataset_id}.json")
+
+    def __contains__(self, dataset_id):
+        return os.path.exists(self._data_path(dataset_id)) and os.path.exists(self._meta_path(dataset_id))
+
+    def save(self, dataset_id, df, name, report=None):
+        """임시 파일에 쓴 뒤 교체하므로 중간에 실패해도 깨진 파일이 남지 않음"""
+        os.makedirs(self.root, exist_ok=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        tmp_path = self._data_path(dataset_id) + '.tmp'
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, self._data_path(dataset_id))
+
+        meta = {
+            'id': dataset_id, 'name': name, 'rows': len(df), 'columns': len(df.columns),
+            'created': time.time(), 'report': asdict(report) if report is not None else None,
+        }
+        with open(self._meta_path(dataset_id), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    def load(self, dataset_id):
+        """메모리 맵으로 읽어 (DataFrame, IngestReport | None) 반환"""
+        source = pa.memory_map(self._data_path(dataset_id), 'r')
+        table = pa.ipc.open_file(source).read_all()
+        df = table.to_pandas(split_blocks=True)
+        report = self.metadata(dataset_id).get('report')
+        return df, IngestReport(**report) if report else None
+
+    def metadata(self, dataset_id):
+        with open(self._meta_path(dataset_id), encoding='utf-8') as f:
+            return json.load(f)
+
+    def list(self):
+        """저장된 데이터셋 메타데이터 (최근 저장 순)"""
+        if not os.path.isdir(self.root):
+            return []
+        metas = [self.metadata(name[:-len('.json')]) for name in os.listdir(self.root)
+                 if name.endswith('.json') and name[:-len('.json')] in self]
+        return sorted(metas, key=lambda meta: meta['created'], reverse=True)
+
+    def delete(self, dataset_id):
+        for path in (self._data_path(dataset_id), self._meta_path(dataset_id)):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,142 @@
+"""메모리에 다 올라가지 않는 CSV를 위한 청크 단위 집계
+
+파일을 고정 크기 청크로 읽으면서 화면에 필요한 집계(부서별 합계, 점수 히스토그램,
+홈 화면 큐브, 위험 상위 N명)만 누적한다. 보관하는 데이터 크기는
+파일 크기가 아니라 부서 수·점수 구간 수·N에 비례하므로 최대 메모리가 일정하다.
+"""
+import numpy as np
+import pandas as pd
+
+from hr_analysis.aggregates import (department_keys, department_partials, finalize_department_health, home_cube,
+                                    merge_partials)
+from hr_analysis.derived import build_derived_frame
+from hr_analysis.ingest import infer_schema
+from hr_analysis.mapping import auto_map
+from hr_analysis.ranking import top_k
+from hr_analysis.scoring import DEFAULT_SPECS, RETENTION_RISK, mapped_column
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+class StreamingSummary:
+    """청크마다 update()로 갱신되는 대시보드 집계"""
+
+    def __init__(self, mapping, top_n=100):
+        self.mapping = mapping
+        self.top_n = top_n
+        self.rows = 0
+        self.chunks = 0
+        self.columns = []
+        self.has_departments = False
+        self.departments = None   # 부서별 department_partials
+        self.score_hist = {}      # 점수명 → (부서, 점수)별 인원/퇴직자
+        self.home_cube = None     # 홈 화면 큐브 (aggregates.home_cube)
+        self.factors = {}         # 잔류 위험 요인 → [점수 합계, 건수]
+        self.top_rows = {}        # 점수명 → 점수 상위 N명
+
+    # --- 누적 ---
+    def update(self, chunk):
+        mapping = self.mapping
+        if not self.chunks:
+            self.columns = list(chunk.columns)
+        derived = build_derived_frame(chunk, mapping, {})
+        self.has_departments = mapped_column(chunk, mapping, '부서') is not None
+        keys = department_keys(chunk, mapping)
+
+        self.departments = merge_partials(
+            self.departments, department_partials(chunk, derived, mapping, keys, row_offset=self.rows))
+
+        for spec in DEFAULT_SPECS:
+            scores = derived[spec.name]
+            parts = pd.DataFrame({'n': 1, 'leavers': derived.get('is_leaver', False)}, index=chunk.index).astype('int64')
+            hist = parts.groupby([keys, scores.rename('score')]).sum()
+            self.score_hist[spec.name] = merge_partials(self.score_hist.get(spec.name), hist)
+            self._update_top_rows(spec, chunk, scores)
+
+        self.home_cube = merge_partials(self.home_cube, home_cube(chunk, derived, mapping))
+
+        scores = derived[RETENTION_RISK.name]
+        factor_masks = {}
+        if 'is_overtime' in derived.columns: factor_masks['야근'] = derived['is_overtime']
+        sat_col = mapped_column(chunk, mapping, '업무만족도')
+        if sat_col is not None: factor_masks['낮은 만족도'] = chunk[sat_col] <= 2
+        promo_col = mapped_column(chunk, mapping, '마지막승진년수')
+        if promo_col is not None: factor_masks['승진 정체'] = chunk[promo_col] >= 3
+        for name, mask in factor_masks.items():
+            total = self.factors.setdefault(name, [0.0, 0])
+            total[0] += scores[mask].sum()
+            total[1] += int(scores[mask].count())
+
+        self.rows += len(chunk)
+        self.chunks += 1
+
+    def _update_top_rows(self, spec, chunk, scores):
+        display_cols = [col for col in [self.mapping.get('직원ID'), self.mapping.get('부서'),
+                                        self.mapping.get('업무만족도'), self.mapping.get('야근정도')]
+                        if col in chunk.columns]
+        # 청크에서도 상위 N명만 골라 합치므로 고위험군 전체를 복사하지 않음
+        high = np.flatnonzero(scores.to_numpy() >= spec.bands[1])
+        rows = high[top_k(scores.to_numpy(dtype=np.float64)[high], self.top_n)]
+        candidates = chunk.iloc[rows][display_cols].assign(**{spec.name: scores.to_numpy()[rows]})
+        current = self.top_rows.get(spec.name)
+        if current is not None:
+            candidates = pd.concat([current, candidates], ignore_index=True)
+        self.top_rows[spec.name] = candidates.nlargest(self.top_n, spec.name).reset_index(drop=True)
+
+    # --- 조회 ---
+    def departments_list(self):
+        return sorted(self.departments.index) if self.has_departments else []
+
+    def score_distribution(self, spec):
+        """점수값별 인원/퇴직자 (부서 합산)"""
+        return self.score_hist[spec.name].groupby(level='score').sum().sort_index()
+
+    def level_counts(self, spec):
+        """(저, 중, 고) 위험군 인원"""
+        dist = self.score_distribution(spec)['n']
+        medium, high = spec.bands
+        return (int(dist[dist.index < medium].sum()),
+                int(dist[(dist.index >= medium) & (dist.index < high)].sum()),
+                int(dist[dist.index >= high].sum()))
+
+    def mean_score(self, spec):
+        dist = self.score_distribution(spec)['n']
+        return float((dist.index.to_numpy() * dist.to_numpy()).sum() / dist.sum()) if dist.sum() else float('nan')
+
+    def attrition_by_level(self, spec):
+        """위험군(저, 중, 고)별 실제 퇴직률(%)"""
+        dist = self.score_distribution(spec)
+        medium, high = spec.bands
+        masks = [dist.index < medium, (dist.index >= medium) & (dist.index < high), dist.index >= high]
+        return [dist.loc[m, 'leavers'].sum() / dist.loc[m, 'n'].sum() * 100 if dist.loc[m, 'n'].sum() else float('nan')
+                for m in masks]
+
+    def department_high_risk(self, spec):
+        """부서별 고위험군 비율(%)"""
+        hist = self.score_hist[spec.name]
+        high = hist[hist.index.get_level_values('score') >= spec.bands[1]]['n'].groupby(level=0).sum()
+        total = self.departments['n']
+        ratio = (high.reindex(total.index, fill_value=0) / total * 100).sort_index()
+        return pd.DataFrame({'부서': ratio.index, '고위험군 비율(%)': ratio.to_numpy()})
+
+    def factor_means(self):
+        return [(name, total / count if count else float('nan')) for name, (total, count) in self.factors.items()]
+
+    def department_health(self):
+        return finalize_department_health(self.departments)
+
+
+def summarize_csv(file, mapping=None, chunk_rows=DEFAULT_CHUNK_ROWS, top_n=100, on_progress=None, **read_kwargs):
+    """CSV를 청크 단위로 읽어 StreamingSummary 생성 (on_progress(처리 행 수) 콜백 지원)"""
+    header = pd.read_csv(file, nrows=0, **read_kwargs)
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    mapping = mapping or auto_map(header.columns)
+    dtypes = {col: 'category' for col, kind in infer_schema(header.columns).items() if kind in ('category', 'yes_no')}
+
+    summary = StreamingSummary(mapping, top_n=top_n)
+    for chunk in pd.read_csv(file, dtype=dtypes, chunksize=chunk_rows, **read_kwargs):
+        summary.update(chunk)
+        if on_progress is not None:
+            on_progress(summary.rows)
+    return summary
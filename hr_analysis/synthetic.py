@@ -0,0 +1,202 @@
+"""HR Data.csv와 같은 스키마의 합성 데이터 생성기
+
+원본의 컬럼별 주변분포(경험적 분포)와 컬럼 간 순위 상관을 가우시안 코퓰라로 학습해
+임의 크기의 데이터를 만든다. 범주형 컬럼은 빈도순으로 정렬한 구간의 정규 점수로 상관에
+참여하므로 퇴직여부-야근정도 같은 이진 연관은 유지되고, 다범주 명목형 간 연관은 근사된다.
+근속연수 ≤ 나이 - 18은 상한 대비 비율로 학습·생성해 항상 만족하고, 현재역할년수 ≤ 근속연수
+같은 나머지 제약은 생성 후 상한으로 자른다.
+
+    python -m hr_analysis.synthetic --rows 1000000 -o hr_1m.csv
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SOURCE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'HR Data.csv')
+DEFAULT_CHUNK_ROWS = 1_000_000
+ID_COLUMN = '직원ID'
+
+# 이 값보다 고유값이 많은 정수 컬럼은 분위수 사이를 보간해 원본에 없던 값도 생성 (월급여 등)
+_CONTINUOUS_MIN_UNIQUE = 50
+
+# (컬럼, 상한 컬럼, 상한에서 뺄 값): 컬럼 = round(비율 × (상한 컬럼 - 값))
+_BOUNDED = (
+    ('근속연수', '나이', 18),
+)
+# (컬럼, 상한 컬럼): 생성 후 컬럼 = min(컬럼, 상한 컬럼)
+_CLIPPED = (
+    ('현재역할년수', '근속연수'),
+    ('마지막승진년수', '근속연수'),
+)
+
+
+class SyntheticHR:
+    """fit(df)로 분포를 학습하고 sample(n)으로 같은 스키마의 DataFrame 생성"""
+
+    def __init__(self, calibration_rows=50_000, calibration_rounds=6):
+        self.calibration_rows = calibration_rows
+        self.calibration_rounds = calibration_rounds
+        self.columns = []
+        self.target_corr = None
+        self._marginals = {}
+        self._names = []
+        self._bounded = []
+        self._dtypes = {}
+        self._cholesky = None
+
+    def fit(self, df):
+        self.columns = list(df.columns)
+        self._dtypes = df.dtypes.to_dict()
+        self._bounded = [(col, base, gap) for col, base, gap in _BOUNDED
+                         if col in df.columns and base in df.columns and (df[col] <= df[base] - gap).all()]
+        if self._bounded:
+            df = df.copy()
+            for col, base, gap in reversed(self._bounded):
+                limit = (df[base] - gap).to_numpy(dtype=float)
+                df[col] = np.divide(df[col].to_numpy(dtype=float), limit, out=np.zeros(len(df)), where=limit > 0)
+        for col in self.columns:
+            if col == ID_COLUMN:
+                continue
+            series = df[col]
+            if series.dtype.kind in 'iuf':
+                values = np.sort(series.dropna().to_numpy())
+                self._marginals[col] = ('numeric', values, series.nunique() > _CONTINUOUS_MIN_UNIQUE, series.dtype)
+            else:
+                freq = series.value_counts(normalize=True)
+                self._marginals[col] = ('category', freq.index.to_numpy(dtype=object), freq.cumsum().to_numpy())
+        # 상수 컬럼은 상관 계산에서 제외 (항상 같은 값)
+        self._names = [col for col in self._marginals if df[col].nunique() > 1]
+
+        # 이산 컬럼은 관측 점수의 상관이 잠재 상관보다 작게 나오므로, 합성 데이터의 관측 상관이
+        # 원본과 같아지도록 잠재 상관행렬을 반복 보정 (NORTA 방식)
+        self.target_corr = _score_corr(df, self._names)
+        latent = self.target_corr
+        for i in range(self.calibration_rounds):
+            self._cholesky = np.linalg.cholesky(latent)
+            simulated = _score_corr(self._sample_raw(self.calibration_rows, np.random.default_rng(10_000 + i)), self._names)
+            latent = _nearest_correlation(latent + (self.target_corr - simulated))
+        self._cholesky = np.linalg.cholesky(latent)
+        return self
+
+    def _sample_raw(self, n, rng):
+        latent = rng.standard_normal((n, len(self._names))) @ self._cholesky.T
+        uniform = _normal_cdf(latent)
+        data = {col: self._inverse(col, uniform[:, i]) for i, col in enumerate(self._names)}
+        for col in self._marginals:
+            if col not in data:
+                data[col] = self._inverse(col, np.full(n, 0.5))
+        return data
+
+    def sample(self, n, seed=0, id_start=1):
+        data = self._sample_raw(n, np.random.default_rng(seed))
+        if ID_COLUMN in self.columns:
+            data[ID_COLUMN] = np.arange(id_start, id_start + n)
+        for col, base, gap in self._bounded:
+            limit = np.maximum(data[base] - gap, 0)
+            data[col] = np.round(data[col] * limit).astype(self._dtypes[col])
+        for col, base in _CLIPPED:
+            if col in data and base in data:
+                data[col] = np.minimum(data[col], data[base])
+        return pd.DataFrame({col: data[col] for col in self.columns})
+
+    def _inverse(self, col, u):
+        marginal = self._marginals[col]
+        if marginal[0] == 'category':
+            _, categories, cum = marginal
+            return categories[np.minimum(np.searchsorted(cum, u), len(categories) - 1)]
+        _, values, continuous, dtype = marginal
+        if continuous:
+            result = np.interp(u * (len(values) - 1), np.arange(len(values)), values)
+        else:
+            result = values[np.minimum((u * len(values)).astype(np.int64), len(values) - 1)]
+        return np.round(result).astype(dtype) if dtype.kind in 'iu' else result.astype(dtype)
+
+    def write_csv(self, path, n, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """n행을 chunk_rows씩 생성해 CSV로 쓰기 (메모리는 청크 크기에 비례)"""
+        written = 0
+        for i, start in enumerate(range(0, n, chunk_rows)):
+            rows = min(chunk_rows, n - start)
+            chunk = self.sample(rows, seed=seed + i, id_start=start + 1)
+            chunk.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+            written += rows
+        return written
+
+
+def _score_corr(data, names):
+    """컬럼별 정규 점수(순위 기반, 범주는 빈도순 구간의 중앙)의 상관행렬"""
+    scores = []
+    for col in names:
+        series = pd.Series(data[col])
+        if series.dtype.kind in 'iuf':
+            ranks = series.rank(method='average').to_numpy()
+        else:
+            freq = series.value_counts(normalize=True)
+            mid = dict(zip(freq.index, freq.cumsum().to_numpy() - freq.to_numpy() / 2))
+            ranks = series.map(mid).to_numpy(dtype=float) * len(series)
+        scores.append(_normal_ppf(ranks / (len(series) + 1)))
+    return np.corrcoef(np.column_stack(scores), rowvar=False)
+
+
+def _normal_ppf(p):
+    """표준정규 분위수 함수 (Acklam 유리함수 근사, 상대오차 1.2e-9)"""
+    a = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+         1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+    b = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+         6.680131188771972e+01, -1.328068155288572e+01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+         -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00)
+    p = np.clip(np.asarray(p, dtype=float), 1e-12, 1 - 1e-12)
+    q = np.minimum(p, 1 - p)
+    tail = q < 0.02425
+    result = np.empty_like(p)
+
+    r = np.sqrt(-2 * np.log(q[tail]))
+    result[tail] = (((((c[0] * r + c[1]) * r + c[2]) * r + c[3]) * r + c[4]) * r + c[5]) / \
+                   ((((d[0] * r + d[1]) * r + d[2]) * r + d[3]) * r + 1)
+    result[tail] *= np.where(p[tail] < 0.5, 1, -1)
+
+    x = p[~tail] - 0.5
+    r = x * x
+    result[~tail] = (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * x / \
+                    (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1)
+    return result
+
+
+def _normal_cdf(z):
+    """표준정규 누적분포 (Abramowitz-Stegun 7.1.26 erf 근사, 오차 1.5e-7)"""
+    x = np.abs(z) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1 - poly * np.exp(-x * x)
+    return 0.5 * (1 + np.sign(z) * erf)
+
+
+def _nearest_correlation(corr):
+    """음의 고유값을 잘라 양의 정부호 상관행렬로 보정"""
+    values, vectors = np.linalg.eigh((corr + corr.T) / 2)
+    fixed = vectors @ np.diag(np.clip(values, 1e-6, None)) @ vectors.T
+    scale = np.sqrt(np.diag(fixed))
+    return fixed / np.outer(scale, scale)
+
+
+def load_generator(source=DEFAULT_SOURCE):
+    """원본 CSV로 학습한 생성기"""
+    return SyntheticHR().fit(pd.read_csv(source))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m hr_analysis.synthetic', description='HR Data.csv 스키마의 합성 데이터 생성')
+    parser.add_argument('--rows', type=int, required=True)
+    parser.add_argument('-o', '--output', required=True)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--source', default=DEFAULT_SOURCE, help='분포를 학습할 원본 CSV')
+    args = parser.parse_args(argv)
+    written = load_generator(args.source).write_csv(args.output, args.rows, seed=args.seed)
+    print(f"{written:,}행 → {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""위험 점수 기준점(cut-off) 검증
+
+점수 ≥ 기준점인 직원을 위험으로 볼 때의 TP/FP/FN/TN을 모든 기준점에 대해 한 번에 구한다.
+점수를 resolution 단위로 반올림해 값별 퇴직자/재직자 수를 bincount로 세고, 점수 내림차순
+누적합을 취하면 각 기준점의 혼동행렬이 되므로 행 수와 무관하게 곡선 계산은 고유 점수 개수에 비례한다.
+대용량 모드처럼 점수별 인원/퇴직자 히스토그램만 있는 경우에도 threshold_sweep을 그대로 쓸 수 있다.
+"""
+import numpy as np
+import pandas as pd
+
+DEFAULT_RESOLUTION = 0.1
+
+
+def count_by_value(scores, y, resolution=DEFAULT_RESOLUTION):
+    """(고유 점수, 퇴직자 수, 재직자 수): 점수는 resolution 단위로 반올림, NaN 점수는 제외"""
+    scores = np.asarray(scores, dtype=np.float64)
+    y = np.asarray(y, dtype=bool)
+    valid = ~np.isnan(scores)
+    keys = np.round(scores[valid] / resolution).astype(np.int64)
+    y = y[valid]
+    if not len(keys):
+        return np.empty(0), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    low = keys.min()
+    span = int(keys.max() - low) + 1
+    if span <= max(4 * len(keys), 1 << 16):
+        totals = np.bincount(keys - low, minlength=span)
+        positives = np.bincount(keys - low, weights=y, minlength=span).astype(np.int64)
+        present = np.flatnonzero(totals)
+        return (present + low) * resolution, positives[present], totals[present] - positives[present]
+    values, inverse = np.unique(keys, return_inverse=True)
+    totals = np.bincount(inverse)
+    positives = np.bincount(inverse, weights=y).astype(np.int64)
+    return values * resolution, positives, totals - positives
+
+
+def threshold_sweep(values, positives, negatives):
+    """기준점(내림차순)별 혼동행렬과 TPR/FPR/정밀도/재현율/F1/대상 비율"""
+    order = np.argsort(values)[::-1]
+    tp = np.cumsum(np.asarray(positives)[order])
+    fp = np.cumsum(np.asarray(negatives)[order])
+    n_pos, n_neg = (tp[-1], fp[-1]) if len(tp) else (0, 0)
+    sweep = pd.DataFrame({'threshold': np.asarray(values, dtype=np.float64)[order], 'tp': tp, 'fp': fp,
+                          'fn': n_pos - tp, 'tn': n_neg - fp})
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sweep['tpr'] = tp / n_pos if n_pos else np.nan
+        sweep['fpr'] = fp / n_neg if n_neg else np.nan
+        sweep['precision'] = tp / (tp + fp)
+        sweep['f1'] = 2 * sweep['precision'] * sweep['tpr'] / (sweep['precision'] + sweep['tpr'])
+    sweep['flagged_pct'] = (tp + fp) / max(n_pos + n_neg, 1) * 100
+    sweep['youden'] = sweep['tpr'] - sweep['fpr']
+    return sweep
+
+
+def roc_auc_from_sweep(sweep):
+    """ROC 곡선 아래 면적 (동점 점수는 사다리꼴, 즉 평균 순위와 같음)"""
+    return float(np.trapezoid(np.r_[0, sweep['tpr']], np.r_[0, sweep['fpr']]))
+
+
+def average_precision(sweep):
+    """재현율 증가분 × 정밀도의 합 (PR 곡선 요약)"""
+    recall = np.r_[0, sweep['tpr']]
+    return float(np.nansum(np.diff(recall) * sweep['precision'].to_numpy()))
+
+
+def at_threshold(sweep, threshold):
+    """점수 ≥ threshold를 위험으로 볼 때의 지표 행 (해당 직원이 없으면 None)"""
+    flagged = sweep[sweep['threshold'] >= threshold - 1e-9]
+    return flagged.iloc[-1] if len(flagged) else None
+
+
+def recommended_cutoffs(sweep):
+    """{'F1 최대': 행, 'Youden J 최대': 행}"""
+    result = {}
+    for label, column in (('F1 최대', 'f1'), ('Youden J 최대', 'youden')):
+        if sweep[column].notna().any():
+            result[label] = sweep.loc[sweep[column].idxmax()]
+    return result
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SAMPLE_CSV = os.path.join(ROOT, 'HR Data.csv')
+
+
+@pytest.fixture(scope='session')
+def sample_frame():
+    """저장소에 들어 있는 샘플 데이터 앞 200행 (타입 지정 로드)"""
+    import io
+
+    from hr_analysis.ingest import read_typed_csv
+
+    with open(SAMPLE_CSV, 'rb') as f:
+        head = b''.join(f.readline() for _ in range(201))
+    df, _ = read_typed_csv(io.BytesIO(head))
+    return df
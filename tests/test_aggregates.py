@@ -0,0 +1,20 @@
+import warnings
+
+import pandas as pd
+
+from hr_analysis.aggregates import merge_partials
+
+
+def _index(departments):
+    return pd.MultiIndex.from_arrays([pd.Categorical(departments, categories=['HR', 'R&D', 'Sales']), [1, 2]])
+
+
+def test_merge_partials_keeps_only_observed_category_groups():
+    left = pd.DataFrame({'count': [1, 2], 'first_row': [0, 1]}, index=_index(['HR', 'Sales']))
+    right = pd.DataFrame({'count': [3, 4], 'first_row': [5, 6]}, index=_index(['HR', 'R&D']))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        merged = merge_partials(left, right)
+    assert len(merged) == 3
+    assert merged['count'].sum() == 10
+    assert merged['first_row'].min() == 0
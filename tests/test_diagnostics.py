@@ -0,0 +1,39 @@
+import gc
+import threading
+import tracemalloc
+
+import pandas as pd
+
+from hr_analysis.diagnostics import RerunProfiler
+
+ORIGINAL_COPY = pd.DataFrame.copy
+
+
+def test_tracing_stops_when_last_profiler_finishes():
+    first = RerunProfiler(enabled=True)
+    with first.stage('copy'):
+        pd.DataFrame({'a': [1]}).copy()
+    assert first.records[0]['copies'] == 1
+
+    # 다른 세션(스레드)의 프로파일러가 아직 실행 중이면 계속 계측
+    second = RerunProfiler(enabled=True)
+    first.finish()
+    assert tracemalloc.is_tracing()
+    second.finish()
+    assert not tracemalloc.is_tracing()
+    assert pd.DataFrame.copy is ORIGINAL_COPY
+
+
+def test_abandoned_profiler_releases_tracing():
+    RerunProfiler(enabled=True)
+    assert tracemalloc.is_tracing()
+    RerunProfiler(enabled=False)   # 다음 재실행: finish() 없이 끝난 이전 프로파일러를 닫음
+    assert not tracemalloc.is_tracing()
+
+    # 스크립트 스레드가 finish() 없이 끝나면 프로파일러가 수거될 때 해제
+    thread = threading.Thread(target=RerunProfiler, kwargs={'enabled': True})
+    thread.start()
+    thread.join()
+    gc.collect()
+    assert not tracemalloc.is_tracing()
+    assert pd.DataFrame.copy is ORIGINAL_COPY
@@ -0,0 +1,23 @@
+import os
+
+import pandas as pd
+
+from hr_analysis.derived import build_derived_frame
+from hr_analysis.export import export_report
+from hr_analysis.mapping import auto_map
+
+
+def test_departments_with_colliding_filenames_get_separate_rosters(sample_frame, tmp_path):
+    df = sample_frame.copy()
+    df['부서'] = pd.Categorical(['R/D', 'R D', 'r:d'] * (len(df) // 3) + ['R/D'] * (len(df) % 3))
+    mapping = auto_map(df.columns)
+    derived = build_derived_frame(df, mapping, {})
+
+    files = export_report(df, derived, mapping, str(tmp_path), formats=('csv',))
+
+    rosters = sorted(os.path.basename(path) for path in files if 'roster_' in path)
+    assert rosters == ['roster_R_D.csv', 'roster_R_D_2.csv', 'roster_r_d_3.csv']
+    counts = df['부서'].value_counts()
+    written = {name: len(pd.read_csv(tmp_path / name)) for name in rosters}
+    assert sorted(written.values()) == sorted(counts.tolist())
+    assert sum(written.values()) == len(df)
@@ -0,0 +1,13 @@
+import numpy as np
+
+from hr_analysis.derived import compute_custom_fields
+
+
+def test_subtracting_from_small_int_column_goes_negative(sample_frame):
+    assert sample_frame['업무만족도'].dtype == np.uint8
+    values, errors = compute_custom_fields(sample_frame, {'차이': '업무만족도 - 5', '배율': '업무만족도 * 100'})
+    assert not errors
+    expected = sample_frame['업무만족도'].astype(np.int64)
+    assert (values['차이'] == expected - 5).all()
+    assert values['차이'].max() < 0
+    assert (values['배율'] == expected * 100).all()
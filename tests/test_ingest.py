@@ -0,0 +1,19 @@
+import io
+
+import pandas as pd
+
+from conftest import SAMPLE_CSV
+from hr_analysis.ingest import read_typed_csv
+
+
+def test_only_filler_columns_are_dropped_when_constant():
+    raw = pd.read_csv(SAMPLE_CSV, nrows=50)
+    # 부서 하나만 뽑은 추출본: 이름이 달라 정확히 매핑되지 않는 부서 컬럼도 값이 하나뿐
+    raw = raw.rename(columns={'부서': 'Division'}).assign(Division='Sales')
+
+    df, report = read_typed_csv(io.BytesIO(raw.to_csv(index=False).encode('utf-8')))
+
+    assert (df['Division'] == 'Sales').all()
+    assert 'Division' in report.constant_columns
+    assert set(report.dropped_columns) == {'직원수', '18세이상'}
+    assert not set(report.dropped_columns) & set(df.columns)
@@ -0,0 +1,42 @@
+import pandas as pd
+
+from conftest import SAMPLE_CSV
+from hr_analysis.merge import merge_files
+from hr_analysis.scoring import yes_mask
+
+
+def _csv(frame):
+    return frame.to_csv(index=False).encode('utf-8')
+
+
+def test_yes_no_fields_stay_boolean_across_mixed_files():
+    raw = pd.read_csv(SAMPLE_CSV, nrows=40)
+    first, second = raw.iloc[:20], raw.iloc[20:].copy()
+    # 헤더가 달라 퍼지 매칭되는 파일: 퇴직여부가 문자열로 읽히고 결측도 섞임
+    second = second.rename(columns={'퇴직여부': '퇴사여부'})
+    second.loc[second.index[0], '퇴사여부'] = None
+
+    merged, report = merge_files([('a.csv', _csv(first)), ('b.csv', _csv(second))], workers=1)
+
+    assert pd.api.types.is_bool_dtype(merged['퇴직여부'].dtype)
+    leavers = int((first['퇴직여부'] == 'Yes').sum() + (second['퇴사여부'].iloc[1:] == 'Yes').sum())
+    assert int(yes_mask(merged['퇴직여부']).sum()) == leavers
+    assert [source['행 수'] for source in report.sources] == [20, 20]
+
+
+def test_constant_fuzzy_mapped_columns_survive_the_merge():
+    raw = pd.read_csv(SAMPLE_CSV, nrows=60)
+    first = raw.iloc[:30]
+    # 계열사 파일: 헤더가 다르고 그 파일 안에서는 값이 하나뿐인 컬럼
+    second = raw.iloc[30:].rename(columns={'부서': 'Dept', '퇴직여부': 'Terminated'})
+    second = second.assign(Dept='Sales', Terminated='No')
+
+    merged, report = merge_files([('a.csv', _csv(first)), ('b.csv', _csv(second))], workers=1)
+
+    assert merged['부서'].notna().all()
+    assert (merged['부서'].iloc[30:] == 'Sales').all()
+    assert pd.api.types.is_bool_dtype(merged['퇴직여부'].dtype)
+    assert not merged['퇴직여부'].iloc[30:].any()
+    # 두 파일 모두에서 상수인 컬럼은 병합 뒤 한 번 버림
+    assert {'직원수', '18세이상'} <= set(report.dropped_columns)
+    assert 'Dept' not in report.dropped_columns
@@ -0,0 +1,19 @@
+import threading
+
+from hr_analysis.derived import DerivedFrameCache
+from hr_analysis.precompute import page_aggregate, start_precompute
+
+
+def _thread_name(*args):
+    return threading.current_thread().name
+
+
+def test_evicted_aggregate_is_recomputed_on_the_pool(sample_frame):
+    cache = DerivedFrameCache(max_entries=4)
+    job = start_precompute(sample_frame, None, 'test-evicted', {}, tasks={'where': _thread_name}, cache=cache)
+    assert job.wait(10)
+    assert page_aggregate('where', 'test-evicted', {}, _thread_name, cache).startswith('hr-precompute')
+
+    cache.clear()
+    assert page_aggregate('where', 'test-evicted', {}, _thread_name, cache).startswith('hr-precompute')
+    assert job.wait(10)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_scoring import MAPPING, engine, legacy
+from conftest import SAMPLE_CSV
+from hr_analysis.scoring import EARLY_WARNING, RETENTION_RISK, rule_contributions, score_frame
+
+
+@pytest.fixture(scope='module')
+def raw_frame():
+    """원본 그대로 읽은 샘플 300행 + 규칙마다 결측이 섞인 행"""
+    df = pd.read_csv(SAMPLE_CSV, nrows=300)
+    for i, field in enumerate(MAPPING):
+        df.loc[i * 7:i * 7 + 2, field] = np.nan
+    return df
+
+
+def _assert_same(df):
+    ew, rr, ew_counts, rr_counts = legacy(df)
+    ew2, rr2, ew_counts2, rr_counts2 = engine(df)
+    pd.testing.assert_series_equal(ew, ew2, check_names=False, check_dtype=False)
+    pd.testing.assert_series_equal(rr, rr2, check_names=False, check_dtype=False)
+    assert ew_counts == ew_counts2
+    assert rr_counts == rr_counts2
+
+
+def test_rule_engine_matches_row_wise_scores(raw_frame):
+    _assert_same(raw_frame.dropna(subset=list(MAPPING)))
+
+
+def test_rule_engine_matches_row_wise_scores_with_missing_values(raw_frame):
+    assert raw_frame[list(MAPPING)].isna().any().all()
+    _assert_same(raw_frame)
+
+
+@pytest.mark.parametrize('spec', [EARLY_WARNING, RETENTION_RISK], ids=lambda spec: spec.name)
+def test_rule_contributions_add_up_to_scores(raw_frame, spec):
+    contributions = rule_contributions(raw_frame, MAPPING, spec)
+    scores = score_frame(raw_frame, MAPPING)[spec.name].to_numpy(dtype=float)
+    np.testing.assert_allclose(contributions @ np.ones(len(spec.rules)), scores)
@@ -0,0 +1,44 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import SAMPLE_CSV
+from hr_analysis.ingest import read_typed_csv
+from hr_analysis.snapshots import SnapshotSeries
+
+
+@pytest.mark.parametrize('name', ['../../escaped', '/tmp/escaped', '..', 'a\\b', 'C:escaped'])
+def test_series_name_cannot_leave_root(name, tmp_path):
+    with pytest.raises(ValueError):
+        SnapshotSeries(name, root=str(tmp_path / 'series'))
+
+
+def _read_month(raw):
+    # 시계열 화면과 같은 방식으로 읽음
+    df, _ = read_typed_csv(io.BytesIO(raw.to_csv(index=False).encode('utf-8')), drop_constant=False)
+    return df
+
+
+def test_later_snapshot_is_conformed_to_previous_schema(tmp_path):
+    raw = pd.read_csv(SAMPLE_CSV, nrows=200)
+    first = raw.copy()
+    first.loc[199, '일한회사수'] = np.nan   # 첫 달에만 결측 -> float64
+    first.loc[199, '직원수'] = 2           # 첫 달에만 값이 둘 -> 둘째 달에만 상수
+    second = raw.copy()
+    second.loc[:9, '월급여'] += 100
+
+    first_df, second_df = _read_month(first), _read_month(second)
+    assert first_df['일한회사수'].dtype != second_df['일한회사수'].dtype
+
+    series = SnapshotSeries('monthly', root=str(tmp_path))
+    series.add(first_df, '2024-01-31')
+    stats = series.add(second_df, '2024-02-29')
+
+    # 월급여를 올린 10명과 일한회사수/직원수가 실제로 바뀐 1명만 변경
+    assert (stats['added'], stats['changed'], stats['removed']) == (0, 11, 0)
+    full = SnapshotSeries('full', root=str(tmp_path))
+    full.add(second_df, '2024-02-29')
+    pd.testing.assert_frame_equal(series.trend().query("date == '2024-02-29'").reset_index(drop=True),
+                                  full.trend().reset_index(drop=True), check_dtype=False)